@@ -0,0 +1,40 @@
+"""
+Microbenchmark for reading and writing model attributes
+
+Measures the throughput of attribute access on a model instance, which goes
+through the attribute descriptors shared by every instance of the model.
+
+    PYTHONPATH=. python benchmarks/attributes.py
+"""
+from __future__ import print_function
+
+import timeit
+
+from pynamodb.models import Model
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute
+
+NUMBER = 200000
+
+
+class Thread(Model):
+    class Meta:
+        table_name = 'Thread'
+        offline_schema = True
+    forum_name = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    views = NumberAttribute(default=0)
+
+
+def main():
+    setup = "from __main__ import Thread; item = Thread('forum', 'subject')"
+    cases = [
+        ('get', 'item.views; item.views; item.views; item.views'),
+        ('set', 'item.views = 1; item.views = 2; item.views = 3; item.views = 4'),
+    ]
+    for name, case in cases:
+        elapsed = min(timeit.repeat(case, setup, number=NUMBER, repeat=5)) / 4
+        print("{0:<12} {1:10.0f} ops/sec".format(name, NUMBER / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Microbenchmark for building model instances from DynamoDB items
+
+Compares Model.from_raw_data with the implementation it replaced, which copied each item
+and built the instance through keyword arguments and Model.__init__, measures lazy
+deserialization when only two attributes of each item are read, and the items/sec of
+iterating a page of items as instances, as dictionaries of attribute values, or raw.
+Dictionaries are about as fast as instances, as deserializing the attribute values
+dominates; only raw items skip that cost.
+
+    PYTHONPATH=. python benchmarks/deserialize.py
+"""
+from __future__ import print_function
+
+import copy
+import timeit
+
+from pynamodb.models import Model
+from pynamodb.constants import ATTR_TYPE_MAP
+from pynamodb.attributes import (
+    UnicodeAttribute, NumberAttribute, BooleanAttribute, UnicodeSetAttribute, UTCDateTimeAttribute
+)
+
+NUMBER = 20000
+
+
+class Thread(Model):
+    class Meta:
+        table_name = 'Thread'
+        offline_schema = True
+    forum_name = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    views = NumberAttribute(default=0)
+    replies = NumberAttribute(default=0)
+    answered = BooleanAttribute(default=False)
+    tags = UnicodeSetAttribute(null=True)
+    last_post_by = UnicodeAttribute(null=True)
+    last_post_datetime = UTCDateTimeAttribute(null=True)
+
+
+class LazyThread(Thread):
+    class Meta:
+        table_name = 'Thread'
+        offline_schema = True
+        lazy_deserialization = True
+
+
+def read_two(item):
+    """
+    Reads two attributes of an item, as most code paths do
+    """
+    return item.subject, item.views
+
+
+ITEM = {
+    'forum_name': {'S': 'PynamoDB'},
+    'subject': {'S': 'How do I deserialize items quickly?'},
+    'views': {'N': '1024'},
+    'replies': {'N': '12'},
+    'answered': {'N': '1'},
+    'tags': {'SS': ['"performance"', '"models"']},
+    'last_post_by': {'S': 'someone@example.com'},
+    'last_post_datetime': {'S': '2014-01-01T00:00:00.000000+0000'},
+}
+
+
+def from_raw_data(cls, data):
+    """
+    The previous implementation of Model.from_raw_data
+    """
+    mutable_data = copy.copy(data)
+    hash_keyname = cls.get_meta_data().hash_keyname
+    range_keyname = cls.get_meta_data().range_keyname
+    hash_key_type = cls.get_meta_data().get_attribute_type(hash_keyname)
+    hash_key = mutable_data.pop(hash_keyname).get(hash_key_type)
+    hash_key = cls.get_attributes().get(hash_keyname).deserialize(hash_key)
+    kwargs = {}
+    if range_keyname:
+        range_key_type = cls.get_meta_data().get_attribute_type(range_keyname)
+        range_key = mutable_data.pop(range_keyname).get(range_key_type)
+        kwargs['range_key'] = cls.get_attributes().get(range_keyname).deserialize(range_key)
+    for name, value in mutable_data.items():
+        attr = cls.get_attributes().get(name, None)
+        if attr:
+            kwargs[name] = attr.deserialize(value.get(ATTR_TYPE_MAP[attr.attr_type]))
+    return cls(hash_key, **kwargs)
+
+
+def main():
+    Thread.get_meta_data()
+    cases = [
+        ('previous', lambda: from_raw_data(Thread, ITEM)),
+        ('compiled', lambda: Thread.from_raw_data(ITEM)),
+        ('eager, 2 reads', lambda: read_two(Thread.from_raw_data(ITEM))),
+        ('lazy, 2 reads', lambda: read_two(LazyThread.from_raw_data(ITEM))),
+    ]
+    page = [ITEM] * 100
+    page_cases = [
+        ('page, instances', lambda: list(Thread._iter_items([page]))),
+        ('page, as_dict', lambda: list(Thread._iter_items([page], as_dict=True))),
+        ('page, raw', lambda: list(Thread._iter_items([page], raw=True))),
+    ]
+    for name, case in cases:
+        elapsed = min(timeit.repeat(case, number=NUMBER, repeat=3))
+        print("{0:<16} {1:10.0f} items/sec".format(name, NUMBER / elapsed))
+    for name, case in page_cases:
+        elapsed = min(timeit.repeat(case, number=NUMBER // len(page), repeat=3))
+        print("{0:<16} {1:10.0f} items/sec".format(name, NUMBER / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Memory benchmark for model instances
+
+Measures the memory held by model instances built from DynamoDB items, with the
+default layout and with compact instances.
+
+    PYTHONPATH=. python benchmarks/memory.py
+"""
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from pynamodb.models import Model
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute, BooleanAttribute
+
+NUMBER = 100000
+
+
+class Thread(Model):
+    class Meta:
+        table_name = 'Thread'
+        offline_schema = True
+    forum_name = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    views = NumberAttribute(default=0)
+    replies = NumberAttribute(default=0)
+    answered = BooleanAttribute(default=False)
+    last_post_by = UnicodeAttribute(null=True)
+
+
+class CompactThread(Thread):
+    class Meta:
+        table_name = 'Thread'
+        offline_schema = True
+        compact_instances = True
+
+
+def get_items():
+    """
+    Returns the raw items, whose values are shared by every instance
+    """
+    return [{
+        'forum_name': {'S': 'PynamoDB'},
+        'subject': {'S': 'Subject {0}'.format(index)},
+        'views': {'N': '1024'},
+        'replies': {'N': '12'},
+        'answered': {'N': '1'},
+        'last_post_by': {'S': 'someone@example.com'},
+    } for index in range(NUMBER)]
+
+
+def measure(model, items):
+    """
+    Returns the number of bytes allocated per instance of `model`
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [model.from_raw_data(item) for item in items]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / float(NUMBER)
+
+
+def main():
+    items = get_items()
+    for model in [Thread, CompactThread]:
+        print("{0:<14} {1:8.0f} bytes/item".format(model.__name__, measure(model, items)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Microbenchmark for building low level request arguments
+
+Measures the CPU time spent turning the arguments of a connection call into
+the keyword arguments sent to botocore, without any network access.
+
+    PYTHONPATH=. python benchmarks/request_builders.py
+"""
+from __future__ import print_function
+
+import timeit
+
+from pynamodb.connection import Connection
+from pynamodb.connection.base import MetaTable
+from pynamodb.tests.data import DESCRIBE_TABLE_DATA
+
+NUMBER = 20000
+TABLE_NAME = 'Thread'
+
+
+def get_connection():
+    """
+    Returns a connection with the table metadata already loaded
+    """
+    conn = Connection()
+    conn._tables[TABLE_NAME] = MetaTable(DESCRIBE_TABLE_DATA.get('Table'))
+    return conn
+
+
+def main():
+    conn = get_connection()
+    cases = [
+        ('get_item', lambda: conn._get_item_kwargs(TABLE_NAME, 'forum', range_key='subject')),
+        ('put_item', lambda: conn._put_item_kwargs(
+            TABLE_NAME, 'forum', range_key='subject', attributes={'LastPostDateTime': 'today'})),
+        ('delete_item', lambda: conn._delete_item_kwargs(TABLE_NAME, 'forum', range_key='subject')),
+        ('query', lambda: conn._query_kwargs(
+            TABLE_NAME, 'forum',
+            exclusive_start_key='forum',
+            key_conditions={'Subject': {'ComparisonOperator': 'BEGINS_WITH', 'AttributeValueList': ['s']}})),
+        ('scan', lambda: conn._scan_kwargs(
+            TABLE_NAME,
+            limit=10,
+            scan_filter={'Subject': {'ComparisonOperator': 'EQ', 'AttributeValueList': ['s']}})),
+    ]
+    for name, case in cases:
+        elapsed = min(timeit.repeat(case, number=NUMBER, repeat=3))
+        print("{0:<12} {1:8.2f} us/request".format(name, elapsed / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
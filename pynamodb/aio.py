@@ -0,0 +1,194 @@
+"""
+Asyncio support for PynamoDB models (Python 3.5+)
+
+These coroutines back the ``a``-prefixed model methods, such as ``await Model.aget(...)``,
+``async for item in Model.aquery(...)`` and ``await item.asave()``.
+"""
+import collections
+
+from pynamodb.connection.base import MetaTable
+from pynamodb.constants import (
+    CONSUMED_CAPACITY, ITEM, ITEMS, LAST_EVALUATED_KEY, QUERY_OPERATOR_MAP, SCAN_OPERATOR_MAP
+)
+
+
+async def get_meta_data(model):
+    """
+    Loads the table meta data of `model` without blocking the event loop
+    """
+    if model.meta_table is None:
+        if model.Meta.offline_schema:
+            return model.get_meta_data()
+        model.meta_table = await model.get_async_connection().get_meta_table() or MetaTable(None)
+    return model.meta_table
+
+
+async def get(model, hash_key, range_key=None, consistent_read=False):
+    """
+    Returns a single object using the provided keys
+    """
+    await get_meta_data(model)
+    hash_key, range_key = model.serialize_keys(hash_key, range_key)
+    data = await model.get_async_connection().get_item(
+        hash_key,
+        range_key=range_key,
+        consistent_read=consistent_read
+    )
+    model.throttle.add_record(data.get(CONSUMED_CAPACITY))
+    item_data = data.get(ITEM)
+    if item_data:
+        return model.from_raw_data(item_data)
+    else:
+        raise model.DoesNotExist()
+
+
+async def save(item):
+    """
+    Saves `item` to dynamodb
+    """
+    await get_meta_data(item.__class__)
+    args, kwargs = item._get_save_args()
+    data = await item.get_async_connection().put_item(*args, **kwargs)
+    if isinstance(data, dict):
+        item.throttle.add_record(data.get(CONSUMED_CAPACITY))
+    item._clear_changes()
+    return data
+
+
+async def update(item):
+    """
+    Saves the attributes of `item` changed since it was loaded or saved
+    """
+    if not item._changed_attributes:
+        return None
+    if item._has_changed_keys():
+        return await save(item)
+    await get_meta_data(item.__class__)
+    args, kwargs = item._get_update_args()
+    data = await item.get_async_connection().update_item(*args, **kwargs)
+    item.throttle.add_record(data.get(CONSUMED_CAPACITY))
+    item._clear_changes()
+    return data
+
+
+async def delete(item):
+    """
+    Deletes `item` from dynamodb
+    """
+    await get_meta_data(item.__class__)
+    args, kwargs = item._get_save_args(attributes=False, null_check=False)
+    return await item.get_async_connection().delete_item(*args, **kwargs)
+
+
+async def refresh(item, consistent_read=False):
+    """
+    Retrieves the data of `item` from dynamodb and syncs the local object
+    """
+    await get_meta_data(item.__class__)
+    args, kwargs = item._get_save_args(attributes=False)
+    kwargs.setdefault('consistent_read', consistent_read)
+    attrs = await item.get_async_connection().get_item(*args, **kwargs)
+    item.throttle.add_record(attrs.get(CONSUMED_CAPACITY))
+    item_data = attrs.get(ITEM, None)
+    if item_data is None:
+        raise item.DoesNotExist("This item does not exist in the table.")
+    item.deserialize(item_data)
+    if item._projection is not None:
+        item._projection = None
+
+
+class ResultIterator(object):
+    """
+    An asynchronous iterator over the items of a paginated query or scan
+
+    Pages are requested one at a time, as the items of the previous page are consumed.
+    """
+
+    def __init__(self, model, **kwargs):
+        self.model = model
+        self.kwargs = kwargs
+        self._args = None
+        self._items = collections.deque()
+        self._last_evaluated_key = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._items:
+            if self._args is not None and not self._last_evaluated_key:
+                raise StopAsyncIteration
+            await self._fetch_page()
+        return self.model.from_raw_data(self._items.popleft())
+
+    def _prepare(self):
+        """
+        Returns the positional and keyword arguments for the connection call
+        """
+        raise NotImplementedError
+
+    def _call(self, *args, **kwargs):
+        """
+        Performs the connection call for a single page
+        """
+        raise NotImplementedError
+
+    async def _fetch_page(self):
+        """
+        Fetches the next page of items
+        """
+        if self._args is None:
+            await get_meta_data(self.model)
+            self._args, self._call_kwargs = self._prepare()
+        kwargs = dict(self._call_kwargs)
+        if self._last_evaluated_key:
+            kwargs['exclusive_start_key'] = self._last_evaluated_key
+        data = await self._call(*self._args, **kwargs)
+        self.model.throttle.add_record(data.get(CONSUMED_CAPACITY))
+        self._items.extend(data.get(ITEMS))
+        self._last_evaluated_key = data.get(LAST_EVALUATED_KEY, None)
+
+
+class QueryIterator(ResultIterator):
+    """
+    An asynchronous iterator over the results of a query
+    """
+
+    def _prepare(self):
+        kwargs = dict(self.kwargs)
+        hash_key = kwargs.pop('hash_key')
+        index_name = kwargs.pop('index_name', None)
+        call_kwargs = {
+            'index_name': index_name,
+            'consistent_read': kwargs.pop('consistent_read', False),
+            'scan_index_forward': kwargs.pop('scan_index_forward', None),
+            'limit': kwargs.pop('limit', None)
+        }
+        if index_name:
+            hash_key = self.model.index_classes[index_name].hash_key_attribute().serialize(hash_key)
+        else:
+            hash_key = self.model.serialize_keys(hash_key)[0]
+        call_kwargs['key_conditions'] = self.model._build_filters(QUERY_OPERATOR_MAP, kwargs)
+        return (hash_key,), call_kwargs
+
+    def _call(self, *args, **kwargs):
+        return self.model.get_async_connection().query(*args, **kwargs)
+
+
+class ScanIterator(ResultIterator):
+    """
+    An asynchronous iterator over the results of a scan
+    """
+
+    def _prepare(self):
+        kwargs = dict(self.kwargs)
+        call_kwargs = {
+            'segment': kwargs.pop('segment', None),
+            'total_segments': kwargs.pop('total_segments', None),
+            'limit': kwargs.pop('limit', None)
+        }
+        call_kwargs['scan_filter'] = self.model._build_filters(SCAN_OPERATOR_MAP, kwargs)
+        return (), call_kwargs
+
+    def _call(self, *args, **kwargs):
+        return self.model.get_async_connection().scan(*args, **kwargs)
@@ -3,7 +3,12 @@ PynamoDB attributes
 """
 import six
 import json
+import itertools
 from base64 import b64encode, b64decode
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 from delorean import Delorean, parse
 from pynamodb.constants import (
     STRING, NUMBER, BINARY, UTC, DATETIME_FORMAT, BINARY_SET, STRING_SET, NUMBER_SET,
@@ -11,11 +16,75 @@ from pynamodb.constants import (
 )
 
 
+# Orders attributes and indexes by declaration, as class dictionaries are unordered before Python 3.6
+creation_counter = itertools.count()
+
+
+class AttributeRegistry(Mapping):
+    """
+    An immutable mapping of names to the attributes or indexes of a class, in declaration order
+    """
+
+    def __init__(self, items=()):
+        self._names = tuple(name for name, _ in items)
+        self._items = dict(items)
+
+    @classmethod
+    def from_class(cls, klass, item_type, registry_name=None):
+        """
+        Returns the registry of the `item_type` instances declared by `klass` and its bases
+
+        The registries of bases are reused when they are stored as their `registry_name`
+        attribute, so only the class dictionary of `klass` is inspected. A name declared again
+        by a subclass keeps its position, and is dropped if it is no longer an `item_type` instance.
+        """
+        items = {}
+        order = []
+        for base in reversed(klass.__bases__):
+            if base is object:
+                continue
+            registry = base.__dict__.get(registry_name) if registry_name else None
+            if not isinstance(registry, AttributeRegistry):
+                registry = cls.from_class(base, item_type, registry_name)
+            for name, value in registry.items():
+                if name not in items:
+                    order.append(name)
+                items[name] = value
+        declared = []
+        for name, value in six.iteritems(klass.__dict__):
+            if isinstance(value, item_type):
+                declared.append((getattr(value, 'creation_order', 0), name, value))
+            elif name in items:
+                del items[name]
+                order.remove(name)
+        for _, name, value in sorted(declared, key=lambda entry: entry[:2]):
+            if name not in items:
+                order.append(name)
+            items[name] = value
+        return cls([(name, items[name]) for name in order])
+
+    def __getitem__(self, name):
+        return self._items[name]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, list(self.items()))
+
+
 class Attribute(object):
     """
     An attribute of a model
+
+    Attributes are descriptors shared by every instance of a model, so they hold no
+    per-instance state: values are only stored in the instance's attribute values,
+    and the names of assigned attributes in its changed attributes.
     """
-    attr_name = None
+    __slots__ = ('attr_name', 'creation_order', 'default', 'null', 'attr_type', 'is_hash_key', 'is_range_key')
 
     def __init__(self,
                  attr_type=str,
@@ -24,7 +93,8 @@ class Attribute(object):
                  null=False,
                  default=None
                  ):
-        self.value = None
+        self.attr_name = None
+        self.creation_order = next(creation_counter)
         self.default = default
         self.null = null
         self.attr_type = attr_type
@@ -34,12 +104,16 @@ class Attribute(object):
     def __set__(self, instance, value):
         if isinstance(value, Attribute):
             return self
-        if instance:
+        if instance is not None:
             instance.attribute_values[self.attr_name] = value
-            self.value = value
+            changed = instance._changed_attributes
+            if changed is None:
+                instance._changed_attributes = set([self.attr_name])
+            else:
+                changed.add(self.attr_name)
 
     def __get__(self, instance, owner):
-        if instance:
+        if instance is not None:
             return instance.attribute_values.get(self.attr_name, None)
         else:
             return self
@@ -61,6 +135,8 @@ class SetMixin(object):
     """
     Adds (de)serialization methods
     """
+    __slots__ = ()
+
     def serialize(self, value):
         """
         Serializes a set
@@ -85,6 +161,8 @@ class BinaryAttribute(Attribute):
     """
     A binary attribute
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', BINARY)
         super(BinaryAttribute, self).__init__(**kwargs)
@@ -106,6 +184,8 @@ class BinarySetAttribute(SetMixin, Attribute):
     """
     A binary set
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', BINARY_SET)
         kwargs.setdefault('null', True)
@@ -132,6 +212,8 @@ class UnicodeSetAttribute(SetMixin, Attribute):
     """
     A unicode set
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', STRING_SET)
         kwargs.setdefault('null', True)
@@ -142,6 +224,8 @@ class UnicodeAttribute(Attribute):
     """
     A unicode attribute
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', STRING)
         super(UnicodeAttribute, self).__init__(**kwargs)
@@ -164,6 +248,8 @@ class JSONAttribute(Attribute):
 
     Encodes JSON to unicode internally
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', STRING)
         super(JSONAttribute, self).__init__(**kwargs)
@@ -190,6 +276,8 @@ class BooleanAttribute(Attribute):
 
     This attribute type uses a number attribute to save space
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', NUMBER)
         super(BooleanAttribute, self).__init__(**kwargs)
@@ -216,6 +304,8 @@ class NumberSetAttribute(SetMixin, Attribute):
     """
     A number set attribute
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', NUMBER_SET)
         kwargs.setdefault('null', True)
@@ -226,6 +316,8 @@ class NumberAttribute(Attribute):
     """
     A number attribute
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', NUMBER)
         super(NumberAttribute, self).__init__(**kwargs)
@@ -247,6 +339,8 @@ class UTCDateTimeAttribute(Attribute):
     """
     An attribute for storing a UTC Datetime
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         kwargs.setdefault('attr_type', STRING)
         super(UTCDateTimeAttribute, self).__init__(**kwargs)
@@ -0,0 +1,224 @@
+"""
+Helpers to send DynamoDB requests concurrently
+"""
+import sys
+import logging
+import threading
+
+import six
+from six.moves import queue
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+PUT_POLL_INTERVAL = 0.05
+
+
+def _put(values, value, cancelled):
+    """
+    Puts `value` in the bounded queue `values`, unless `cancelled` is set while it waits for room
+
+    Returns True if the value was put
+    """
+    while not cancelled.is_set():
+        try:
+            values.put(value, timeout=PUT_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def map_concurrently(func, iterable, workers, ordered=True, buffer_size=None):
+    """
+    Calls `func` with each element of `iterable` on a pool of threads, and yields the results
+
+    `iterable` is consumed lazily: at most `buffer_size` elements, which defaults to twice the
+    number of workers, are being processed or waiting to be yielded at any time. The first
+    exception raised by `func` is raised by this generator, and elements that were not started
+    yet are cancelled, as they are when the generator is closed before it is exhausted.
+
+    :param func: The function called with each element
+    :param iterable: Any iterable, such as a generator
+    :param workers: The number of threads
+    :param ordered: If True, results are yielded in the order of `iterable`, otherwise
+        as soon as they are available
+    :param buffer_size: The maximum number of pending elements
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    buffer_size = max(buffer_size or 2 * workers, workers)
+    tasks = queue.Queue()
+    results = queue.Queue()
+    cancelled = threading.Event()
+
+    def work():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            index, element = task
+            if cancelled.is_set():
+                continue
+            try:
+                results.put((index, func(element), None))
+            except Exception:
+                results.put((index, None, sys.exc_info()))
+
+    threads = []
+    for _ in range(workers):
+        thread = threading.Thread(target=work)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    elements = iter(iterable)
+    exhausted = False
+    submitted = 0
+    received = 0
+    yielded = 0
+    done = {}
+    try:
+        while True:
+            while not exhausted and submitted - yielded < buffer_size:
+                try:
+                    element = next(elements)
+                except StopIteration:
+                    exhausted = True
+                    break
+                tasks.put((submitted, element))
+                submitted += 1
+            if received == submitted:
+                break
+            index, result, exc_info = results.get()
+            received += 1
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            if not ordered:
+                yielded += 1
+                yield result
+                continue
+            done[index] = result
+            while yielded in done:
+                result = done.pop(yielded)
+                yielded += 1
+                yield result
+    finally:
+        if received < submitted:
+            log.debug("Cancelling %s pending tasks", submitted - received)
+        cancelled.set()
+        for _ in threads:
+            tasks.put(None)
+
+
+def chain_concurrently(func, iterable, workers, buffer_size=None):
+    """
+    Calls `func` with each element of `iterable` on a pool of threads, and yields the values
+    of the iterators it returns, as soon as they are available
+
+    Each thread iterates over the values of one element at a time. Once `buffer_size` values,
+    which defaults to twice the number of workers, wait to be yielded, the threads wait for
+    them to be consumed. The first exception raised by `func` or its iterators is raised by
+    this generator, and the threads stop, as they do when the generator is closed before it
+    is exhausted.
+
+    :param func: The function called with each element, which returns an iterable
+    :param iterable: Any iterable, such as a generator
+    :param workers: The number of threads
+    :param buffer_size: The maximum number of values waiting to be yielded
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    done = object()
+    elements = iter(iterable)
+    elements_lock = threading.Lock()
+    values = queue.Queue(buffer_size or 2 * workers)
+    cancelled = threading.Event()
+
+    def put(value):
+        return _put(values, value, cancelled)
+
+    def work():
+        try:
+            while not cancelled.is_set():
+                with elements_lock:
+                    element = next(elements, done)
+                if element is done:
+                    return
+                for value in func(element):
+                    if not put((value, None)):
+                        return
+        except Exception:
+            put((None, sys.exc_info()))
+        finally:
+            put(done)
+
+    for _ in range(workers):
+        thread = threading.Thread(target=work)
+        thread.daemon = True
+        thread.start()
+
+    running = workers
+    try:
+        while running:
+            value = values.get()
+            if value is done:
+                running -= 1
+                continue
+            value, exc_info = value
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            yield value
+    finally:
+        if running:
+            log.debug("Stopping %s threads", running)
+        cancelled.set()
+
+
+def prefetch_pages(pages, size):
+    """
+    Iterates over `pages` on a background thread, which fetches up to `size` pages ahead
+
+    The thread takes a free slot before it fetches each page, and a slot is freed each time
+    a page is yielded. The first exception raised while fetching is raised by this generator,
+    and the thread stops, as it does when the generator is closed before it is exhausted.
+
+    :param pages: An iterable of pages, such as a generator of DynamoDB pages
+    :param size: The maximum number of pages fetched ahead
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    done = object()
+    values = queue.Queue()
+    slots = queue.Queue(size)
+    cancelled = threading.Event()
+
+    def work():
+        try:
+            iterator = iter(pages)
+            while _put(slots, None, cancelled):
+                page = next(iterator, done)
+                if page is done:
+                    return
+                values.put((page, None))
+        except Exception:
+            values.put((None, sys.exc_info()))
+        finally:
+            values.put(done)
+
+    thread = threading.Thread(target=work)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            value = values.get()
+            if value is done:
+                return
+            page, exc_info = value
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            slots.get_nowait()
+            yield page
+    finally:
+        cancelled.set()
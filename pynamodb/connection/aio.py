@@ -0,0 +1,593 @@
+"""
+Asyncio connection classes (Python 3.5+)
+
+Requests are built and signed by botocore, exactly as :class:`~pynamodb.connection.base.Connection`
+does, but are sent over non-blocking asyncio streams so that many requests can be in flight
+from a single event loop.
+"""
+import asyncio
+import logging
+import time
+import ssl
+
+from botocore.response import get_response
+from botocore.vendored.requests.structures import CaseInsensitiveDict
+from six.moves.urllib.parse import urlsplit
+
+from .base import Connection, MetaTable
+from .util import pythonic
+from pynamodb.exceptions import (
+    PynamoDBConnectionError, TableError, QueryError, PutError, DeleteError, UpdateError, GetError, ScanError)
+from pynamodb.constants import (
+    DEFAULT_ENCODING, DEFAULT_MAX_POOL_CONNECTIONS, DESCRIBE_TABLE, TABLE_NAME, GET_ITEM, PUT_ITEM,
+    UPDATE_ITEM, DELETE_ITEM, BATCH_GET_ITEM, BATCH_WRITE_ITEM, QUERY, SCAN, TABLE_KEY
+)
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class AsyncRequest(object):
+    """
+    The request of an `AsyncResponse`
+    """
+
+    def __init__(self, method, url):
+        self.method = method
+        self.url = url
+
+
+class AsyncResponse(object):
+    """
+    An HTTP response compatible with the parts of `requests.Response` used by botocore and PynamoDB
+    """
+
+    def __init__(self, request, status_code, reason, headers, content):
+        self.request = request
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.encoding = None
+
+    @property
+    def ok(self):
+        """
+        Returns True if the status code is not an error
+        """
+        return self.status_code < 400
+
+    def __repr__(self):
+        return '<AsyncResponse [{0}]>'.format(self.status_code)
+
+
+class AsyncHTTPConnectionPool(object):
+    """
+    A pool of keep-alive HTTP/1.1 connections built on asyncio streams
+
+    At most `max_pool_connections` requests are sent concurrently, and idle connections
+    are kept open for reuse.
+    """
+
+    def __init__(self, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS, timeout=None, keep_alive=True):
+        """
+        :param max_pool_connections: The maximum number of concurrent connections
+        :param timeout: If set, the number of seconds to wait for a response
+        :param keep_alive: If False, connections are closed after every request
+        """
+        self.max_pool_connections = max_pool_connections
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self._loop = None
+        self._semaphore = None
+        self._idle = {}
+        self._in_use = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _bind(self):
+        """
+        Binds the pool to the running event loop, discarding connections opened by any other loop
+        """
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._idle = {}
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_pool_connections)
+
+    def get_stats(self):
+        """
+        Returns a dictionary of pool statistics
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'open_sockets': sum(len(conns) for conns in self._idle.values()) + self._in_use,
+            'max_pool_connections': self.max_pool_connections
+        }
+
+    def close(self):
+        """
+        Closes all idle connections
+        """
+        for conns in self._idle.values():
+            for _, writer in conns:
+                writer.close()
+        self._idle = {}
+
+    async def _connect(self, key, reuse=True):
+        """
+        Returns a (reader, writer, reused) tuple, reusing an idle connection if possible
+        """
+        conns = self._idle.get(key)
+        while reuse and conns:
+            reader, writer = conns.pop()
+            if not reader.at_eof():
+                self.hits += 1
+                return reader, writer, True
+            writer.close()
+        self.misses += 1
+        scheme, host, port = key
+        ssl_context = ssl.create_default_context() if scheme == 'https' else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return reader, writer, False
+
+    def _release(self, key, reader, writer, reusable):
+        """
+        Returns a connection to the pool, or closes it
+        """
+        if reusable and self.keep_alive and len(self._idle.get(key, [])) < self.max_pool_connections:
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+
+    async def send(self, method, url, headers, body):
+        """
+        Sends an HTTP request and returns an `AsyncResponse`
+        """
+        self._bind()
+        split = urlsplit(url)
+        scheme = split.scheme or 'https'
+        port = split.port or (443 if scheme == 'https' else 80)
+        key = (scheme, split.hostname, port)
+        path = split.path or '/'
+        if split.query:
+            path = '{0}?{1}'.format(path, split.query)
+        if body is None:
+            body = b''
+        elif not isinstance(body, bytes):
+            body = body.encode(DEFAULT_ENCODING)
+        lines = ['{0} {1} HTTP/1.1'.format(method, path), 'Host: {0}'.format(split.netloc)]
+        for name, value in headers.items():
+            if name.lower() not in ('host', 'content-length', 'connection'):
+                lines.append('{0}: {1}'.format(name, value))
+        lines.append('Content-Length: {0}'.format(len(body)))
+        lines.append('Connection: {0}'.format('keep-alive' if self.keep_alive else 'close'))
+        payload = '\r\n'.join(lines).encode(DEFAULT_ENCODING) + b'\r\n\r\n' + body
+
+        async with self._semaphore:
+            self._in_use += 1
+            try:
+                reader, writer, result = await self._request(key, payload)
+            finally:
+                self._in_use -= 1
+        status_code, reason, response_headers, content, reusable = result
+        self._release(key, reader, writer, reusable)
+        return AsyncResponse(AsyncRequest(method, url), status_code, reason, response_headers, content)
+
+    async def _request(self, key, payload):
+        """
+        Sends `payload` over a pooled connection
+
+        If the pooled connection was closed by the server, the request is retried once on a new connection.
+        """
+        reader, writer, reused = await self._connect(key)
+        while True:
+            try:
+                result = await self._exchange(reader, writer, payload)
+                return reader, writer, result
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+            except BaseException:
+                writer.close()
+                raise
+            reader, writer, reused = await self._connect(key, reuse=False)
+
+    async def _exchange(self, reader, writer, payload):
+        """
+        Writes `payload` and reads a single response
+        """
+        writer.write(payload)
+        if self.timeout is not None:
+            return await asyncio.wait_for(self._read_response(reader), self.timeout)
+        return await self._read_response(reader)
+
+    async def _read_response(self, reader):
+        """
+        Reads a single HTTP/1.1 response
+        """
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(status_line, None)
+        parts = status_line.decode(DEFAULT_ENCODING).rstrip('\r\n').split(' ', 2)
+        status_code = int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ''
+        headers = CaseInsensitiveDict()
+        while True:
+            line = await reader.readline()
+            line = line.decode(DEFAULT_ENCODING).rstrip('\r\n')
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip()] = value.strip()
+        reusable = headers.get('connection', '').lower() != 'close'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0].strip(), 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b''.join(chunks)
+        elif 'content-length' in headers:
+            content = await reader.readexactly(int(headers['content-length']))
+        else:
+            content = await reader.read()
+            reusable = False
+        return status_code, reason, headers, content, reusable
+
+
+class AsyncConnection(object):
+    """
+    An asyncio counterpart of :class:`~pynamodb.connection.base.Connection`
+
+    All operations are coroutines. Table metadata, request building, signing and the retry
+    policy are shared with a regular `Connection`.
+    """
+    retryable_exceptions = (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError)
+
+    def __init__(self,
+                 region=None,
+                 host=None,
+                 max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+                 timeout=None,
+                 keep_alive=True,
+                 retry_policy=None,
+                 metrics=None,
+                 request_logger=None,
+                 meta_table_cache=None):
+        """
+        :param region: The AWS region to connect to
+        :param host: An alternative DynamoDB url
+        :param max_pool_connections: The maximum number of concurrent HTTP connections
+        :param timeout: If set, the number of seconds to wait for each response
+        :param keep_alive: If False, HTTP connections are not reused
+        :param retry_policy: The `RetryPolicy` for failed requests
+        :param metrics: If set, a `MetricsCollector` that receives the metrics of every operation
+        :param request_logger: The `RequestLogger` for debug logging
+        :param meta_table_cache: If set, a `MetaTableCache` shared with other connections
+        """
+        self.connection = Connection(
+            region=region,
+            host=host,
+            retry_policy=retry_policy,
+            metrics=metrics,
+            request_logger=request_logger,
+            meta_table_cache=meta_table_cache)
+        self.http_pool = AsyncHTTPConnectionPool(
+            max_pool_connections=max_pool_connections,
+            timeout=timeout,
+            keep_alive=keep_alive)
+
+    def __repr__(self):
+        return "AsyncConnection<{0}>".format(self.connection.endpoint.host)
+
+    def get_pool_stats(self):
+        """
+        Returns the HTTP connection pool statistics for this connection
+        """
+        return self.http_pool.get_stats()
+
+    async def dispatch(self, operation_name, operation_kwargs):
+        """
+        Dispatches `operation_name` with arguments `operation_kwargs`
+
+        Failed requests are retried according to the `retry_policy` of the connection
+        """
+        connection = self.connection
+        retry_policy = connection.retry_policy
+        sampled = connection._before_dispatch(operation_name, operation_kwargs)
+        timings = None
+        if connection.metrics is not None:
+            started = time.time()
+            timings = {'serialize': 0.0, 'network': 0.0, 'parse': 0.0}
+        operation = connection.service.get_operation(operation_name)
+        endpoint = connection.endpoint
+        params = operation.build_parameters(**operation_kwargs)
+        attempt = 1
+        while True:
+            serialize_started = time.time()
+            # Each attempt is signed again, as signatures expire
+            request = endpoint.prepare_request(endpoint._create_request_object(operation, dict(params)))
+            sent = time.time()
+            try:
+                try:
+                    http_response = await self.http_pool.send(request.method, request.url, request.headers, request.body)
+                finally:
+                    received = time.time()
+                response, data = get_response(connection.session, operation, http_response)
+                if timings is not None:
+                    timings['serialize'] += sent - serialize_started
+                    timings['network'] += received - sent
+                    timings['parse'] += time.time() - received
+                delay = retry_policy.get_retry_delay(operation_name, attempt, response=response, data=data)
+            except self.retryable_exceptions as e:
+                if timings is not None:
+                    timings['serialize'] += sent - serialize_started
+                    timings['network'] += received - sent
+                delay = retry_policy.get_retry_delay(operation_name, attempt, exception=e)
+                if delay is None:
+                    if timings is not None:
+                        connection._record_metrics(
+                            operation_name, operation_kwargs, started, timings, attempt,
+                            error_code=e.__class__.__name__)
+                    raise PynamoDBConnectionError(
+                        "{0} failed after {1} attempts: {2}".format(operation_name, attempt, e),
+                        retryable=True)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+        if timings is not None:
+            connection._record_metrics(operation_name, operation_kwargs, started, timings, attempt, response, data)
+        connection._after_dispatch(operation_name, response, data, sampled)
+        return response, data
+
+    async def get_meta_table(self, table_name, refresh=False):
+        """
+        Returns a MetaTable
+        """
+        connection = self.connection
+        if table_name not in connection._tables or refresh:
+            cache = connection.meta_table_cache
+            if cache is not None and not refresh:
+                # Cached entries are used as is, they are refreshed by synchronous connections
+                data = cache.get_cached(connection._get_meta_table_cache_key(table_name))
+                if data is not None:
+                    connection._tables[table_name] = MetaTable(data)
+                    return connection._tables[table_name]
+            operation_kwargs = {
+                pythonic(TABLE_NAME): table_name
+            }
+            response, data = await self.dispatch(DESCRIBE_TABLE, operation_kwargs)
+            if not connection._set_meta_table(table_name, response, data):
+                return None
+            if cache is not None:
+                cache.set(connection._get_meta_table_cache_key(table_name), data.get(TABLE_KEY))
+        return connection._tables[table_name]
+
+    async def _require_meta_table(self, table_name):
+        """
+        Ensures the MetaTable for `table_name` is loaded before building a request
+        """
+        tbl = await self.get_meta_table(table_name)
+        if tbl is None:
+            raise TableError("No such table {0}".format(table_name))
+        return tbl
+
+    async def describe_table(self, table_name):
+        """
+        Performs the DescribeTable operation
+        """
+        tbl = await self.get_meta_table(table_name, refresh=True)
+        if tbl:
+            return tbl.data
+
+    async def delete_item(self, table_name, hash_key, **kwargs):
+        """
+        Performs the DeleteItem operation and returns the result
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._delete_item_kwargs(table_name, hash_key, **kwargs)
+        response, data = await self.dispatch(DELETE_ITEM, operation_kwargs)
+        if not response.ok:
+            raise DeleteError(
+                "Failed to delete item: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+    async def update_item(self, table_name, hash_key, **kwargs):
+        """
+        Performs the UpdateItem operation
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._update_item_kwargs(table_name, hash_key, **kwargs)
+        response, data = await self.dispatch(UPDATE_ITEM, operation_kwargs)
+        if not response.ok:
+            raise UpdateError(
+                "Failed to update item: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+    async def put_item(self, table_name, hash_key, **kwargs):
+        """
+        Performs the PutItem operation and returns the result
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._put_item_kwargs(table_name, hash_key, **kwargs)
+        response, data = await self.dispatch(PUT_ITEM, operation_kwargs)
+        if not response.ok:
+            raise PutError(
+                "Failed to put item: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+    async def batch_write_item(self, table_name, **kwargs):
+        """
+        Performs the batch_write_item operation
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._batch_write_item_kwargs(table_name, **kwargs)
+        response, data = await self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
+        if not response.ok:
+            raise PutError(
+                "Failed to batch write items: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+    async def batch_get_item(self, table_name, keys, **kwargs):
+        """
+        Performs the batch get item operation
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._batch_get_item_kwargs(table_name, keys, **kwargs)
+        response, data = await self.dispatch(BATCH_GET_ITEM, operation_kwargs)
+        if not response.ok:
+            raise GetError(
+                "Failed to batch get items: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+    async def get_item(self, table_name, hash_key, **kwargs):
+        """
+        Performs the GetItem operation and returns the result
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._get_item_kwargs(table_name, hash_key, **kwargs)
+        response, data = await self.dispatch(GET_ITEM, operation_kwargs)
+        if not response.ok:
+            raise GetError(
+                "Failed to get item: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+    async def scan(self, table_name, **kwargs):
+        """
+        Performs the scan operation
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._scan_kwargs(table_name, **kwargs)
+        response, data = await self.dispatch(SCAN, operation_kwargs)
+        if not response.ok:
+            raise ScanError(
+                "Failed to scan table: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+    async def query(self, table_name, hash_key, **kwargs):
+        """
+        Performs the Query operation and returns the result
+        """
+        await self._require_meta_table(table_name)
+        operation_kwargs = self.connection._query_kwargs(table_name, hash_key, **kwargs)
+        response, data = await self.dispatch(QUERY, operation_kwargs)
+        if not response.ok:
+            raise QueryError(
+                "Failed to query items: {0}".format(response.content),
+                retryable=self.connection.is_retryable(response, data))
+        return data
+
+
+class AsyncTableConnection(object):
+    """
+    An asyncio counterpart of :class:`~pynamodb.connection.table.TableConnection`
+    """
+
+    def __init__(self,
+                 table_name,
+                 region=None,
+                 host=None,
+                 max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+                 timeout=None,
+                 keep_alive=True,
+                 retry_policy=None,
+                 metrics=None,
+                 request_logger=None,
+                 meta_table_cache=None):
+        self.table_name = table_name
+        self.connection = AsyncConnection(
+            region=region,
+            host=host,
+            max_pool_connections=max_pool_connections,
+            timeout=timeout,
+            keep_alive=keep_alive,
+            retry_policy=retry_policy,
+            metrics=metrics,
+            request_logger=request_logger,
+            meta_table_cache=meta_table_cache)
+
+    def add_meta_table(self, meta_table):
+        """
+        Caches `meta_table` as the MetaTable of this table, so that it isn't described
+        """
+        self.connection.connection.add_meta_table(self.table_name, meta_table)
+
+    async def get_meta_table(self, refresh=False):
+        """
+        Returns a MetaTable, from the meta table cache of the connection if it has one
+        """
+        return await self.connection.get_meta_table(self.table_name, refresh=refresh)
+
+    def get_pool_stats(self):
+        """
+        Returns the HTTP connection pool statistics
+        """
+        return self.connection.get_pool_stats()
+
+    async def describe_table(self):
+        """
+        Performs the DescribeTable operation and returns the result
+        """
+        return await self.connection.describe_table(self.table_name)
+
+    async def delete_item(self, hash_key, **kwargs):
+        """
+        Performs the DeleteItem operation and returns the result
+        """
+        return await self.connection.delete_item(self.table_name, hash_key, **kwargs)
+
+    async def update_item(self, hash_key, **kwargs):
+        """
+        Performs the UpdateItem operation
+        """
+        return await self.connection.update_item(self.table_name, hash_key, **kwargs)
+
+    async def put_item(self, hash_key, **kwargs):
+        """
+        Performs the PutItem operation and returns the result
+        """
+        return await self.connection.put_item(self.table_name, hash_key, **kwargs)
+
+    async def batch_write_item(self, **kwargs):
+        """
+        Performs the batch_write_item operation
+        """
+        return await self.connection.batch_write_item(self.table_name, **kwargs)
+
+    async def batch_get_item(self, keys, **kwargs):
+        """
+        Performs the batch get item operation
+        """
+        return await self.connection.batch_get_item(self.table_name, keys, **kwargs)
+
+    async def get_item(self, hash_key, **kwargs):
+        """
+        Performs the GetItem operation and returns the result
+        """
+        return await self.connection.get_item(self.table_name, hash_key, **kwargs)
+
+    async def scan(self, **kwargs):
+        """
+        Performs the scan operation
+        """
+        return await self.connection.scan(self.table_name, **kwargs)
+
+    async def query(self, hash_key, **kwargs):
+        """
+        Performs the Query operation and returns the result
+        """
+        return await self.connection.query(self.table_name, hash_key, **kwargs)
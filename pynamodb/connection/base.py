@@ -1,14 +1,22 @@
 """
 Lowest level connection
 """
+import time
 import logging
+import threading
 
 import six
 from botocore.session import get_session
 
+from .pool import PooledHTTPAdapter
+from .retry import RetryPolicy, get_error_code
+from .metrics import get_table_name, get_capacity_units, get_item_count
+from .logger import RequestLogger
+from .transport import BotocoreTransport
 from .util import pythonic
 from ..types import HASH, RANGE
-from pynamodb.exceptions import TableError, QueryError, PutError, DeleteError, UpdateError, GetError, ScanError
+from pynamodb.exceptions import (
+    PynamoDBConnectionError, TableError, QueryError, PutError, DeleteError, UpdateError, GetError, ScanError)
 from pynamodb.constants import (
     RETURN_CONSUMED_CAPACITY_VALUES, RETURN_ITEM_COLL_METRICS_VALUES, COMPARISON_OPERATOR_VALUES,
     RETURN_ITEM_COLL_METRICS, RETURN_CONSUMED_CAPACITY, RETURN_VALUES_VALUES, ATTR_UPDATE_ACTIONS,
@@ -21,7 +29,7 @@ from pynamodb.constants import (
     KEYS, KEY, EQ, SEGMENT, TOTAL_SEGMENTS, CREATE_TABLE, PROVISIONED_THROUGHPUT, READ_CAPACITY_UNITS,
     WRITE_CAPACITY_UNITS, GLOBAL_SECONDARY_INDEXES, PROJECTION, EXCLUSIVE_START_TABLE_NAME, TOTAL,
     DELETE_TABLE, UPDATE_TABLE, LIST_TABLES, GLOBAL_SECONDARY_INDEX_UPDATES, HTTP_BAD_REQUEST,
-    CONSUMED_CAPACITY, CAPACITY_UNITS
+    CONSUMED_CAPACITY, DEFAULT_MAX_POOL_CONNECTIONS, DELETE
 )
 
 
@@ -29,6 +37,14 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+def _raise_caught_exception(caught_exception=None, **kwargs):
+    """
+    A botocore retry handler that never retries, and raises socket errors to the caller
+    """
+    if caught_exception is not None:
+        raise caught_exception
+
+
 class MetaTable(object):
     """
     A pythonic wrapper around table metadata
@@ -36,8 +52,32 @@ class MetaTable(object):
 
     def __init__(self, data):
         self.data = data
-        self._range_keyname = None
         self._hash_keyname = None
+        self._range_keyname = None
+        self._attribute_types = {}
+        self._index_hash_keynames = {}
+        self._request_templates = {}
+        if data:
+            self._build_maps(data)
+
+    def _build_maps(self, data):
+        """
+        Indexes the attribute definitions and key schemas of `data`, so that lookups don't walk lists
+        """
+        for attr in data.get(ATTR_DEFINITIONS) or []:
+            self._attribute_types[attr.get(ATTR_NAME)] = attr.get(ATTR_TYPE)
+        for attr in data.get(KEY_SCHEMA) or []:
+            if attr.get(KEY_TYPE) == HASH:
+                self._hash_keyname = attr.get(ATTR_NAME)
+            elif attr.get(KEY_TYPE) == RANGE:
+                self._range_keyname = attr.get(ATTR_NAME)
+        # Local indexes take precedence over global indexes of the same name
+        indexes = (data.get(GLOBAL_SECONDARY_INDEXES) or []) + (data.get(LOCAL_SECONDARY_INDEXES) or [])
+        for index in indexes:
+            for schema_key in index.get(KEY_SCHEMA):
+                if schema_key.get(KEY_TYPE) == HASH:
+                    self._index_hash_keynames[index.get(INDEX_NAME)] = schema_key.get(ATTR_NAME)
+                    break
 
     def __repr__(self):
         if self.data:
@@ -48,10 +88,6 @@ class MetaTable(object):
         """
         Returns the name of this table's range key
         """
-        if self._range_keyname is None:
-            for attr in self.data.get(KEY_SCHEMA):
-                if attr.get(KEY_TYPE) == RANGE:
-                    self._range_keyname = attr.get(ATTR_NAME)
         return self._range_keyname
 
     @property
@@ -59,29 +95,23 @@ class MetaTable(object):
         """
         Returns the name of this table's hash key
         """
-        if self._hash_keyname is None:
-            for attr in self.data.get(KEY_SCHEMA):
-                if attr.get(KEY_TYPE) == HASH:
-                    self._hash_keyname = attr.get(ATTR_NAME)
-                    break
         return self._hash_keyname
 
     def get_index_hash_keyname(self, index_name):
         """
         Returns the name of the hash key for a given index
         """
-        global_indexes = self.data.get(GLOBAL_SECONDARY_INDEXES)
-        local_indexes = self.data.get(LOCAL_SECONDARY_INDEXES)
-        indexes = []
-        if local_indexes:
-            indexes += local_indexes
-        if global_indexes:
-            indexes += global_indexes
-        for index in indexes:
-            if index.get(INDEX_NAME) == index_name:
-                for schema_key in index.get(KEY_SCHEMA):
-                    if schema_key.get(KEY_TYPE) == HASH:
-                        return schema_key.get(ATTR_NAME)
+        return self._index_hash_keynames.get(index_name)
+
+    def get_request_template(self, table_name, operation_name):
+        """
+        Returns the (cached) request template of `table_name` for `operation_name`
+        """
+        template = self._request_templates.get((table_name, operation_name))
+        if template is None:
+            template = RequestTemplate(self, table_name, operation_name)
+            self._request_templates[(table_name, operation_name)] = template
+        return template
 
     def get_item_attribute_map(self, attributes, item_key=ITEM, pythonic_key=True):
         """
@@ -107,11 +137,11 @@ class MetaTable(object):
         """
         Returns the proper attribute type for a given attribute name
         """
-        for attr in self.data.get(ATTR_DEFINITIONS):
-            if attr.get(ATTR_NAME) == attribute_name:
-                return attr.get(ATTR_TYPE)
-        attr_names = [attr.get(ATTR_NAME) for attr in self.data.get(ATTR_DEFINITIONS)]
-        raise ValueError("No attribute {0} in {1}".format(attribute_name, attr_names))
+        try:
+            return self._attribute_types[attribute_name]
+        except KeyError:
+            attr_names = [attr.get(ATTR_NAME) for attr in self.data.get(ATTR_DEFINITIONS)]
+            raise ValueError("No attribute {0} in {1}".format(attribute_name, attr_names))
 
     def get_identifier_map(self, hash_key, range_key=None, key=KEY):
         """
@@ -133,19 +163,22 @@ class MetaTable(object):
     def get_expected_map(self, expected):
         """
         Builds the expected map that is common to several operations
+
+        A condition value may be given already typed, as `{type: value}`, for
+        attributes that are not part of the table's key schema.
         """
         kwargs = {pythonic(EXPECTED): {}}
         for key, condition in expected.items():
+            expected_condition = {}
             if EXISTS in condition:
-                kwargs[pythonic(EXPECTED)][key] = {
-                    EXISTS: condition.get(EXISTS)
-                }
-            elif VALUE in condition:
-                kwargs[pythonic(EXPECTED)][key] = {
-                    VALUE: {
-                        self.get_attribute_type(key): condition.get(VALUE)
-                    }
-                }
+                expected_condition[EXISTS] = condition.get(EXISTS)
+            if VALUE in condition:
+                value = condition.get(VALUE)
+                if not isinstance(value, dict):
+                    value = {self.get_attribute_type(key): value}
+                expected_condition[VALUE] = value
+            if expected_condition:
+                kwargs[pythonic(EXPECTED)][key] = expected_condition
         return kwargs
 
     def get_exclusive_start_key_map(self, exclusive_start_key):
@@ -168,14 +201,118 @@ class MetaTable(object):
             }
 
 
+class RequestTemplate(object):
+    """
+    A precompiled request for a single table and operation
+
+    The static arguments, key names and key attribute types are resolved once, so that
+    building a request only fills in values.
+    """
+
+    def __init__(self, meta_table, table_name, operation_name):
+        self.meta_table = meta_table
+        self.table_name = table_name
+        self.operation_name = operation_name
+        self.hash_keyname = meta_table.hash_keyname
+        self.range_keyname = meta_table.range_keyname
+        self.hash_key_type = self._get_key_type(self.hash_keyname)
+        self.range_key_type = self._get_key_type(self.range_keyname)
+        self.static_kwargs = {pythonic(RETURN_CONSUMED_CAPACITY): TOTAL}
+        if operation_name not in [BATCH_GET_ITEM, BATCH_WRITE_ITEM]:
+            self.static_kwargs[pythonic(TABLE_NAME)] = self.table_name
+        self.index_hash_keys = {}
+        for index_name, keyname in meta_table._index_hash_keynames.items():
+            self.index_hash_keys[index_name] = (keyname, self._get_key_type(keyname))
+
+    def _get_key_type(self, keyname):
+        """
+        Returns the attribute type of a key, or None if it isn't defined
+        """
+        return self.meta_table._attribute_types.get(keyname)
+
+    def get_kwargs(self):
+        """
+        Returns a new dictionary of the static arguments of this operation
+        """
+        return self.static_kwargs.copy()
+
+    def get_key(self, hash_key, range_key=None):
+        """
+        Returns the AttributeValue map of a primary key
+        """
+        hash_key_type = self.hash_key_type or self.meta_table.get_attribute_type(self.hash_keyname)
+        key = {self.hash_keyname: {hash_key_type: hash_key}}
+        if range_key:
+            range_key_type = self.range_key_type or self.meta_table.get_attribute_type(self.range_keyname)
+            key[self.range_keyname] = {range_key_type: range_key}
+        return key
+
+    def get_hash_key_condition(self, hash_key, index_name=None):
+        """
+        Returns the name and key condition of the hash key of the table, or of `index_name`
+        """
+        if index_name:
+            if index_name not in self.index_hash_keys:
+                raise ValueError("No hash key attribute for index: {0}".format(index_name))
+            hash_keyname, hash_key_type = self.index_hash_keys[index_name]
+        else:
+            hash_keyname, hash_key_type = self.hash_keyname, self.hash_key_type
+        if hash_key_type is None:
+            hash_key_type = self.meta_table.get_attribute_type(hash_keyname)
+        return hash_keyname, {
+            ATTR_VALUE_LIST: [
+                {
+                    hash_key_type: hash_key
+                }
+            ],
+            COMPARISON_OPERATOR: EQ
+        }
+
+
 class Connection(object):
     """
     A higher level abstraction over botocore
     """
 
-    def __init__(self, region=None, host=None):
+    def __init__(self,
+                 region=None,
+                 host=None,
+                 max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+                 pool_idle_timeout=None,
+                 keep_alive=True,
+                 retry_policy=None,
+                 transport=None,
+                 metrics=None,
+                 request_logger=None,
+                 meta_table_cache=None):
+        """
+        :param region: The AWS region to connect to
+        :param host: An alternative DynamoDB url
+        :param max_pool_connections: The maximum number of HTTP connections kept alive for reuse
+        :param pool_idle_timeout: If set, pooled HTTP connections idle for more than this many seconds are reopened
+        :param keep_alive: If False, HTTP connections are not reused
+        :param retry_policy: The `RetryPolicy` for failed requests, defaults to `RetryPolicy()`
+        :param transport: The `Transport` that sends requests, defaults to `BotocoreTransport()`
+        :param metrics: If set, a `MetricsCollector` that receives the metrics of every operation
+        :param request_logger: The `RequestLogger` for debug logging, defaults to `RequestLogger()`
+        :param meta_table_cache: If set, a `MetaTableCache` shared with other connections
+        """
         self._tables = {}
+        self._table_expiry = {}
         self.host = host
+        self._session = None
+        self._service = None
+        self._endpoint = None
+        self._lock = threading.Lock()
+        self.http_adapter = PooledHTTPAdapter(
+            max_pool_connections=max_pool_connections,
+            idle_timeout=pool_idle_timeout,
+            keep_alive=keep_alive)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.transport = transport or BotocoreTransport()
+        self.metrics = metrics
+        self.request_logger = request_logger or RequestLogger()
+        self.meta_table_cache = meta_table_cache
         if region:
             self.region = region
         else:
@@ -184,98 +321,279 @@ class Connection(object):
     def __repr__(self):
         return six.u("Connection<{0}>".format(self.endpoint.host))
 
-    def _log_debug(self, operation, kwargs):
+    def dispatch(self, operation_name, operation_kwargs):
         """
-        Sends a debug message to the logger
+        Dispatches `operation_name` with arguments `operation_kwargs`
+
+        Throttled requests, server errors and socket errors are retried according to `retry_policy`
+        """
+        sampled = self._before_dispatch(operation_name, operation_kwargs)
+        timings = None
+        if self.metrics is not None:
+            started = time.time()
+            timings = {'serialize': 0.0, 'network': 0.0, 'parse': 0.0}
+        attempt = 1
+        while True:
+            try:
+                if timings is None:
+                    response, data = self.transport.send(self, operation_name, operation_kwargs)
+                else:
+                    response, data = self._send_timed(operation_name, operation_kwargs, timings)
+                delay = self.retry_policy.get_retry_delay(operation_name, attempt, response=response, data=data)
+            except self.retry_policy.retryable_exceptions as e:
+                delay = self.retry_policy.get_retry_delay(operation_name, attempt, exception=e)
+                if delay is None:
+                    if timings is not None:
+                        self._record_metrics(
+                            operation_name, operation_kwargs, started, timings, attempt,
+                            error_code=e.__class__.__name__)
+                    raise PynamoDBConnectionError(
+                        "{0} failed after {1} attempts: {2}".format(operation_name, attempt, e),
+                        retryable=True)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+        if timings is not None:
+            self._record_metrics(operation_name, operation_kwargs, started, timings, attempt, response, data)
+        self._after_dispatch(operation_name, response, data, sampled)
+        return response, data
+
+    def _send_timed(self, operation_name, operation_kwargs, timings):
         """
-        log.debug("Calling {0} with arguments {1}".format(
-            operation,
-            kwargs
-        ))
+        Sends a request, adding the time spent in each phase to `timings`
 
-    def _log_debug_response(self, operation, response):
+        If the transport doesn't report its phases, the whole request counts as network time
+        """
+        attempt_timings = {}
+        sent = time.time()
+        try:
+            return self.transport.send(self, operation_name, operation_kwargs, timings=attempt_timings)
+        finally:
+            if attempt_timings:
+                for phase, duration in six.iteritems(attempt_timings):
+                    timings[phase] += duration
+            else:
+                timings['network'] += time.time() - sent
+
+    def _record_metrics(self, operation_name, operation_kwargs, started, timings, attempts,
+                        response=None, data=None, error_code=None):
         """
-        Sends a debug message to the logger about a response
+        Sends the metrics of an operation to `metrics`
         """
-        log.debug("{0} response: {1}".format(operation, response))
+        status_code = getattr(response, 'status_code', None)
+        item_count = 0
+        if response is not None:
+            if response.ok:
+                item_count = get_item_count(operation_name, operation_kwargs, data)
+            else:
+                error_code = get_error_code(data) or status_code
+        self.metrics.record({
+            'operation': operation_name,
+            'table_name': get_table_name(operation_kwargs),
+            'index_name': operation_kwargs.get(pythonic(INDEX_NAME)),
+            'serialize_time': timings['serialize'],
+            'network_time': timings['network'],
+            'parse_time': timings['parse'],
+            'total_time': time.time() - started,
+            'status_code': status_code,
+            'error_code': error_code,
+            'retries': attempts - 1,
+            'capacity_units': get_capacity_units(data),
+            'item_count': item_count
+        })
 
-    def _log_error(self, operation, response):
+    def is_retryable(self, response, data):
         """
-        Sends an error message to the logger
+        Returns True if a failed response may succeed when retried
         """
-        log.error("{0} failed with status: {1}, message: {2}".format(
-            operation,
-            response.status_code,
-            response.content)
-        )
+        return self.retry_policy.is_retryable(response, data)
 
-    def dispatch(self, operation_name, operation_kwargs):
+    def get_retry_stats(self):
         """
-        Dispatches `operation_name` with arguments `operation_kwargs`
+        Returns the retry statistics of this connection
+        """
+        return self.retry_policy.get_stats()
+
+    def _before_dispatch(self, operation_name, operation_kwargs):
+        """
+        Adds the default arguments to `operation_kwargs` and logs the call
+
+        Returns True if the call is sampled for debug logging
         """
         if operation_name not in [DESCRIBE_TABLE, LIST_TABLES, UPDATE_TABLE, DELETE_TABLE, CREATE_TABLE]:
             if pythonic(RETURN_CONSUMED_CAPACITY) not in operation_kwargs:
                 operation_kwargs.update(self.get_consumed_capacity_map(TOTAL))
-        self._log_debug(operation_name, operation_kwargs)
-        response, data = self.service.get_operation(operation_name).call(self.endpoint, **operation_kwargs)
+        sampled = self.request_logger.is_sampled()
+        if sampled:
+            self.request_logger.log_request(operation_name, operation_kwargs)
+        return sampled
+
+    def _after_dispatch(self, operation_name, response, data, sampled):
+        """
+        Logs the response of a call, including the capacity it consumed
+        """
         if not response.ok:
-            self._log_error(operation_name, response)
-        if data and CONSUMED_CAPACITY in data:
-            capacity = data.get(CONSUMED_CAPACITY)
-            if isinstance(capacity, dict) and CAPACITY_UNITS in capacity:
-                capacity = capacity.get(CAPACITY_UNITS)
-            log.debug(
-                "{0} {1} consumed {2} units".format(
-                    data.get(TABLE_NAME, ''),
-                    operation_name,
-                    capacity
-                )
-            )
-        self._log_debug_response(operation_kwargs, response)
-        return response, data
+            self.request_logger.log_error(operation_name, response)
+        if sampled:
+            if data and CONSUMED_CAPACITY in data:
+                log.debug("%s consumed %s units", operation_name, get_capacity_units(data))
+            self.request_logger.log_response(operation_name, data)
 
     @property
     def session(self):
         """
         Returns a valid botocore session
-        """
-        return get_session()
+
+        The session is created once and reused by this connection
+        """
+        session = self._session
+        if session is None:
+            with self._lock:
+                session = self._session
+                if session is None:
+                    session = self._session = get_session()
+        return session
 
     @property
     def service(self):
         """
-        Returns a reference to the dynamodb service
-        """
-        return self.session.get_service(SERVICE_NAME)
+        Returns a (cached) reference to the dynamodb service
+        """
+        service = self._service
+        if service is None:
+            session = self.session
+            with self._lock:
+                service = self._service
+                if service is None:
+                    service = session.get_service(SERVICE_NAME)
+                    # Retries are handled by `dispatch`, according to `retry_policy`
+                    session.unregister(
+                        'needs-retry.{0}'.format(SERVICE_NAME),
+                        unique_id='retry-config-{0}'.format(SERVICE_NAME))
+                    session.register(
+                        'needs-retry.{0}'.format(SERVICE_NAME),
+                        _raise_caught_exception,
+                        unique_id='pynamodb-retry-{0}'.format(SERVICE_NAME))
+                    self._service = service
+        return service
 
     @property
     def endpoint(self):
         """
-        Returns an endpoint connection to `self.region`
+        Returns a (cached) endpoint connection to `self.region`
+
+        Reusing the endpoint allows its underlying HTTP connections to be kept alive between calls
+        """
+        endpoint = self._endpoint
+        if endpoint is None:
+            service = self.service
+            with self._lock:
+                endpoint = self._endpoint
+                if endpoint is None:
+                    if self.host:
+                        endpoint = service.get_endpoint(self.region, endpoint_url=self.host)
+                    else:
+                        endpoint = service.get_endpoint(self.region)
+                    endpoint.http_session.mount('https://', self.http_adapter)
+                    endpoint.http_session.mount('http://', self.http_adapter)
+                    self._endpoint = endpoint
+        return endpoint
+
+    def refresh_session(self):
+        """
+        Discards the cached session, service and endpoint
+
+        They are rebuilt on next use, which picks up any new credentials (e.g. after credential rotation).
+        Pooled HTTP connections are kept.
+        """
+        with self._lock:
+            self._session = None
+            self._service = None
+            self._endpoint = None
+
+    def get_pool_stats(self):
         """
-        if self.host:
-            end_point = self.service.get_endpoint(self.region, endpoint_url=self.host)
-        else:
-            end_point = self.service.get_endpoint(self.region)
-        return end_point
+        Returns the HTTP connection pool statistics for this connection
+        """
+        return self.http_adapter.get_stats()
 
     def get_meta_table(self, table_name, refresh=False):
         """
         Returns a MetaTable
         """
         if table_name not in self._tables or refresh:
+            if self.meta_table_cache is not None:
+                return self._get_cached_meta_table(table_name, refresh)
             operation_kwargs = {
                 pythonic(TABLE_NAME): table_name
             }
             response, data = self.dispatch(DESCRIBE_TABLE, operation_kwargs)
-            if not response.ok:
-                if response.status_code == HTTP_BAD_REQUEST:
-                    return None
-                else:
-                    raise TableError("Unable to describe table: {0}".format(response.content))
-            self._tables[table_name] = MetaTable(data.get(TABLE_KEY))
+            if not self._set_meta_table(table_name, response, data):
+                return None
+        elif table_name in self._table_expiry and self._table_expiry[table_name] < time.time():
+            return self._get_cached_meta_table(table_name, refresh)
         return self._tables[table_name]
 
+    def _get_cached_meta_table(self, table_name, refresh):
+        """
+        Returns a MetaTable from `meta_table_cache`
+
+        The MetaTable is looked up in the cache again once the cache TTL has passed
+        """
+        data = self.meta_table_cache.get(
+            self._get_meta_table_cache_key(table_name),
+            lambda: self._describe_table_data(table_name),
+            refresh=refresh)
+        if data is None:
+            return None
+        meta_table = self._tables.get(table_name)
+        if meta_table is None or meta_table.data is not data:
+            meta_table = self._tables[table_name] = MetaTable(data)
+        self._table_expiry[table_name] = time.time() + self.meta_table_cache.ttl
+        return meta_table
+
+    def _get_meta_table_cache_key(self, table_name):
+        """
+        Returns the key of `table_name` in `meta_table_cache`
+        """
+        return self.region, self.host, table_name
+
+    def _describe_table_data(self, table_name):
+        """
+        Performs the DescribeTable operation, and returns the table data or None
+        """
+        operation_kwargs = {
+            pythonic(TABLE_NAME): table_name
+        }
+        response, data = self.dispatch(DESCRIBE_TABLE, operation_kwargs)
+        if not self._set_meta_table(table_name, response, data):
+            return None
+        return data.get(TABLE_KEY)
+
+    def add_meta_table(self, table_name, meta_table):
+        """
+        Caches `meta_table` as the MetaTable of `table_name`, so that the table isn't described
+        """
+        self._tables[table_name] = meta_table
+        self._table_expiry.pop(table_name, None)
+
+    def _set_meta_table(self, table_name, response, data):
+        """
+        Caches the MetaTable from a DescribeTable response
+
+        Returns False if the table does not exist
+        """
+        if not response.ok:
+            if response.status_code == HTTP_BAD_REQUEST and not self.is_retryable(response, data):
+                return False
+            else:
+                raise TableError(
+                    "Unable to describe table: {0}".format(response.content),
+                    retryable=self.is_retryable(response, data))
+        self._tables[table_name] = MetaTable(data.get(TABLE_KEY))
+        return True
+
     def create_table(self,
                      table_name,
                      attribute_definitions=None,
@@ -336,7 +654,9 @@ class Connection(object):
             operation_kwargs[pythonic(LOCAL_SECONDARY_INDEXES)] = local_secondary_indexes_list
         response, data = self.dispatch(CREATE_TABLE, operation_kwargs)
         if response.status_code != HTTP_OK:
-            raise TableError("Failed to create table: {0}".format(response.content))
+            raise TableError(
+                "Failed to create table: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
         return data
 
     def delete_table(self, table_name):
@@ -348,7 +668,9 @@ class Connection(object):
         }
         response, data = self.dispatch(DELETE_TABLE, operation_kwargs)
         if response.status_code != HTTP_OK:
-            raise TableError("Failed to delete table: {0}".format(response.content))
+            raise TableError(
+                "Failed to delete table: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
 
     def update_table(self,
                      table_name,
@@ -383,7 +705,9 @@ class Connection(object):
             operation_kwargs[pythonic(GLOBAL_SECONDARY_INDEX_UPDATES)] = global_secondary_indexes_list
         response, data = self.dispatch(UPDATE_TABLE, operation_kwargs)
         if not response.ok:
-            raise TableError("Failed to update table: {0}".format(response.content))
+            raise TableError(
+                "Failed to update table: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
 
     def list_tables(self, exclusive_start_table_name=None, limit=None):
         """
@@ -400,7 +724,9 @@ class Connection(object):
             })
         response, data = self.dispatch(LIST_TABLES, operation_kwargs)
         if not response.ok:
-            raise TableError("Unable to list tables: {0}".format(response.content))
+            raise TableError(
+                "Unable to list tables: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
         return data
 
     def describe_table(self, table_name):
@@ -491,6 +817,15 @@ class Connection(object):
             raise TableError("No such table {0}".format(table_name))
         return tbl.get_exclusive_start_key_map(exclusive_start_key)
 
+    def get_request_template(self, table_name, operation_name):
+        """
+        Returns the request template of `table_name` for `operation_name`
+        """
+        tbl = self.get_meta_table(table_name)
+        if tbl is None:
+            raise TableError("No such table {0}".format(table_name))
+        return tbl.get_request_template(table_name, operation_name)
+
     def delete_item(self,
                     table_name,
                     hash_key,
@@ -502,21 +837,44 @@ class Connection(object):
         """
         Performs the DeleteItem operation and returns the result
         """
-        operation_kwargs = {pythonic(TABLE_NAME): table_name}
-        operation_kwargs.update(self.get_identifier_map(table_name, hash_key, range_key))
+        operation_kwargs = self._delete_item_kwargs(
+            table_name,
+            hash_key,
+            range_key=range_key,
+            expected=expected,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics)
+        response, data = self.dispatch(DELETE_ITEM, operation_kwargs)
+        if not response.ok:
+            raise DeleteError(
+                "Failed to delete item: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
+        return data
 
+    def _delete_item_kwargs(self,
+                            table_name,
+                            hash_key,
+                            range_key=None,
+                            expected=None,
+                            return_values=None,
+                            return_consumed_capacity=None,
+                            return_item_collection_metrics=None):
+        """
+        Builds the arguments for the DeleteItem operation
+        """
+        template = self.get_request_template(table_name, DELETE_ITEM)
+        operation_kwargs = template.get_kwargs()
+        operation_kwargs[pythonic(KEY)] = template.get_key(hash_key, range_key)
         if expected:
-            operation_kwargs.update(self.get_expected_map(table_name, expected))
+            operation_kwargs.update(template.meta_table.get_expected_map(expected))
         if return_values:
             operation_kwargs.update(self.get_return_values_map(return_values))
         if return_consumed_capacity:
             operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
         if return_item_collection_metrics:
             operation_kwargs.update(self.get_item_collection_map(return_item_collection_metrics))
-        response, data = self.dispatch(DELETE_ITEM, operation_kwargs)
-        if not response.ok:
-            raise DeleteError("Failed to delete item: {0}".format(response.content))
-        return data
+        return operation_kwargs
 
     def update_item(self,
                     table_name,
@@ -530,10 +888,39 @@ class Connection(object):
         """
         Performs the UpdateItem operation
         """
-        operation_kwargs = {pythonic(TABLE_NAME): table_name}
-        operation_kwargs.update(self.get_identifier_map(table_name, hash_key, range_key))
+        operation_kwargs = self._update_item_kwargs(
+            table_name,
+            hash_key,
+            range_key=range_key,
+            attribute_updates=attribute_updates,
+            expected=expected,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+            return_values=return_values)
+        response, data = self.dispatch(UPDATE_ITEM, operation_kwargs)
+        if not response.ok:
+            raise UpdateError(
+                "Failed to update item: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
+        return data
+
+    def _update_item_kwargs(self,
+                            table_name,
+                            hash_key,
+                            range_key=None,
+                            attribute_updates=None,
+                            expected=None,
+                            return_consumed_capacity=None,
+                            return_item_collection_metrics=None,
+                            return_values=None):
+        """
+        Builds the arguments for the UpdateItem operation
+        """
+        template = self.get_request_template(table_name, UPDATE_ITEM)
+        operation_kwargs = template.get_kwargs()
+        operation_kwargs[pythonic(KEY)] = template.get_key(hash_key, range_key)
         if expected:
-            operation_kwargs.update(self.get_expected_map(table_name, expected))
+            operation_kwargs.update(template.meta_table.get_expected_map(expected))
         if return_consumed_capacity:
             operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
         if return_item_collection_metrics:
@@ -546,27 +933,28 @@ class Connection(object):
 
         operation_kwargs[pythonic(ATTR_UPDATES)] = {}
         for key, update in attribute_updates.items():
+            action = update.get(ACTION)
+            if action not in ATTR_UPDATE_ACTIONS:
+                raise ValueError("{0} must be one of {1}".format(ACTION, ATTR_UPDATE_ACTIONS))
             value = update.get(VALUE)
-            if isinstance(value, six.string_types):
-                attr_type = self.get_attribute_type(table_name, key)
+            if value is None and action == DELETE:
+                # Deletes the whole attribute
+                operation_kwargs[pythonic(ATTR_UPDATES)][key] = {ACTION: action}
+                continue
+            elif isinstance(value, six.string_types):
+                attr_type = template.meta_table.get_attribute_type(key)
                 value = update.get(VALUE)
             elif isinstance(value, dict):
                 attr_type, value = value.popitem()
             else:
                 raise ValueError("Invalid attribute update: {0}".format(value))
-            action = update.get(ACTION)
-            if action not in ATTR_UPDATE_ACTIONS:
-                raise ValueError("{0} must be one of {1}".format(ACTION, ATTR_UPDATE_ACTIONS))
             operation_kwargs[pythonic(ATTR_UPDATES)][key] = {
                 ACTION: action,
                 VALUE: {
                     attr_type: value
                 }
             }
-        response, data = self.dispatch(UPDATE_ITEM, operation_kwargs)
-        if not response.ok:
-            raise UpdateError("Failed to update item: {0}".format(response.content))
-        return data
+        return operation_kwargs
 
     def put_item(self,
                  table_name,
@@ -580,10 +968,39 @@ class Connection(object):
         """
         Performs the PutItem operation and returns the result
         """
-        operation_kwargs = {pythonic(TABLE_NAME): table_name}
-        operation_kwargs.update(self.get_identifier_map(table_name, hash_key, range_key, key=ITEM))
+        operation_kwargs = self._put_item_kwargs(
+            table_name,
+            hash_key,
+            range_key=range_key,
+            attributes=attributes,
+            expected=expected,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics)
+        response, data = self.dispatch(PUT_ITEM, operation_kwargs)
+        if not response.ok:
+            raise PutError(
+                "Failed to put item: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
+        return data
+
+    def _put_item_kwargs(self,
+                         table_name,
+                         hash_key,
+                         range_key=None,
+                         attributes=None,
+                         expected=None,
+                         return_values=None,
+                         return_consumed_capacity=None,
+                         return_item_collection_metrics=None):
+        """
+        Builds the arguments for the PutItem operation
+        """
+        template = self.get_request_template(table_name, PUT_ITEM)
+        operation_kwargs = template.get_kwargs()
+        operation_kwargs[pythonic(ITEM)] = template.get_key(hash_key, range_key)
         if attributes:
-            attrs = self.get_item_attribute_map(table_name, attributes)
+            attrs = template.meta_table.get_item_attribute_map(attributes)
             operation_kwargs[pythonic(ITEM)].update(attrs[pythonic(ITEM)])
         if return_consumed_capacity:
             operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
@@ -592,11 +1009,8 @@ class Connection(object):
         if return_values:
             operation_kwargs.update(self.get_return_values_map(return_values))
         if expected:
-            operation_kwargs.update(self.get_expected_map(table_name, expected))
-        response, data = self.dispatch(PUT_ITEM, operation_kwargs)
-        if not response.ok:
-            raise PutError("Failed to put item: {0}".format(response.content))
-        return data
+            operation_kwargs.update(template.meta_table.get_expected_map(expected))
+        return operation_kwargs
 
     def batch_write_item(self,
                          table_name,
@@ -607,12 +1021,34 @@ class Connection(object):
         """
         Performs the batch_write_item operation
         """
+        operation_kwargs = self._batch_write_item_kwargs(
+            table_name,
+            put_items=put_items,
+            delete_items=delete_items,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics)
+        response, data = self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
+        if not response.ok:
+            raise PutError(
+                "Failed to batch write items: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
+        return data
+
+    def _batch_write_item_kwargs(self,
+                                 table_name,
+                                 put_items=None,
+                                 delete_items=None,
+                                 return_consumed_capacity=None,
+                                 return_item_collection_metrics=None):
+        """
+        Builds the arguments for the BatchWriteItem operation
+        """
         if put_items is None and delete_items is None:
             raise ValueError("Either put_items or delete_items must be specified")
-        operation_kwargs = {
-            pythonic(REQUEST_ITEMS): {
-                table_name: []
-            }
+        template = self.get_request_template(table_name, BATCH_WRITE_ITEM)
+        operation_kwargs = template.get_kwargs()
+        operation_kwargs[pythonic(REQUEST_ITEMS)] = {
+            table_name: []
         }
         if return_consumed_capacity:
             operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
@@ -622,19 +1058,16 @@ class Connection(object):
         if put_items:
             for item in put_items:
                 put_items_list.append({
-                    PUT_REQUEST: self.get_item_attribute_map(table_name, item, pythonic_key=False)
+                    PUT_REQUEST: template.meta_table.get_item_attribute_map(item, pythonic_key=False)
                 })
         delete_items_list = []
         if delete_items:
             for item in delete_items:
                 delete_items_list.append({
-                    DELETE_REQUEST: self.get_item_attribute_map(table_name, item, item_key=KEY, pythonic_key=False)
+                    DELETE_REQUEST: template.meta_table.get_item_attribute_map(item, item_key=KEY, pythonic_key=False)
                 })
         operation_kwargs[pythonic(REQUEST_ITEMS)][table_name] = delete_items_list + put_items_list
-        response, data = self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
-        if not response.ok:
-            raise PutError("Failed to batch write items: {0}".format(response.content))
-        return data
+        return operation_kwargs
 
     def batch_get_item(self,
                        table_name,
@@ -645,10 +1078,32 @@ class Connection(object):
         """
         Performs the batch get item operation
         """
-        operation_kwargs = {
-            pythonic(REQUEST_ITEMS): {
-                table_name: {}
-            }
+        operation_kwargs = self._batch_get_item_kwargs(
+            table_name,
+            keys,
+            consistent_read=consistent_read,
+            return_consumed_capacity=return_consumed_capacity,
+            attributes_to_get=attributes_to_get)
+        response, data = self.dispatch(BATCH_GET_ITEM, operation_kwargs)
+        if not response.ok:
+            raise GetError(
+                "Failed to batch get items: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
+        return data
+
+    def _batch_get_item_kwargs(self,
+                               table_name,
+                               keys,
+                               consistent_read=None,
+                               return_consumed_capacity=None,
+                               attributes_to_get=None):
+        """
+        Builds the arguments for the BatchGetItem operation
+        """
+        template = self.get_request_template(table_name, BATCH_GET_ITEM)
+        operation_kwargs = template.get_kwargs()
+        operation_kwargs[pythonic(REQUEST_ITEMS)] = {
+            table_name: {}
         }
 
         args_map = {}
@@ -663,13 +1118,10 @@ class Connection(object):
         keys_map = {KEYS: []}
         for key in keys:
             keys_map[KEYS].append(
-                self.get_item_attribute_map(table_name, key)[pythonic(ITEM)]
+                template.meta_table.get_item_attribute_map(key)[pythonic(ITEM)]
             )
         operation_kwargs[pythonic(REQUEST_ITEMS)][table_name].update(keys_map)
-        response, data = self.dispatch(BATCH_GET_ITEM, operation_kwargs)
-        if not response.ok:
-            raise GetError("Failed to batch get items: {0}".format(response.content))
-        return data
+        return operation_kwargs
 
     def get_item(self,
                  table_name,
@@ -680,17 +1132,36 @@ class Connection(object):
         """
         Performs the GetItem operation and returns the result
         """
-        operation_kwargs = {}
-        if attributes_to_get is not None:
-            operation_kwargs[pythonic(ATTRS_TO_GET)] = attributes_to_get
-        operation_kwargs[pythonic(CONSISTENT_READ)] = consistent_read
-        operation_kwargs[pythonic(TABLE_NAME)] = table_name
-        operation_kwargs.update(self.get_identifier_map(table_name, hash_key, range_key))
+        operation_kwargs = self._get_item_kwargs(
+            table_name,
+            hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get)
         response, data = self.dispatch(GET_ITEM, operation_kwargs)
         if not response.ok:
-            raise GetError("Failed to get item: {0}".format(response.content))
+            raise GetError(
+                "Failed to get item: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
         return data
 
+    def _get_item_kwargs(self,
+                         table_name,
+                         hash_key,
+                         range_key=None,
+                         consistent_read=False,
+                         attributes_to_get=None):
+        """
+        Builds the arguments for the GetItem operation
+        """
+        template = self.get_request_template(table_name, GET_ITEM)
+        operation_kwargs = template.get_kwargs()
+        if attributes_to_get is not None:
+            operation_kwargs[pythonic(ATTRS_TO_GET)] = attributes_to_get
+        operation_kwargs[pythonic(CONSISTENT_READ)] = consistent_read
+        operation_kwargs[pythonic(KEY)] = template.get_key(hash_key, range_key)
+        return operation_kwargs
+
     def scan(self,
              table_name,
              attributes_to_get=None,
@@ -699,11 +1170,43 @@ class Connection(object):
              return_consumed_capacity=None,
              exclusive_start_key=None,
              segment=None,
-             total_segments=None):
+             total_segments=None,
+             select=None):
         """
         Performs the scan operation
         """
-        operation_kwargs = {pythonic(TABLE_NAME): table_name}
+        operation_kwargs = self._scan_kwargs(
+            table_name,
+            attributes_to_get=attributes_to_get,
+            limit=limit,
+            scan_filter=scan_filter,
+            return_consumed_capacity=return_consumed_capacity,
+            exclusive_start_key=exclusive_start_key,
+            segment=segment,
+            total_segments=total_segments,
+            select=select)
+        response, data = self.dispatch(SCAN, operation_kwargs)
+        if not response.ok:
+            raise ScanError(
+                "Failed to scan table: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
+        return data
+
+    def _scan_kwargs(self,
+                     table_name,
+                     attributes_to_get=None,
+                     limit=None,
+                     scan_filter=None,
+                     return_consumed_capacity=None,
+                     exclusive_start_key=None,
+                     segment=None,
+                     total_segments=None,
+                     select=None):
+        """
+        Builds the arguments for the Scan operation
+        """
+        template = self.get_request_template(table_name, SCAN)
+        operation_kwargs = template.get_kwargs()
         if attributes_to_get is not None:
             operation_kwargs[pythonic(ATTRS_TO_GET)] = attributes_to_get
         if limit is not None:
@@ -711,15 +1214,19 @@ class Connection(object):
         if return_consumed_capacity:
             operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
         if exclusive_start_key:
-            operation_kwargs.update(self.get_exclusive_start_key_map(table_name, exclusive_start_key))
+            operation_kwargs.update(template.meta_table.get_exclusive_start_key_map(exclusive_start_key))
         if segment is not None:
             operation_kwargs[pythonic(SEGMENT)] = segment
         if total_segments:
             operation_kwargs[pythonic(TOTAL_SEGMENTS)] = total_segments
+        if select:
+            if select.upper() not in SELECT_VALUES:
+                raise ValueError("{0} must be one of {1}".format(SELECT, SELECT_VALUES))
+            operation_kwargs[pythonic(SELECT)] = str(select).upper()
         if scan_filter:
             operation_kwargs[pythonic(SCAN_FILTER)] = {}
             for key, condition in scan_filter.items():
-                attr_type = self.get_attribute_type(table_name, key)
+                attr_type = template.meta_table.get_attribute_type(key)
                 operator = condition.get(COMPARISON_OPERATOR)
                 if operator not in SCAN_FILTER_VALUES:
                     raise ValueError("{0} must be one of {1}".format(COMPARISON_OPERATOR, SCAN_FILTER_VALUES))
@@ -727,10 +1234,7 @@ class Connection(object):
                     ATTR_VALUE_LIST: [{attr_type: value for value in condition.get(ATTR_VALUE_LIST)}],
                     COMPARISON_OPERATOR: operator
                 }
-        response, data = self.dispatch(SCAN, operation_kwargs)
-        if not response.ok:
-            raise ScanError("Failed to scan table: {0}".format(response.content))
-        return data
+        return operation_kwargs
 
     def query(self,
               table_name,
@@ -747,13 +1251,48 @@ class Connection(object):
         """
         Performs the Query operation and returns the result
         """
-        operation_kwargs = {pythonic(TABLE_NAME): table_name}
+        operation_kwargs = self._query_kwargs(
+            table_name,
+            hash_key,
+            attributes_to_get=attributes_to_get,
+            consistent_read=consistent_read,
+            exclusive_start_key=exclusive_start_key,
+            index_name=index_name,
+            key_conditions=key_conditions,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            scan_index_forward=scan_index_forward,
+            select=select)
+        response, data = self.dispatch(QUERY, operation_kwargs)
+        if not response.ok:
+            raise QueryError(
+                "Failed to query items: {0}".format(response.content),
+                retryable=self.is_retryable(response, data))
+        return data
+
+    def _query_kwargs(self,
+                      table_name,
+                      hash_key,
+                      attributes_to_get=None,
+                      consistent_read=False,
+                      exclusive_start_key=None,
+                      index_name=None,
+                      key_conditions=None,
+                      limit=None,
+                      return_consumed_capacity=None,
+                      scan_index_forward=None,
+                      select=None):
+        """
+        Builds the arguments for the Query operation
+        """
+        template = self.get_request_template(table_name, QUERY)
+        operation_kwargs = template.get_kwargs()
         if attributes_to_get:
             operation_kwargs[pythonic(ATTRS_TO_GET)] = attributes_to_get
         if consistent_read:
             operation_kwargs[pythonic(CONSISTENT_READ)] = True
         if exclusive_start_key:
-            operation_kwargs.update(self.get_exclusive_start_key_map(table_name, exclusive_start_key))
+            operation_kwargs.update(template.meta_table.get_exclusive_start_key_map(exclusive_start_key))
         if index_name:
             operation_kwargs[pythonic(INDEX_NAME)] = index_name
         if limit is not None:
@@ -766,29 +1305,14 @@ class Connection(object):
             operation_kwargs[pythonic(SELECT)] = str(select).upper()
         if scan_index_forward is not None:
             operation_kwargs[pythonic(SCAN_INDEX_FORWARD)] = scan_index_forward
-        tbl = self.get_meta_table(table_name)
-        if tbl is None:
-            raise TableError("No such table: {0}".format(table_name))
-        if index_name:
-            hash_keyname = tbl.get_index_hash_keyname(index_name)
-            if not hash_keyname:
-                raise ValueError("No hash key attribute for index: {0}".format(index_name))
-        else:
-            hash_keyname = tbl.hash_keyname
+        hash_keyname, hash_key_condition = template.get_hash_key_condition(hash_key, index_name)
         operation_kwargs[pythonic(KEY_CONDITIONS)] = {
-            hash_keyname: {
-                ATTR_VALUE_LIST: [
-                    {
-                        self.get_attribute_type(table_name, hash_keyname): hash_key,
-                    }
-                ],
-                COMPARISON_OPERATOR: EQ
-            },
+            hash_keyname: hash_key_condition
         }
         # key_conditions = {'key': {'ComparisonOperator': 'EQ', 'AttributeValueList': ['value']}
         if key_conditions:
             for key, condition in key_conditions.items():
-                attr_type = self.get_attribute_type(table_name, key)
+                attr_type = template.meta_table.get_attribute_type(key)
                 operator = condition.get(COMPARISON_OPERATOR)
                 if operator not in COMPARISON_OPERATOR_VALUES:
                     raise ValueError("{0} must be one of {1}".format(COMPARISON_OPERATOR, COMPARISON_OPERATOR_VALUES))
@@ -796,8 +1320,4 @@ class Connection(object):
                     ATTR_VALUE_LIST: [{attr_type: value for value in condition.get(ATTR_VALUE_LIST)}],
                     COMPARISON_OPERATOR: operator
                 }
-
-        response, data = self.dispatch(QUERY, operation_kwargs)
-        if not response.ok:
-            raise QueryError("Failed to query items: {0}".format(response.content))
-        return data
+        return operation_kwargs
@@ -0,0 +1,288 @@
+"""
+A cache of table meta data, shared by connections
+"""
+import os
+import json
+import time
+import errno
+import hashlib
+import logging
+import tempfile
+import threading
+
+from pynamodb.constants import (
+    DEFAULT_META_TABLE_CACHE_TTL, DEFAULT_META_TABLE_CACHE_LOCK_TIMEOUT, DEFAULT_ENCODING
+)
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+class MetaTableCache(object):
+    """
+    Caches DescribeTable responses for any number of connections
+
+    Entries are keyed by region, host and table name. They are kept in memory, and if `path`
+    is set, in a directory shared by processes, such as prefork workers. Entries older than
+    `ttl` seconds are refreshed in a background thread, while the stale entry keeps being used.
+
+    When a table isn't cached, one process describes it while the others wait for its result,
+    up to `lock_timeout` seconds, so that workers starting at once describe each table once.
+    """
+
+    def __init__(self, ttl=DEFAULT_META_TABLE_CACHE_TTL, path=None, background_refresh=True,
+                 lock_timeout=DEFAULT_META_TABLE_CACHE_LOCK_TIMEOUT):
+        """
+        :param ttl: The number of seconds before an entry is refreshed
+        :param path: If set, a directory in which entries are stored
+        :param background_refresh: If False, stale entries are refreshed before being returned
+        :param lock_timeout: The number of seconds to wait for another process to describe a table
+        """
+        self.ttl = ttl
+        self.path = path
+        self.background_refresh = background_refresh
+        self.lock_timeout = lock_timeout
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._refreshing = set()
+        self._entries = {}
+
+    def get(self, key, load, refresh=False):
+        """
+        Returns the table data cached under `key`
+
+        `load` is called to describe the table if it isn't cached, or if `refresh` is set. It returns
+        the table data, or None if the table doesn't exist, which isn't cached.
+        """
+        if refresh:
+            return self._load(key, load)
+        entry = self._get_entry(key)
+        if entry is None:
+            return self._load_once(key, load)
+        data, stored_at = entry
+        if time.time() - stored_at > self.ttl:
+            if not self.background_refresh:
+                return self._load_once(key, load)
+            self._refresh_in_background(key, load)
+        return data
+
+    def get_cached(self, key):
+        """
+        Returns the table data cached under `key`, even if it is stale, or None
+        """
+        entry = self._get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, data):
+        """
+        Caches the table data `data` under `key`
+        """
+        stored_at = time.time()
+        self._entries[key] = (data, stored_at)
+        if self.path is not None:
+            self._write_file(key, data, stored_at)
+
+    def clear(self):
+        """
+        Removes all entries from memory
+        """
+        self._entries = {}
+
+    def _get_entry(self, key):
+        """
+        Returns the `(data, stored_at)` entry of `key`, reading it from disk if needed
+        """
+        entry = self._entries.get(key)
+        if entry is None and self.path is not None:
+            entry = self._read_file(key)
+            if entry is not None:
+                self._entries[key] = entry
+        return entry
+
+    def _is_fresh(self, entry):
+        """
+        Returns True if `entry` is younger than the TTL
+        """
+        return entry is not None and time.time() - entry[1] <= self.ttl
+
+    def _load(self, key, load):
+        """
+        Describes a table, and caches the result
+        """
+        data = load()
+        if data is not None:
+            self.set(key, data)
+        return data
+
+    def _load_once(self, key, load):
+        """
+        Describes a table, unless another thread or process is already doing so
+        """
+        with self._get_key_lock(key):
+            entry = self._entries.get(key)
+            if self._is_fresh(entry):
+                return entry[0]
+            if self.path is None:
+                return self._load(key, load)
+            deadline = time.time() + self.lock_timeout
+            locked = self._acquire_file_lock(key)
+            while locked is False:
+                entry = self._read_file(key)
+                if self._is_fresh(entry):
+                    self._entries[key] = entry
+                    return entry[0]
+                if time.time() > deadline:
+                    log.debug("Timed out waiting for table meta data of %s", key)
+                    return self._load(key, load)
+                time.sleep(LOCK_POLL_INTERVAL)
+                locked = self._acquire_file_lock(key)
+            if locked is None:
+                return self._load(key, load)
+            try:
+                entry = self._read_file(key)
+                if self._is_fresh(entry):
+                    self._entries[key] = entry
+                    return entry[0]
+                return self._load(key, load)
+            finally:
+                self._release_file_lock(key)
+
+    def _refresh_in_background(self, key, load):
+        """
+        Starts a thread refreshing `key`, unless one is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        thread = threading.Thread(target=self._refresh, args=(key, load))
+        thread.daemon = True
+        thread.start()
+
+    def _refresh(self, key, load):
+        """
+        Refreshes `key`, unless another process is already doing so
+        """
+        try:
+            locked = None if self.path is None else self._acquire_file_lock(key)
+            if locked is None:
+                self._load(key, load)
+            elif locked:
+                try:
+                    entry = self._read_file(key)
+                    if self._is_fresh(entry):
+                        self._entries[key] = entry
+                    else:
+                        self._load(key, load)
+                finally:
+                    self._release_file_lock(key)
+        except Exception as e:
+            log.warning("Unable to refresh table meta data of %s: %s", key, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _get_key_lock(self, key):
+        """
+        Returns the lock of `key`
+        """
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _get_file_name(self, key):
+        """
+        Returns the path of the file storing `key`
+        """
+        digest = hashlib.sha1(json.dumps(list(key)).encode(DEFAULT_ENCODING)).hexdigest()
+        return os.path.join(self.path, 'pynamodb-meta-table-{0}.json'.format(digest))
+
+    def _read_file(self, key):
+        """
+        Returns the entry of `key` stored on disk, or None
+        """
+        try:
+            with open(self._get_file_name(key)) as cache_file:
+                entry = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+        return entry.get('data'), entry.get('stored_at', 0)
+
+    def _write_file(self, key, data, stored_at):
+        """
+        Stores the entry of `key` on disk
+
+        The entry is written to a temporary file that is then renamed, so readers never see partial entries
+        """
+        file_name = self._get_file_name(key)
+        temp_name = None
+        try:
+            handle, temp_name = tempfile.mkstemp(dir=self.path, prefix='.pynamodb-')
+            with os.fdopen(handle, 'w') as cache_file:
+                json.dump({'key': list(key), 'stored_at': stored_at, 'data': data}, cache_file)
+            os.rename(temp_name, file_name)
+        except (IOError, OSError, TypeError, ValueError) as e:
+            log.warning("Unable to store table meta data in %s: %s", file_name, e)
+            if temp_name is not None:
+                try:
+                    os.remove(temp_name)
+                except OSError:
+                    pass
+
+    def _acquire_file_lock(self, key):
+        """
+        Returns True if this process acquired the lock file of `key`, False if another process
+        holds it, or None if it can't be created, in which case there is nothing to release
+
+        Lock files older than `lock_timeout` are considered abandoned, and removed
+        """
+        lock_name = '{0}.lock'.format(self._get_file_name(key))
+        try:
+            os.close(os.open(lock_name, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                log.warning("Unable to lock table meta data in %s: %s", lock_name, e)
+                return None
+        self._remove_stale_file_lock(lock_name)
+        return False
+
+    def _remove_stale_file_lock(self, lock_name):
+        """
+        Removes the lock file `lock_name` if it is older than `lock_timeout`
+
+        The lock file is renamed before it is removed, so that a single process removes it. If another
+        process replaced the stale lock file in the meantime, the lock file it created is put back.
+        """
+        try:
+            stat = os.stat(lock_name)
+            if time.time() - stat.st_mtime <= self.lock_timeout:
+                return
+            stale_name = '{0}.{1}-{2}.stale'.format(lock_name, os.getpid(), threading.current_thread().ident)
+            os.rename(lock_name, stale_name)
+        except OSError:
+            return
+        try:
+            renamed = os.stat(stale_name)
+            if (renamed.st_ino, renamed.st_mtime) != (stat.st_ino, stat.st_mtime):
+                os.link(stale_name, lock_name)
+        except OSError:
+            pass
+        finally:
+            try:
+                os.remove(stale_name)
+            except OSError:
+                pass
+
+    def _release_file_lock(self, key):
+        """
+        Releases the lock file of `key`
+        """
+        try:
+            os.remove('{0}.lock'.format(self._get_file_name(key)))
+        except OSError:
+            pass
@@ -0,0 +1,85 @@
+"""
+Debug logging of requests and responses
+"""
+import logging
+import itertools
+
+from six.moves import reprlib
+
+from pynamodb.constants import DEFAULT_LOG_SAMPLE_RATE, DEFAULT_LOG_MAX_PAYLOAD_LENGTH
+
+log = logging.getLogger('pynamodb.connection.base')
+log.addHandler(logging.NullHandler())
+
+
+class TruncatedPayload(object):
+    """
+    A payload that is only converted to a string when a log record is formatted
+
+    Nested containers and long strings are abbreviated as they are converted, so the cost
+    of logging a large payload is bounded, and the result is cut to `max_length` characters.
+    """
+    __slots__ = ('payload', 'max_length')
+
+    def __init__(self, payload, max_length):
+        self.payload = payload
+        self.max_length = max_length
+
+    def __str__(self):
+        if self.max_length is None:
+            return str(self.payload)
+        formatter = reprlib.Repr()
+        formatter.maxlevel = 8
+        formatter.maxdict = formatter.maxlist = formatter.maxset = formatter.maxtuple = self.max_length // 4
+        formatter.maxstring = formatter.maxother = self.max_length
+        value = formatter.repr(self.payload)
+        if len(value) > self.max_length:
+            value = '{0}...'.format(value[:self.max_length])
+        return value
+
+
+class RequestLogger(object):
+    """
+    Logs requests and responses at the DEBUG level of the `pynamodb.connection.base` logger
+
+    Nothing is formatted unless DEBUG logging is enabled. To keep request logging enabled on busy
+    connections, only one request in `sample_rate` is logged, and payloads are truncated to
+    `max_payload_length` characters.
+    """
+
+    def __init__(self, sample_rate=DEFAULT_LOG_SAMPLE_RATE, max_payload_length=DEFAULT_LOG_MAX_PAYLOAD_LENGTH):
+        """
+        :param sample_rate: Log one request in this many
+        :param max_payload_length: The maximum length of logged payloads, or None to log them in full
+        """
+        self.sample_rate = sample_rate
+        self.max_payload_length = max_payload_length
+        self._counter = itertools.count()
+
+    def is_sampled(self):
+        """
+        Returns True if the next request should be logged
+        """
+        if not log.isEnabledFor(logging.DEBUG):
+            return False
+        return self.sample_rate <= 1 or next(self._counter) % self.sample_rate == 0
+
+    def log_request(self, operation_name, operation_kwargs):
+        """
+        Logs a request
+        """
+        log.debug("Calling %s with arguments %s",
+                  operation_name, TruncatedPayload(operation_kwargs, self.max_payload_length))
+
+    def log_response(self, operation_name, data):
+        """
+        Logs a response
+        """
+        log.debug("%s response: %s", operation_name, TruncatedPayload(data, self.max_payload_length))
+
+    def log_error(self, operation_name, response):
+        """
+        Logs a failed response at the ERROR level
+        """
+        log.error("%s failed with status: %s, message: %s",
+                  operation_name, response.status_code, TruncatedPayload(response.content, self.max_payload_length))
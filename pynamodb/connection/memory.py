@@ -0,0 +1,881 @@
+"""
+An in-memory DynamoDB backend
+
+`InMemoryTransport` implements the DynamoDB operations used by PynamoDB on in-process data
+structures, so that models and connections can be exercised without a network:
+
+    from pynamodb.connection import Connection
+    from pynamodb.connection.memory import InMemoryTransport
+
+    conn = Connection(transport=InMemoryTransport())
+
+Consumed capacity is estimated from item sizes, as DynamoDB does.
+"""
+import copy
+import json
+import math
+import time
+import zlib
+import bisect
+import decimal
+import itertools
+import threading
+
+import six
+
+from .transport import Transport
+from .util import pythonic
+from pynamodb.constants import (
+    BATCH_WRITE_ITEM, DESCRIBE_TABLE, BATCH_GET_ITEM, CREATE_TABLE, UPDATE_TABLE, DELETE_TABLE, LIST_TABLES,
+    UPDATE_ITEM, DELETE_ITEM, GET_ITEM, PUT_ITEM, QUERY, SCAN, GLOBAL_SECONDARY_INDEX_UPDATES,
+    EXCLUSIVE_START_TABLE_NAME, RETURN_CONSUMED_CAPACITY, COMPARISON_OPERATOR, SCAN_INDEX_FORWARD,
+    ATTR_DEFINITIONS, ATTR_VALUE_LIST, TABLE_DESCRIPTION, UNPROCESSED_KEYS, UNPROCESSED_ITEMS, CONSISTENT_READ,
+    DELETE_REQUEST, RETURN_VALUES, REQUEST_ITEMS, ATTRS_TO_GET, ATTR_UPDATES, TABLE_STATUS, TABLE_NAMES,
+    LAST_EVALUATED_TABLE_NAME, ITEM_COUNT, TABLE_SIZE_BYTES, CREATION_DATE_TIME, INDEX_STATUS, SCANNED_COUNT,
+    CAMEL_COUNT, SCAN_FILTER, TABLE_NAME, KEY_SCHEMA, ATTR_NAME, ATTR_TYPE, PUT_REQUEST, INDEX_NAME, ATTRIBUTES,
+    TABLE_KEY, RESPONSES, KEY_TYPE, ACTION, UPDATE, EXISTS, SELECT, ACTIVE, DELETING, LIMIT, ITEMS, ITEM, KEYS,
+    KEY, DEFAULT_ENCODING, HTTP_OK, HTTP_BAD_REQUEST, ERRORS, CODE, MESSAGE, CONDITIONAL_CHECK_FAILED,
+    RESOURCE_NOT_FOUND, RESOURCE_IN_USE, VALIDATION_EXCEPTION, PROVISIONED_THROUGHPUT, READ_CAPACITY_UNITS,
+    WRITE_CAPACITY_UNITS, STRING_SHORT, STRING_SET_SHORT, NUMBER_SHORT, NUMBER_SET_SHORT, BINARY_SHORT,
+    BINARY_SET_SHORT, LOCAL_SECONDARY_INDEXES, GLOBAL_SECONDARY_INDEXES, PROJECTION, PROJECTION_TYPE,
+    NON_KEY_ATTRIBUTES, KEYS_ONLY, INCLUDE, KEY_CONDITIONS, EXCLUSIVE_START_KEY, LAST_EVALUATED_KEY,
+    BEGINS_WITH, BETWEEN, EQ, NE, LE, LT, GE, GT, IN, NOT_NULL, NULL, CONTAINS, NOT_CONTAINS, COUNT,
+    SEGMENT, TOTAL_SEGMENTS, TOTAL, INDEXES, ALL_OLD, UPDATED_OLD, ALL_NEW, UPDATED_NEW, PUT, DELETE, ADD,
+    CONSUMED_CAPACITY, CAPACITY_UNITS, BATCH_GET_PAGE_LIMIT, BATCH_WRITE_PAGE_LIMIT, EXPECTED, VALUE
+)
+from pynamodb.types import HASH, RANGE
+
+SET_TYPES = [STRING_SET_SHORT, NUMBER_SET_SHORT, BINARY_SET_SHORT]
+SCALAR_TYPES = [STRING_SHORT, NUMBER_SHORT, BINARY_SHORT]
+READ_UNIT_SIZE = 4096
+WRITE_UNIT_SIZE = 1024
+
+
+class BackendError(Exception):
+    """
+    An error returned to the client as a DynamoDB error response
+    """
+
+    def __init__(self, code, message):
+        super(BackendError, self).__init__(message)
+        self.code = code
+        self.message = message
+
+
+class MemoryResponse(object):
+    """
+    A response of the in-memory backend, compatible with the HTTP responses of botocore
+    """
+
+    def __init__(self, data, status_code=HTTP_OK):
+        self.data = data
+        self.status_code = status_code
+        self.reason = 'OK' if status_code == HTTP_OK else 'Bad Request'
+        self.headers = {}
+
+    @property
+    def ok(self):
+        """
+        Returns True if the status code is not an error
+        """
+        return self.status_code < HTTP_BAD_REQUEST
+
+    @property
+    def content(self):
+        """
+        Returns the response body
+        """
+        return json.dumps(self.data).encode(DEFAULT_ENCODING)
+
+    def __repr__(self):
+        return '<MemoryResponse [{0}]>'.format(self.status_code)
+
+
+def _get(data, name, default=None):
+    """
+    Returns `name` from `data`, which may use DynamoDB or pythonic names
+    """
+    if name in data:
+        return data[name]
+    return data.get(pythonic(name), default)
+
+
+def _typed(attribute_value):
+    """
+    Returns the type and a comparable python value of an AttributeValue
+    """
+    for attr_type, value in six.iteritems(attribute_value):
+        if attr_type == NUMBER_SHORT:
+            return attr_type, decimal.Decimal(value)
+        elif attr_type == NUMBER_SET_SHORT:
+            return attr_type, frozenset(decimal.Decimal(element) for element in value)
+        elif attr_type in SET_TYPES:
+            return attr_type, frozenset(value)
+        return attr_type, value
+    raise BackendError(VALIDATION_EXCEPTION, "Supplied AttributeValue is empty")
+
+
+def _scalar(attribute_value):
+    """
+    Returns a comparable python value of a scalar AttributeValue
+    """
+    return _typed(attribute_value)[1]
+
+
+def _format_number(value):
+    """
+    Formats a decimal as a DynamoDB number
+    """
+    value = '{0:f}'.format(value)
+    if '.' in value:
+        value = value.rstrip('0').rstrip('.')
+    return value
+
+
+def _copy_item(item):
+    """
+    Returns a copy of an attribute map
+    """
+    return dict(
+        (name, dict((attr_type, list(value) if isinstance(value, list) else value)
+                    for attr_type, value in six.iteritems(attribute_value)))
+        for name, attribute_value in six.iteritems(item)
+    )
+
+
+def _item_size(item):
+    """
+    Returns the size of an item in bytes, as counted for consumed capacity
+    """
+    size = 0
+    for name, attribute_value in six.iteritems(item):
+        size += len(name)
+        for value in attribute_value.values():
+            if isinstance(value, list):
+                size += sum(len(element) for element in value)
+            else:
+                size += len(value)
+    return size
+
+
+def _read_units(size, consistent_read):
+    """
+    Returns the read capacity units consumed by reading `size` bytes
+    """
+    units = max(1, int(math.ceil(size / float(READ_UNIT_SIZE))))
+    return float(units) if consistent_read else units / 2.0
+
+
+def _write_units(size):
+    """
+    Returns the write capacity units consumed by writing `size` bytes
+    """
+    return float(max(1, int(math.ceil(size / float(WRITE_UNIT_SIZE)))))
+
+
+def _matches(attribute_value, operator, values):
+    """
+    Returns True if `attribute_value` satisfies a comparison operator
+
+    `attribute_value` is None if the attribute does not exist
+    """
+    if operator == NULL:
+        return attribute_value is None
+    elif operator == NOT_NULL:
+        return attribute_value is not None
+    elif attribute_value is None:
+        return operator in [NE, NOT_CONTAINS]
+    attr_type, value = _typed(attribute_value)
+    args = [_typed(arg) for arg in values]
+    if not args:
+        raise BackendError(VALIDATION_EXCEPTION, "Invalid number of arguments for {0}".format(operator))
+    if operator in [CONTAINS, NOT_CONTAINS]:
+        arg_type, arg = args[0]
+        if attr_type in SET_TYPES:
+            found = attr_type[0] == arg_type and arg in value
+        else:
+            found = attr_type == arg_type and attr_type != NUMBER_SHORT and arg in value
+        return found if operator == CONTAINS else not found
+    elif operator == IN:
+        return (attr_type, value) in args
+    elif operator == NE:
+        return (attr_type, value) != args[0]
+    if any(arg_type != attr_type for arg_type, _ in args):
+        return False
+    if operator == EQ:
+        return value == args[0][1]
+    if attr_type not in SCALAR_TYPES:
+        return False
+    if operator == LE:
+        return value <= args[0][1]
+    elif operator == LT:
+        return value < args[0][1]
+    elif operator == GE:
+        return value >= args[0][1]
+    elif operator == GT:
+        return value > args[0][1]
+    elif operator == BEGINS_WITH:
+        return attr_type != NUMBER_SHORT and value.startswith(args[0][1])
+    elif operator == BETWEEN:
+        if len(args) != 2:
+            raise BackendError(VALIDATION_EXCEPTION, "Invalid number of arguments for {0}".format(operator))
+        return args[0][1] <= value <= args[1][1]
+    raise BackendError(VALIDATION_EXCEPTION, "Unsupported comparison operator: {0}".format(operator))
+
+
+def _check_expected(item, expected):
+    """
+    Raises a ConditionalCheckFailedException if `item` doesn't meet the `expected` conditions
+    """
+    for name, condition in six.iteritems(expected or {}):
+        actual = item.get(name) if item is not None else None
+        if condition.get(EXISTS) is False:
+            passed = actual is None
+        else:
+            passed = actual is not None and (VALUE not in condition or _typed(actual) == _typed(condition[VALUE]))
+        if not passed:
+            raise BackendError(CONDITIONAL_CHECK_FAILED, "The conditional request failed")
+
+
+def _get_key_schema(key_schema):
+    """
+    Returns the hash and range key names of a key schema
+    """
+    hash_keyname = range_keyname = None
+    for key in key_schema:
+        if _get(key, KEY_TYPE) == HASH:
+            hash_keyname = _get(key, ATTR_NAME)
+        elif _get(key, KEY_TYPE) == RANGE:
+            range_keyname = _get(key, ATTR_NAME)
+    return hash_keyname, range_keyname
+
+
+class MemoryIndex(object):
+    """
+    The items of a table, or of one of its secondary indexes, grouped by hash key
+    """
+
+    def __init__(self, name, hash_keyname, range_keyname, projection=None):
+        self.name = name
+        self.hash_keyname = hash_keyname
+        self.range_keyname = range_keyname
+        self.projection = projection
+        self.partitions = {}
+
+    def __len__(self):
+        return sum(len(partition) for partition in self.partitions.values())
+
+    def add(self, key, item):
+        """
+        Adds an item to the index, unless it lacks the index keys
+        """
+        if self.hash_keyname not in item or (self.range_keyname and self.range_keyname not in item):
+            return
+        self.partitions.setdefault(_scalar(item[self.hash_keyname]), {})[key] = item
+
+    def remove(self, key, item):
+        """
+        Removes an item from the index
+        """
+        if self.hash_keyname not in item:
+            return
+        hash_value = _scalar(item[self.hash_keyname])
+        partition = self.partitions.get(hash_value)
+        if partition is not None:
+            partition.pop(key, None)
+            if not partition:
+                del self.partitions[hash_value]
+
+    def get_sort_key(self, key, attributes):
+        """
+        Returns the position of an item, or of an exclusive start key, within its partition
+        """
+        if self.range_keyname is None:
+            return None, key
+        if self.range_keyname not in attributes:
+            raise BackendError(VALIDATION_EXCEPTION, "The provided starting key is invalid")
+        return _scalar(attributes[self.range_keyname]), key
+
+
+class MemoryTable(object):
+    """
+    A DynamoDB table stored in memory
+    """
+
+    def __init__(self, description):
+        self.description = description
+        self.name = description[TABLE_NAME]
+        self.hash_keyname, self.range_keyname = _get_key_schema(description[KEY_SCHEMA])
+        self.attribute_types = dict(
+            (attr[ATTR_NAME], attr[ATTR_TYPE]) for attr in description[ATTR_DEFINITIONS]
+        )
+        self.items = {}
+        self.primary_index = MemoryIndex(None, self.hash_keyname, self.range_keyname)
+        self.indexes = {}
+        for index in description.get(LOCAL_SECONDARY_INDEXES, []) + description.get(GLOBAL_SECONDARY_INDEXES, []):
+            hash_keyname, range_keyname = _get_key_schema(index[KEY_SCHEMA])
+            self.indexes[index[INDEX_NAME]] = MemoryIndex(
+                index[INDEX_NAME], hash_keyname, range_keyname, projection=index.get(PROJECTION))
+        self._sorted_keys = None
+
+    def describe(self):
+        """
+        Returns the description of this table
+        """
+        description = copy.deepcopy(self.description)
+        description[ITEM_COUNT] = len(self.items)
+        description[TABLE_SIZE_BYTES] = sum(_item_size(item) for item in self.items.values())
+        for index in description.get(LOCAL_SECONDARY_INDEXES, []) + description.get(GLOBAL_SECONDARY_INDEXES, []):
+            index[ITEM_COUNT] = len(self.indexes[index[INDEX_NAME]])
+        return description
+
+    def get_key(self, attributes):
+        """
+        Returns the primary key of an item or key map
+        """
+        values = []
+        for keyname in (self.hash_keyname, self.range_keyname):
+            if keyname is None:
+                values.append(None)
+                continue
+            attribute_value = attributes.get(keyname)
+            if attribute_value is None or list(attribute_value.keys()) != [self.attribute_types.get(keyname)]:
+                raise BackendError(VALIDATION_EXCEPTION, "The provided key element does not match the schema")
+            values.append(_scalar(attribute_value))
+        return tuple(values)
+
+    def get_key_attributes(self, item, index=None):
+        """
+        Returns the key attributes of an item, as returned in a LastEvaluatedKey
+        """
+        names = [self.hash_keyname, self.range_keyname]
+        if index is not None:
+            names.extend([index.hash_keyname, index.range_keyname])
+        return _copy_item(dict((name, item[name]) for name in names if name is not None))
+
+    def get_sorted_keys(self):
+        """
+        Returns the primary keys of all items in a stable order, used by scans
+        """
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.items)
+        return self._sorted_keys
+
+    def put(self, key, item):
+        """
+        Stores an item, and returns the item it replaced
+        """
+        old = self.items.get(key)
+        if old is not None:
+            self._unindex(key, old)
+        else:
+            self._sorted_keys = None
+        self.items[key] = item
+        self.primary_index.add(key, item)
+        for index in self.indexes.values():
+            index.add(key, item)
+        return old
+
+    def delete(self, key):
+        """
+        Deletes an item, and returns it
+        """
+        old = self.items.pop(key, None)
+        if old is not None:
+            self._unindex(key, old)
+            self._sorted_keys = None
+        return old
+
+    def _unindex(self, key, item):
+        """
+        Removes an item from the indexes
+        """
+        self.primary_index.remove(key, item)
+        for index in self.indexes.values():
+            index.remove(key, item)
+
+    def project(self, item, index=None, attributes_to_get=None):
+        """
+        Returns a copy of the attributes of `item` that are projected by `index`, or requested
+        """
+        if index is not None and index.projection:
+            projection_type = index.projection.get(PROJECTION_TYPE)
+            if projection_type in [KEYS_ONLY, INCLUDE]:
+                names = [self.hash_keyname, self.range_keyname, index.hash_keyname, index.range_keyname]
+                if projection_type == INCLUDE:
+                    names.extend(index.projection.get(NON_KEY_ATTRIBUTES) or [])
+                item = dict((name, item[name]) for name in names if name in item)
+        if attributes_to_get:
+            item = dict((name, item[name]) for name in attributes_to_get if name in item)
+        return _copy_item(item)
+
+
+class InMemoryTransport(Transport):
+    """
+    A transport that implements DynamoDB operations on in-memory data structures
+
+    Supports GetItem, PutItem, UpdateItem, DeleteItem, Query (including local and global secondary
+    indexes), Scan (including parallel scan segments), BatchGetItem, BatchWriteItem, CreateTable,
+    DescribeTable, UpdateTable, DeleteTable and ListTables.
+
+    DynamoDB returns unprocessed keys when a batch request is throttled or too large. To exercise
+    this, `batch_get_limit` and `batch_write_limit` limit the number of requests processed by each
+    batch call, and the remaining ones are returned as unprocessed.
+    """
+
+    def __init__(self, batch_get_limit=None, batch_write_limit=None):
+        """
+        :param batch_get_limit: If set, the maximum number of keys processed per BatchGetItem call
+        :param batch_write_limit: If set, the maximum number of requests processed per BatchWriteItem call
+        """
+        self.batch_get_limit = batch_get_limit
+        self.batch_write_limit = batch_write_limit
+        self.tables = {}
+        self._lock = threading.RLock()
+        self._operations = {
+            BATCH_WRITE_ITEM: self.batch_write_item,
+            BATCH_GET_ITEM: self.batch_get_item,
+            DESCRIBE_TABLE: self.describe_table,
+            CREATE_TABLE: self.create_table,
+            UPDATE_TABLE: self.update_table,
+            DELETE_TABLE: self.delete_table,
+            LIST_TABLES: self.list_tables,
+            UPDATE_ITEM: self.update_item,
+            DELETE_ITEM: self.delete_item,
+            GET_ITEM: self.get_item,
+            PUT_ITEM: self.put_item,
+            QUERY: self.query,
+            SCAN: self.scan
+        }
+
+    def send(self, connection, operation_name, operation_kwargs, timings=None):
+        """
+        Performs `operation_name` with arguments `operation_kwargs`
+        """
+        operation = self._operations.get(operation_name)
+        try:
+            if operation is None:
+                raise BackendError(VALIDATION_EXCEPTION, "Unsupported operation: {0}".format(operation_name))
+            with self._lock:
+                data = operation(operation_kwargs)
+        except BackendError as e:
+            data = {ERRORS: [{CODE: e.code, MESSAGE: e.message}]}
+            return MemoryResponse(data, status_code=HTTP_BAD_REQUEST), data
+        return MemoryResponse(data), data
+
+    def _get_table(self, table_name):
+        """
+        Returns a table, or raises a ResourceNotFoundException
+        """
+        table = self.tables.get(table_name)
+        if table is None:
+            raise BackendError(RESOURCE_NOT_FOUND, "Requested resource not found: Table: {0} not found".format(table_name))
+        return table
+
+    def _add_consumed_capacity(self, data, operation_kwargs, table, units):
+        """
+        Adds the consumed capacity to `data`, if it was requested
+        """
+        if operation_kwargs.get(pythonic(RETURN_CONSUMED_CAPACITY)) in [TOTAL, INDEXES]:
+            data[CONSUMED_CAPACITY] = {TABLE_NAME: table.name, CAPACITY_UNITS: units}
+
+    def create_table(self, operation_kwargs):
+        """
+        Performs the CreateTable operation
+        """
+        table_name = operation_kwargs.get(pythonic(TABLE_NAME))
+        if table_name in self.tables:
+            raise BackendError(RESOURCE_IN_USE, "Table already exists: {0}".format(table_name))
+        description = {
+            TABLE_NAME: table_name,
+            ATTR_DEFINITIONS: [
+                {ATTR_NAME: _get(attr, ATTR_NAME), ATTR_TYPE: _get(attr, ATTR_TYPE)}
+                for attr in operation_kwargs.get(pythonic(ATTR_DEFINITIONS))
+            ],
+            KEY_SCHEMA: self._copy_key_schema(operation_kwargs.get(pythonic(KEY_SCHEMA))),
+            PROVISIONED_THROUGHPUT: self._copy_throughput(operation_kwargs.get(pythonic(PROVISIONED_THROUGHPUT))),
+            TABLE_STATUS: ACTIVE,
+            CREATION_DATE_TIME: time.time()
+        }
+        for index_type in [LOCAL_SECONDARY_INDEXES, GLOBAL_SECONDARY_INDEXES]:
+            indexes = operation_kwargs.get(pythonic(index_type))
+            if not indexes:
+                continue
+            description[index_type] = []
+            for index in indexes:
+                index_description = {
+                    INDEX_NAME: _get(index, INDEX_NAME),
+                    KEY_SCHEMA: self._copy_key_schema(_get(index, KEY_SCHEMA)),
+                    PROJECTION: copy.deepcopy(_get(index, PROJECTION))
+                }
+                if index_type == GLOBAL_SECONDARY_INDEXES:
+                    index_description[PROVISIONED_THROUGHPUT] = self._copy_throughput(_get(index, PROVISIONED_THROUGHPUT))
+                    index_description[INDEX_STATUS] = ACTIVE
+                description[index_type].append(index_description)
+        table = MemoryTable(description)
+        self.tables[table_name] = table
+        return {TABLE_DESCRIPTION: table.describe()}
+
+    def _copy_key_schema(self, key_schema):
+        """
+        Returns a key schema using DynamoDB names
+        """
+        return [{ATTR_NAME: _get(key, ATTR_NAME), KEY_TYPE: _get(key, KEY_TYPE)} for key in key_schema or []]
+
+    def _copy_throughput(self, throughput):
+        """
+        Returns a provisioned throughput description
+        """
+        throughput = throughput or {}
+        return {
+            READ_CAPACITY_UNITS: _get(throughput, READ_CAPACITY_UNITS),
+            WRITE_CAPACITY_UNITS: _get(throughput, WRITE_CAPACITY_UNITS),
+            'NumberOfDecreasesToday': 0
+        }
+
+    def describe_table(self, operation_kwargs):
+        """
+        Performs the DescribeTable operation
+        """
+        return {TABLE_KEY: self._get_table(operation_kwargs.get(pythonic(TABLE_NAME))).describe()}
+
+    def update_table(self, operation_kwargs):
+        """
+        Performs the UpdateTable operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        throughput = operation_kwargs.get(pythonic(PROVISIONED_THROUGHPUT))
+        if throughput:
+            table.description[PROVISIONED_THROUGHPUT] = self._copy_throughput(throughput)
+        for index_update in operation_kwargs.get(pythonic(GLOBAL_SECONDARY_INDEX_UPDATES)) or []:
+            update = index_update.get(UPDATE)
+            for index in table.description.get(GLOBAL_SECONDARY_INDEXES, []):
+                if index[INDEX_NAME] == update.get(INDEX_NAME):
+                    index[PROVISIONED_THROUGHPUT] = self._copy_throughput(update.get(PROVISIONED_THROUGHPUT))
+                    break
+            else:
+                raise BackendError(RESOURCE_NOT_FOUND, "Index not found: {0}".format(update.get(INDEX_NAME)))
+        return {TABLE_DESCRIPTION: table.describe()}
+
+    def delete_table(self, operation_kwargs):
+        """
+        Performs the DeleteTable operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        del self.tables[table.name]
+        description = table.describe()
+        description[TABLE_STATUS] = DELETING
+        return {TABLE_DESCRIPTION: description}
+
+    def list_tables(self, operation_kwargs):
+        """
+        Performs the ListTables operation
+        """
+        names = sorted(self.tables)
+        start = operation_kwargs.get(pythonic(EXCLUSIVE_START_TABLE_NAME))
+        if start:
+            names = names[bisect.bisect_right(names, start):]
+        limit = operation_kwargs.get(pythonic(LIMIT))
+        data = {}
+        if limit is not None and len(names) > limit:
+            names = names[:limit]
+            data[LAST_EVALUATED_TABLE_NAME] = names[-1]
+        data[TABLE_NAMES] = names
+        return data
+
+    def get_item(self, operation_kwargs):
+        """
+        Performs the GetItem operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        item = table.items.get(table.get_key(operation_kwargs.get(pythonic(KEY))))
+        data = {}
+        size = 0
+        if item is not None:
+            size = _item_size(item)
+            data[ITEM] = table.project(item, attributes_to_get=operation_kwargs.get(pythonic(ATTRS_TO_GET)))
+        units = _read_units(size, operation_kwargs.get(pythonic(CONSISTENT_READ)))
+        self._add_consumed_capacity(data, operation_kwargs, table, units)
+        return data
+
+    def put_item(self, operation_kwargs):
+        """
+        Performs the PutItem operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        item = _copy_item(operation_kwargs.get(pythonic(ITEM)))
+        key = table.get_key(item)
+        old = table.items.get(key)
+        _check_expected(old, operation_kwargs.get(pythonic(EXPECTED)))
+        table.put(key, item)
+        data = {}
+        if old is not None and operation_kwargs.get(pythonic(RETURN_VALUES)) == ALL_OLD:
+            data[ATTRIBUTES] = _copy_item(old)
+        units = _write_units(max(_item_size(item), _item_size(old or {})))
+        self._add_consumed_capacity(data, operation_kwargs, table, units)
+        return data
+
+    def delete_item(self, operation_kwargs):
+        """
+        Performs the DeleteItem operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        key = table.get_key(operation_kwargs.get(pythonic(KEY)))
+        _check_expected(table.items.get(key), operation_kwargs.get(pythonic(EXPECTED)))
+        old = table.delete(key)
+        data = {}
+        if old is not None and operation_kwargs.get(pythonic(RETURN_VALUES)) == ALL_OLD:
+            data[ATTRIBUTES] = old
+        units = _write_units(_item_size(old or {}))
+        self._add_consumed_capacity(data, operation_kwargs, table, units)
+        return data
+
+    def update_item(self, operation_kwargs):
+        """
+        Performs the UpdateItem operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        key_attributes = operation_kwargs.get(pythonic(KEY))
+        key = table.get_key(key_attributes)
+        old = table.items.get(key)
+        _check_expected(old, operation_kwargs.get(pythonic(EXPECTED)))
+        item = _copy_item(old if old is not None else key_attributes)
+        attribute_updates = operation_kwargs.get(pythonic(ATTR_UPDATES)) or {}
+        for name, update in six.iteritems(attribute_updates):
+            if name in [table.hash_keyname, table.range_keyname]:
+                raise BackendError(
+                    VALIDATION_EXCEPTION,
+                    "Cannot update attribute {0}. This attribute is part of the key".format(name))
+            self._update_attribute(item, name, update.get(ACTION, PUT), update.get(VALUE))
+        table.put(key, item)
+        data = {}
+        return_values = operation_kwargs.get(pythonic(RETURN_VALUES))
+        if return_values == ALL_OLD and old is not None:
+            data[ATTRIBUTES] = _copy_item(old)
+        elif return_values == ALL_NEW:
+            data[ATTRIBUTES] = _copy_item(item)
+        elif return_values in [UPDATED_OLD, UPDATED_NEW]:
+            source = (old or {}) if return_values == UPDATED_OLD else item
+            data[ATTRIBUTES] = _copy_item(dict((name, source[name]) for name in attribute_updates if name in source))
+        units = _write_units(max(_item_size(item), _item_size(old or {})))
+        self._add_consumed_capacity(data, operation_kwargs, table, units)
+        return data
+
+    def _update_attribute(self, item, name, action, attribute_value):
+        """
+        Applies a single attribute update to `item`
+        """
+        if action == PUT:
+            item[name] = _copy_item({name: attribute_value})[name]
+        elif action == DELETE:
+            attr_type = list(attribute_value.keys())[0] if attribute_value else None
+            current = item.get(name)
+            if attr_type not in SET_TYPES or current is None:
+                item.pop(name, None)
+                return
+            removed = _scalar(attribute_value)
+            remaining = [element for element in current.get(attr_type, [])
+                         if _scalar({attr_type[0]: element}) not in removed]
+            if remaining:
+                item[name] = {attr_type: remaining}
+            else:
+                del item[name]
+        elif action == ADD:
+            attr_type, value = list(attribute_value.items())[0]
+            current = item.get(name)
+            if current is not None and attr_type not in current:
+                raise BackendError(VALIDATION_EXCEPTION, "Type mismatch for attribute to update")
+            if attr_type == NUMBER_SHORT:
+                total = decimal.Decimal(value)
+                if current is not None:
+                    total += decimal.Decimal(current[attr_type])
+                item[name] = {attr_type: _format_number(total)}
+            elif attr_type in SET_TYPES:
+                elements = list(current[attr_type]) if current is not None else []
+                existing = _scalar({attr_type: elements})
+                for element in value:
+                    if _scalar({attr_type[0]: element}) not in existing:
+                        elements.append(element)
+                item[name] = {attr_type: elements}
+            else:
+                raise BackendError(VALIDATION_EXCEPTION, "ADD can only be used on numbers and sets")
+        else:
+            raise BackendError(VALIDATION_EXCEPTION, "Invalid attribute update action: {0}".format(action))
+
+    def batch_get_item(self, operation_kwargs):
+        """
+        Performs the BatchGetItem operation
+        """
+        request_items = operation_kwargs.get(pythonic(REQUEST_ITEMS)) or {}
+        if sum(len(_get(request, KEYS, [])) for request in request_items.values()) > BATCH_GET_PAGE_LIMIT:
+            raise BackendError(VALIDATION_EXCEPTION, "Too many items requested for the BatchGetItem call")
+        remaining = self.batch_get_limit
+        responses = {}
+        unprocessed = {}
+        consumed_capacity = []
+        for table_name, request in six.iteritems(request_items):
+            table = self._get_table(table_name)
+            keys = _get(request, KEYS, [])
+            processed = keys if remaining is None else keys[:remaining]
+            if remaining is not None:
+                remaining -= len(processed)
+            if len(processed) < len(keys):
+                unprocessed[table_name] = dict(request)
+                unprocessed[table_name][KEYS] = keys[len(processed):]
+            attributes_to_get = _get(request, ATTRS_TO_GET)
+            items = []
+            size = 0
+            for key in processed:
+                item = table.items.get(table.get_key(key))
+                if item is not None:
+                    size += _item_size(item)
+                    items.append(table.project(item, attributes_to_get=attributes_to_get))
+            responses[table_name] = items
+            consumed_capacity.append({
+                TABLE_NAME: table_name,
+                CAPACITY_UNITS: _read_units(size, _get(request, CONSISTENT_READ))
+            })
+        data = {RESPONSES: responses, UNPROCESSED_KEYS: unprocessed}
+        if operation_kwargs.get(pythonic(RETURN_CONSUMED_CAPACITY)) in [TOTAL, INDEXES]:
+            data[CONSUMED_CAPACITY] = consumed_capacity
+        return data
+
+    def batch_write_item(self, operation_kwargs):
+        """
+        Performs the BatchWriteItem operation
+        """
+        request_items = operation_kwargs.get(pythonic(REQUEST_ITEMS)) or {}
+        if sum(len(requests) for requests in request_items.values()) > BATCH_WRITE_PAGE_LIMIT:
+            raise BackendError(VALIDATION_EXCEPTION, "Too many items requested for the BatchWriteItem call")
+        remaining = self.batch_write_limit
+        unprocessed = {}
+        consumed_capacity = []
+        for table_name, requests in six.iteritems(request_items):
+            table = self._get_table(table_name)
+            processed = requests if remaining is None else requests[:remaining]
+            if remaining is not None:
+                remaining -= len(processed)
+            if len(processed) < len(requests):
+                unprocessed[table_name] = requests[len(processed):]
+            units = 0
+            for request in processed:
+                if PUT_REQUEST in request:
+                    item = _copy_item(request[PUT_REQUEST][ITEM])
+                    old = table.put(table.get_key(item), item)
+                    units += _write_units(max(_item_size(item), _item_size(old or {})))
+                elif DELETE_REQUEST in request:
+                    old = table.delete(table.get_key(request[DELETE_REQUEST][KEY]))
+                    units += _write_units(_item_size(old or {}))
+            consumed_capacity.append({TABLE_NAME: table_name, CAPACITY_UNITS: units})
+        data = {UNPROCESSED_ITEMS: unprocessed}
+        if operation_kwargs.get(pythonic(RETURN_CONSUMED_CAPACITY)) in [TOTAL, INDEXES]:
+            data[CONSUMED_CAPACITY] = consumed_capacity
+        return data
+
+    def query(self, operation_kwargs):
+        """
+        Performs the Query operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        index_name = operation_kwargs.get(pythonic(INDEX_NAME))
+        if index_name:
+            index = table.indexes.get(index_name)
+            if index is None:
+                raise BackendError(
+                    VALIDATION_EXCEPTION,
+                    "The table does not have the specified index: {0}".format(index_name))
+        else:
+            index = table.primary_index
+        key_conditions = operation_kwargs.get(pythonic(KEY_CONDITIONS)) or {}
+        hash_condition = key_conditions.get(index.hash_keyname)
+        if not hash_condition or hash_condition.get(COMPARISON_OPERATOR) != EQ:
+            raise BackendError(VALIDATION_EXCEPTION, "Query condition missed key schema element")
+        for name in key_conditions:
+            if name not in [index.hash_keyname, index.range_keyname]:
+                raise BackendError(VALIDATION_EXCEPTION, "Query key condition not supported: {0}".format(name))
+        range_condition = key_conditions.get(index.range_keyname) if index.range_keyname else None
+
+        partition = index.partitions.get(_scalar(hash_condition[ATTR_VALUE_LIST][0]), {})
+        entries = sorted(
+            ((index.get_sort_key(key, item), item) for key, item in six.iteritems(partition)),
+            key=lambda entry: entry[0],
+            reverse=operation_kwargs.get(pythonic(SCAN_INDEX_FORWARD)) is False
+        )
+        exclusive_start_key = operation_kwargs.get(pythonic(EXCLUSIVE_START_KEY))
+        if exclusive_start_key:
+            start = index.get_sort_key(table.get_key(exclusive_start_key), exclusive_start_key)
+            if operation_kwargs.get(pythonic(SCAN_INDEX_FORWARD)) is False:
+                entries = [entry for entry in entries if entry[0] < start]
+            else:
+                entries = [entry for entry in entries if entry[0] > start]
+        if range_condition:
+            entries = [
+                entry for entry in entries
+                if _matches(entry[1].get(index.range_keyname),
+                            range_condition.get(COMPARISON_OPERATOR),
+                            range_condition.get(ATTR_VALUE_LIST) or [])
+            ]
+        data = {}
+        limit = operation_kwargs.get(pythonic(LIMIT))
+        if limit is not None and len(entries) > limit:
+            entries = entries[:limit]
+            data[LAST_EVALUATED_KEY] = table.get_key_attributes(entries[-1][1], index=index if index_name else None)
+        items = [item for _, item in entries]
+        return self._get_results(data, operation_kwargs, table, index if index_name else None, items, len(items))
+
+    def scan(self, operation_kwargs):
+        """
+        Performs the Scan operation
+        """
+        table = self._get_table(operation_kwargs.get(pythonic(TABLE_NAME)))
+        segment = operation_kwargs.get(pythonic(SEGMENT))
+        total_segments = operation_kwargs.get(pythonic(TOTAL_SEGMENTS))
+        if (segment is None) != (total_segments is None) or (total_segments and not 0 <= segment < total_segments):
+            raise BackendError(VALIDATION_EXCEPTION, "Segment and TotalSegments are invalid")
+        scan_filter = operation_kwargs.get(pythonic(SCAN_FILTER)) or {}
+        limit = operation_kwargs.get(pythonic(LIMIT))
+        keys = table.get_sorted_keys()
+        start = 0
+        exclusive_start_key = operation_kwargs.get(pythonic(EXCLUSIVE_START_KEY))
+        if exclusive_start_key:
+            start = bisect.bisect_right(keys, table.get_key(exclusive_start_key))
+        data = {}
+        items = []
+        scanned = 0
+        last_key = None
+        for key in itertools.islice(keys, start, None):
+            if total_segments and self._get_segment(key, total_segments) != segment:
+                continue
+            if limit is not None and scanned == limit:
+                data[LAST_EVALUATED_KEY] = table.get_key_attributes(table.items[last_key])
+                break
+            scanned += 1
+            last_key = key
+            item = table.items[key]
+            for name, condition in six.iteritems(scan_filter):
+                if not _matches(item.get(name), condition.get(COMPARISON_OPERATOR), condition.get(ATTR_VALUE_LIST) or []):
+                    break
+            else:
+                items.append(item)
+        return self._get_results(data, operation_kwargs, table, None, items, scanned)
+
+    def _get_segment(self, key, total_segments):
+        """
+        Returns the scan segment of a primary key
+        """
+        return (zlib.crc32(six.text_type(key[0]).encode(DEFAULT_ENCODING)) & 0xffffffff) % total_segments
+
+    def _get_results(self, data, operation_kwargs, table, index, items, scanned):
+        """
+        Adds the items of a query or scan to `data`
+        """
+        data[CAMEL_COUNT] = len(items)
+        data[SCANNED_COUNT] = scanned
+        if operation_kwargs.get(pythonic(SELECT)) != COUNT:
+            attributes_to_get = operation_kwargs.get(pythonic(ATTRS_TO_GET))
+            data[ITEMS] = [table.project(item, index, attributes_to_get) for item in items]
+        size = sum(_item_size(item) for item in items)
+        units = _read_units(size, operation_kwargs.get(pythonic(CONSISTENT_READ)))
+        self._add_consumed_capacity(data, operation_kwargs, table, units)
+        return data
+
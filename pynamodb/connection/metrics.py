@@ -0,0 +1,214 @@
+"""
+Per-operation metrics for PynamoDB connections
+"""
+import math
+import threading
+
+import six
+
+from .util import pythonic
+from pynamodb.constants import (
+    GET_ITEM, PUT_ITEM, UPDATE_ITEM, DELETE_ITEM, QUERY, SCAN, BATCH_GET_ITEM, BATCH_WRITE_ITEM,
+    TABLE_NAME, REQUEST_ITEMS, CONSUMED_CAPACITY, CAPACITY_UNITS, ITEM, CAMEL_COUNT, RESPONSES,
+    UNPROCESSED_ITEMS, UNPROCESSED_KEYS, HISTOGRAM_MIN_VALUE, HISTOGRAM_GROWTH_FACTOR
+)
+
+
+def get_table_name(operation_kwargs):
+    """
+    Returns the table of an operation, or None if a batch operation uses several tables
+    """
+    table_name = operation_kwargs.get(pythonic(TABLE_NAME))
+    if table_name is None:
+        tables = list(operation_kwargs.get(pythonic(REQUEST_ITEMS)) or [])
+        if len(tables) == 1:
+            table_name = tables[0]
+    return table_name
+
+
+def get_capacity_units(data):
+    """
+    Returns the capacity units consumed by a response, or None if it doesn't report them
+    """
+    capacity = data.get(CONSUMED_CAPACITY) if isinstance(data, dict) else None
+    if isinstance(capacity, dict):
+        return capacity.get(CAPACITY_UNITS)
+    elif isinstance(capacity, list):
+        return sum(table_capacity.get(CAPACITY_UNITS, 0) for table_capacity in capacity)
+    return None
+
+
+def get_item_count(operation_name, operation_kwargs, data):
+    """
+    Returns the number of items read or written by a successful operation
+    """
+    if operation_name == GET_ITEM:
+        return 1 if ITEM in data else 0
+    elif operation_name in [QUERY, SCAN]:
+        return data.get(CAMEL_COUNT, 0)
+    elif operation_name in [PUT_ITEM, UPDATE_ITEM, DELETE_ITEM]:
+        return 1
+    elif operation_name == BATCH_GET_ITEM:
+        return sum(len(items) for items in six.itervalues(data.get(RESPONSES) or {}))
+    elif operation_name == BATCH_WRITE_ITEM:
+        unprocessed = data.get(UNPROCESSED_ITEMS) or data.get(UNPROCESSED_KEYS) or {}
+        requests = operation_kwargs.get(pythonic(REQUEST_ITEMS)) or {}
+        return sum(len(items) for items in six.itervalues(requests)) - \
+            sum(len(items) for items in six.itervalues(unprocessed))
+    return 0
+
+
+class MetricsCollector(object):
+    """
+    Receives the metrics of every operation dispatched by a connection
+
+    `record` is called once per operation, after any retries, with a dictionary of:
+
+    * ``operation``: The DynamoDB operation name
+    * ``table_name`` and ``index_name``: The table and index used, or None
+    * ``serialize_time``, ``network_time`` and ``parse_time``: Seconds spent building and signing the request,
+      waiting for the response, and parsing it, summed over all attempts
+    * ``total_time``: The wall time of the operation in seconds, including the delays between retries
+    * ``status_code`` and ``error_code``: The HTTP status and DynamoDB error code of the last attempt
+    * ``retries``: The number of retries
+    * ``capacity_units``: The consumed capacity units, or None if not reported
+    * ``item_count``: The number of items read or written
+    """
+
+    def record(self, metrics):
+        """
+        Records the metrics of an operation
+        """
+        raise NotImplementedError
+
+
+class Histogram(object):
+    """
+    A histogram with logarithmic buckets
+
+    Values are counted in buckets growing by `growth_factor`, so percentiles use constant
+    memory and are accurate to within that factor.
+    """
+
+    def __init__(self, min_value=HISTOGRAM_MIN_VALUE, growth_factor=HISTOGRAM_GROWTH_FACTOR):
+        """
+        :param min_value: The upper bound of the first bucket
+        :param growth_factor: The ratio between the bounds of consecutive buckets
+        """
+        self.min_value = min_value
+        self.growth_factor = growth_factor
+        self._log_growth_factor = math.log(growth_factor)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+
+    def add(self, value):
+        """
+        Adds a value
+        """
+        if value > self.min_value:
+            bucket = int(math.ceil(math.log(value / self.min_value) / self._log_growth_factor))
+        else:
+            bucket = 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Returns an upper bound of the `percent` percentile, or None if the histogram is empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(self.count * percent / 100.0)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.min_value * self.growth_factor ** bucket, self.max)
+
+    def get_stats(self):
+        """
+        Returns a summary of this histogram
+        """
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max
+        }
+
+
+class InMemoryMetrics(MetricsCollector):
+    """
+    Aggregates metrics in memory, per table, index and operation
+
+    Tracks latency histograms of the total and network times, and counters of requests,
+    errors, retries, items and consumed capacity units.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, metrics):
+        """
+        Adds the metrics of an operation to the aggregates
+        """
+        key = (metrics['table_name'], metrics['index_name'], metrics['operation'])
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    'count': 0,
+                    'errors': 0,
+                    'retries': 0,
+                    'item_count': 0,
+                    'capacity_units': 0,
+                    'latency': Histogram(),
+                    'network_latency': Histogram()
+                }
+            stats['count'] += 1
+            if metrics['error_code'] is not None:
+                stats['errors'] += 1
+            stats['retries'] += metrics['retries']
+            stats['item_count'] += metrics['item_count']
+            stats['capacity_units'] += metrics['capacity_units'] or 0
+            stats['latency'].add(metrics['total_time'])
+            stats['network_latency'].add(metrics['network_time'])
+
+    def get_stats(self):
+        """
+        Returns the aggregates, keyed by `(table_name, index_name, operation)`
+        """
+        with self._lock:
+            return dict(
+                (key, dict(
+                    stats,
+                    latency=stats['latency'].get_stats(),
+                    network_latency=stats['network_latency'].get_stats()
+                ))
+                for key, stats in six.iteritems(self._stats)
+            )
+
+    def get_capacity_units(self):
+        """
+        Returns the consumed capacity units, keyed by `(table_name, operation)`
+        """
+        capacity_units = {}
+        with self._lock:
+            for (table_name, _, operation), stats in six.iteritems(self._stats):
+                key = (table_name, operation)
+                capacity_units[key] = capacity_units.get(key, 0) + stats['capacity_units']
+        return capacity_units
+
+    def reset(self):
+        """
+        Clears the aggregates
+        """
+        with self._lock:
+            self._stats = {}
@@ -0,0 +1,149 @@
+"""
+HTTP connection pooling for PynamoDB connections
+"""
+import time
+import logging
+import threading
+
+from botocore.vendored.requests.adapters import HTTPAdapter
+
+from pynamodb.constants import DEFAULT_MAX_POOL_CONNECTIONS
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    An HTTP adapter that keeps warm connections to DynamoDB
+
+    Up to `max_pool_connections` connections are kept alive per host and reused by
+    all threads sharing the adapter. The adapter also tracks pool statistics.
+    """
+
+    def __init__(self, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS, idle_timeout=None, keep_alive=True):
+        """
+        :param max_pool_connections: The maximum number of connections to keep in the pool
+        :param idle_timeout: If set, a pooled connection that has been idle for more than this many seconds
+            is closed and reopened before it is reused
+        :param keep_alive: If False, connections are closed after every request
+        """
+        self.max_pool_connections = max_pool_connections
+        self.idle_timeout = idle_timeout
+        self.keep_alive = keep_alive
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._in_use = 0
+        self._local = threading.local()
+        super(PooledHTTPAdapter, self).__init__(pool_maxsize=max_pool_connections)
+
+    def init_poolmanager(self, connections, maxsize, **kwargs):
+        """
+        Initializes the pool manager, expiring idle connections and recording whether each
+        request reuses an open socket
+        """
+        super(PooledHTTPAdapter, self).init_poolmanager(connections, maxsize, **kwargs)
+        new_pool = self.poolmanager._new_pool
+
+        def _new_pool(scheme, host, port):
+            pool = new_pool(scheme, host, port)
+            get_conn = pool._get_conn
+            put_conn = pool._put_conn
+
+            def _get_conn(timeout=None):
+                conn = get_conn(timeout=timeout)
+                self._expire(conn)
+                self._record(getattr(conn, 'sock', None) is not None)
+                return conn
+
+            def _put_conn(conn):
+                if conn is not None:
+                    conn.idle_since = time.time()
+                put_conn(conn)
+            pool._get_conn = _get_conn
+            pool._put_conn = _put_conn
+            return pool
+        self.poolmanager._new_pool = _new_pool
+
+    def _expire(self, conn):
+        """
+        Closes `conn` if it has been idle in the pool for more than `idle_timeout` seconds
+        """
+        if self.idle_timeout is None or getattr(conn, 'sock', None) is None:
+            return
+        idle_since = getattr(conn, 'idle_since', None)
+        if idle_since is not None and time.time() - idle_since > self.idle_timeout:
+            log.debug("Closing connection idle for more than %ss", self.idle_timeout)
+            conn.close()
+
+    def _record(self, hit):
+        """
+        Records a pool hit or miss
+        """
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def add_headers(self, request, **kwargs):
+        """
+        Adds the keep-alive header to `request`
+        """
+        request.headers['Connection'] = 'keep-alive' if self.keep_alive else 'close'
+
+    def send(self, request, **kwargs):
+        """
+        Sends `request` using a pooled connection
+        """
+        with self._stats_lock:
+            self._in_use += 1
+        started = time.time()
+        try:
+            response = super(PooledHTTPAdapter, self).send(request, **kwargs)
+            if not kwargs.get('stream'):
+                # Read the body here, so that it is included in the send time
+                response.content
+            return response
+        finally:
+            with self._stats_lock:
+                self._in_use -= 1
+            self._local.send_times = (started, time.time())
+
+    def pop_send_times(self):
+        """
+        Returns the start and end times of the last request sent by the current thread, or None
+
+        The times are cleared, so that each request is only reported once
+        """
+        send_times = getattr(self._local, 'send_times', None)
+        self._local.send_times = None
+        return send_times
+
+    def close_idle_connections(self):
+        """
+        Closes all connections that are currently idle in the pool
+        """
+        self.poolmanager.clear()
+
+    def get_stats(self):
+        """
+        Returns a dictionary of pool statistics
+
+        `hits` counts requests that reused an open socket, `misses` counts requests that had to
+        open a new one, and `open_sockets` counts idle pooled sockets plus requests in flight.
+        """
+        idle = 0
+        for key in list(self.poolmanager.pools.keys()):
+            pool = self.poolmanager.pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            idle += len([conn for conn in list(pool.pool.queue) if getattr(conn, 'sock', None) is not None])
+        with self._stats_lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'open_sockets': idle + self._in_use,
+                'max_pool_connections': self.max_pool_connections
+            }
@@ -0,0 +1,133 @@
+"""
+Retry policies for PynamoDB connections
+"""
+import random
+import socket
+import logging
+import threading
+
+from botocore.vendored.requests.exceptions import ConnectionError, Timeout
+
+from pynamodb.constants import (
+    DEFAULT_MAX_RETRY_ATTEMPTS, DEFAULT_RETRY_BASE_DELAY, DEFAULT_RETRY_MAX_DELAY, RETRYABLE_ERROR_CODES,
+    THROTTLING_ERROR_CODES, HTTP_SERVER_ERROR, ERRORS, CODE
+)
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def get_error_code(data):
+    """
+    Returns the error code of a parsed DynamoDB response, or None
+    """
+    if isinstance(data, dict):
+        errors = data.get(ERRORS)
+        if errors:
+            return errors[0].get(CODE)
+    return None
+
+
+class RetryPolicy(object):
+    """
+    Decides which failed requests are retried, and how long to wait before each retry
+
+    Retries are delayed with exponential backoff and full jitter: before retry `n`, the
+    connection sleeps for a random time between 0 and ``min(max_delay, base_delay * 2 ** (n - 1))``.
+    Throttling errors, server errors and socket errors are retried.
+    """
+    retryable_exceptions = (socket.error, ConnectionError, Timeout)
+
+    def __init__(self,
+                 max_attempts=DEFAULT_MAX_RETRY_ATTEMPTS,
+                 base_delay=DEFAULT_RETRY_BASE_DELAY,
+                 max_delay=DEFAULT_RETRY_MAX_DELAY,
+                 retryable_codes=None,
+                 on_attempt=None):
+        """
+        :param max_attempts: The maximum number of attempts per request, including the first one
+        :param base_delay: The base delay in seconds
+        :param max_delay: The maximum delay in seconds
+        :param retryable_codes: The DynamoDB error codes that are retried, defaults to `RETRYABLE_ERROR_CODES`
+        :param on_attempt: If set, called with a dictionary describing each attempt
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_codes = RETRYABLE_ERROR_CODES if retryable_codes is None else retryable_codes
+        self.on_attempt = on_attempt
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'attempts': 0,
+            'retries': 0,
+            'throttled': 0,
+            'server_errors': 0,
+            'socket_errors': 0,
+            'exhausted': 0
+        }
+
+    def is_retryable(self, response, data):
+        """
+        Returns True if a failed response may succeed when retried
+        """
+        if response.status_code >= HTTP_SERVER_ERROR:
+            return True
+        return get_error_code(data) in self.retryable_codes
+
+    def get_delay(self, attempt):
+        """
+        Returns the number of seconds to wait after attempt number `attempt` failed
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def get_retry_delay(self, operation_name, attempt, response=None, data=None, exception=None):
+        """
+        Records an attempt, and returns the number of seconds to wait before retrying it
+
+        Returns None if the attempt succeeded, failed with an error that is not retryable,
+        or was the last attempt. The status and error codes are only reported for failed attempts.
+        """
+        status_code = None
+        error_code = None
+        retryable = False
+        if exception is not None:
+            error_code = exception.__class__.__name__
+            retryable = True
+        elif not response.ok:
+            status_code = response.status_code
+            error_code = get_error_code(data)
+            retryable = self.is_retryable(response, data)
+        delay = None
+        if retryable and attempt < self.max_attempts:
+            delay = self.get_delay(attempt)
+        with self._stats_lock:
+            self._stats['attempts'] += 1
+            if exception is not None:
+                self._stats['socket_errors'] += 1
+            elif status_code is not None and status_code >= HTTP_SERVER_ERROR:
+                self._stats['server_errors'] += 1
+            elif error_code in THROTTLING_ERROR_CODES:
+                self._stats['throttled'] += 1
+            if delay is not None:
+                self._stats['retries'] += 1
+            elif retryable:
+                self._stats['exhausted'] += 1
+        if delay is not None:
+            log.debug("%s attempt %s failed with %s, retrying in %.3fs",
+                      operation_name, attempt, error_code or status_code, delay)
+        if self.on_attempt is not None:
+            self.on_attempt({
+                'operation': operation_name,
+                'attempt': attempt,
+                'status_code': status_code,
+                'error_code': error_code,
+                'delay': delay
+            })
+        return delay
+
+    def get_stats(self):
+        """
+        Returns a dictionary of retry statistics
+        """
+        with self._stats_lock:
+            return dict(self._stats)
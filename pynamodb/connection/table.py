@@ -3,6 +3,7 @@ PynamoDB Connection classes
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 """
 from .base import Connection
+from pynamodb.constants import DEFAULT_MAX_POOL_CONNECTIONS
 
 
 class TableConnection(object):
@@ -10,11 +11,56 @@ class TableConnection(object):
     A higher level abstraction over botocore
     """
 
-    def __init__(self, table_name, region=None, host=None):
+    def __init__(self,
+                 table_name,
+                 region=None,
+                 host=None,
+                 max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+                 pool_idle_timeout=None,
+                 keep_alive=True,
+                 retry_policy=None,
+                 transport=None,
+                 metrics=None,
+                 request_logger=None,
+                 meta_table_cache=None):
         self._hash_keyname = None
         self._range_keyname = None
         self.table_name = table_name
-        self.connection = Connection(region=region, host=host)
+        self.connection = Connection(
+            region=region,
+            host=host,
+            max_pool_connections=max_pool_connections,
+            pool_idle_timeout=pool_idle_timeout,
+            keep_alive=keep_alive,
+            retry_policy=retry_policy,
+            transport=transport,
+            metrics=metrics,
+            request_logger=request_logger,
+            meta_table_cache=meta_table_cache)
+
+    def get_meta_table(self, refresh=False):
+        """
+        Returns the MetaTable of this table, or None if the table doesn't exist
+        """
+        return self.connection.get_meta_table(self.table_name, refresh=refresh)
+
+    def add_meta_table(self, meta_table):
+        """
+        Caches `meta_table` as the MetaTable of this table, so that it isn't described
+        """
+        self.connection.add_meta_table(self.table_name, meta_table)
+
+    def get_pool_stats(self):
+        """
+        Returns the HTTP connection pool statistics
+        """
+        return self.connection.get_pool_stats()
+
+    def get_retry_stats(self):
+        """
+        Returns the retry statistics
+        """
+        return self.connection.get_retry_stats()
 
     def delete_item(self, hash_key,
                     range_key=None,
@@ -120,7 +166,8 @@ class TableConnection(object):
              return_consumed_capacity=None,
              segment=None,
              total_segments=None,
-             exclusive_start_key=None):
+             exclusive_start_key=None,
+             select=None):
         """
         Performs the scan operation
         """
@@ -132,7 +179,8 @@ class TableConnection(object):
             return_consumed_capacity=return_consumed_capacity,
             segment=segment,
             total_segments=total_segments,
-            exclusive_start_key=exclusive_start_key)
+            exclusive_start_key=exclusive_start_key,
+            select=select)
 
     def query(self,
               hash_key,
@@ -0,0 +1,46 @@
+"""
+Transports send low level operations to DynamoDB
+"""
+import time
+
+
+class Transport(object):
+    """
+    The interface between a `Connection` and DynamoDB
+
+    A transport receives the name of an operation and its pythonic keyword arguments, as built by
+    `Connection`, and returns a `(response, data)` tuple. `response` must provide `ok`, `status_code`
+    and `content`, and `data` is the parsed response body.
+
+    If `timings` is a dictionary, a transport may set the ``serialize``, ``network`` and ``parse``
+    times of the request in it, in seconds.
+    """
+
+    def send(self, connection, operation_name, operation_kwargs, timings=None):
+        """
+        Sends `operation_name` with arguments `operation_kwargs`
+        """
+        raise NotImplementedError
+
+
+class BotocoreTransport(Transport):
+    """
+    Sends operations to DynamoDB over HTTP using botocore
+    """
+
+    def send(self, connection, operation_name, operation_kwargs, timings=None):
+        """
+        Sends `operation_name` with arguments `operation_kwargs` to the endpoint of `connection`
+        """
+        if timings is None:
+            return connection.service.get_operation(operation_name).call(connection.endpoint, **operation_kwargs)
+        connection.http_adapter.pop_send_times()
+        started = time.time()
+        result = connection.service.get_operation(operation_name).call(connection.endpoint, **operation_kwargs)
+        finished = time.time()
+        send_times = connection.http_adapter.pop_send_times()
+        if send_times is not None:
+            timings['serialize'] = send_times[0] - started
+            timings['network'] = send_times[1] - send_times[0]
+            timings['parse'] = finished - send_times[1]
+        return result
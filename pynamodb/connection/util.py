@@ -3,10 +3,19 @@ Utils
 """
 import re
 
+_PYTHONIC_NAMES = {}
+
 
 def pythonic(var_name):
     """
     Converts CamelCase variable names to pythonic variable_names
+
+    Names are converted once, and cached
     """
-    first_pass = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', var_name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', first_pass).lower()
+    try:
+        return _PYTHONIC_NAMES[var_name]
+    except KeyError:
+        first_pass = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', var_name)
+        name = re.sub('([a-z0-9])([A-Z])', r'\1_\2', first_pass).lower()
+        _PYTHONIC_NAMES[var_name] = name
+        return name
@@ -28,6 +28,7 @@ ATTR_DEFINITIONS = 'AttributeDefinitions'
 ATTR_VALUE_LIST = 'AttributeValueList'
 TABLE_DESCRIPTION = 'TableDescription'
 UNPROCESSED_KEYS = 'UnprocessedKeys'
+UNPROCESSED_ITEMS = 'UnprocessedItems'
 CONSISTENT_READ = 'ConsistentRead'
 DELETE_REQUEST = 'DeleteRequest'
 RETURN_VALUES = 'ReturnValues'
@@ -35,6 +36,14 @@ REQUEST_ITEMS = 'RequestItems'
 ATTRS_TO_GET = 'AttributesToGet'
 ATTR_UPDATES = 'AttributeUpdates'
 TABLE_STATUS = 'TableStatus'
+TABLE_NAMES = 'TableNames'
+LAST_EVALUATED_TABLE_NAME = 'LastEvaluatedTableName'
+ITEM_COUNT = 'ItemCount'
+TABLE_SIZE_BYTES = 'TableSizeBytes'
+CREATION_DATE_TIME = 'CreationDateTime'
+INDEX_STATUS = 'IndexStatus'
+SCANNED_COUNT = 'ScannedCount'
+CAMEL_COUNT = 'Count'
 SCAN_FILTER = 'ScanFilter'
 TABLE_NAME = 'TableName'
 KEY_SCHEMA = 'KeySchema'
@@ -52,6 +61,7 @@ UPDATE = 'Update'
 EXISTS = 'Exists'
 SELECT = 'Select'
 ACTIVE = 'ACTIVE'
+DELETING = 'DELETING'
 LIMIT = 'Limit'
 ITEMS = 'Items'
 ITEM = 'Item'
@@ -64,8 +74,39 @@ DEFAULT_ENCODING = 'utf-8'
 DEFAULT_REGION = 'us-east-1'
 DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
 SERVICE_NAME = 'dynamodb'
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_MAX_RETRY_ATTEMPTS = 10
+DEFAULT_RETRY_BASE_DELAY = 0.05
+DEFAULT_RETRY_MAX_DELAY = 5
 HTTP_OK = 200
 HTTP_BAD_REQUEST = 400
+HTTP_SERVER_ERROR = 500
+HISTOGRAM_MIN_VALUE = 0.00001
+HISTOGRAM_GROWTH_FACTOR = 1.05
+DEFAULT_LOG_SAMPLE_RATE = 1
+DEFAULT_LOG_MAX_PAYLOAD_LENGTH = 1024
+DEFAULT_META_TABLE_CACHE_TTL = 900
+DEFAULT_META_TABLE_CACHE_LOCK_TIMEOUT = 10
+
+# Errors
+# See: http://docs.aws.amazon.com/amazondynamodb/latest/developerguide/ErrorHandling.html
+ERRORS = 'Errors'
+CODE = 'Code'
+PROVISIONED_THROUGHPUT_EXCEEDED = 'ProvisionedThroughputExceededException'
+THROTTLING_EXCEPTION = 'ThrottlingException'
+REQUEST_LIMIT_EXCEEDED = 'RequestLimitExceeded'
+INTERNAL_SERVER_ERROR = 'InternalServerError'
+SERVICE_UNAVAILABLE = 'ServiceUnavailable'
+RETRYABLE_ERROR_CODES = [
+    PROVISIONED_THROUGHPUT_EXCEEDED, THROTTLING_EXCEPTION, REQUEST_LIMIT_EXCEEDED,
+    INTERNAL_SERVER_ERROR, SERVICE_UNAVAILABLE
+]
+THROTTLING_ERROR_CODES = [PROVISIONED_THROUGHPUT_EXCEEDED, THROTTLING_EXCEPTION, REQUEST_LIMIT_EXCEEDED]
+MESSAGE = 'Message'
+CONDITIONAL_CHECK_FAILED = 'ConditionalCheckFailedException'
+RESOURCE_NOT_FOUND = 'ResourceNotFoundException'
+RESOURCE_IN_USE = 'ResourceInUseException'
+VALIDATION_EXCEPTION = 'ValidationException'
 
 # Create Table arguments
 PROVISIONED_THROUGHPUT = 'ProvisionedThroughput'
@@ -206,3 +247,13 @@ BATCH_WRITE_PAGE_LIMIT = 25
 META_CLASS_NAME = "Meta"
 REGION = "region"
 HOST = "host"
+MAX_POOL_CONNECTIONS = "max_pool_connections"
+POOL_IDLE_TIMEOUT = "pool_idle_timeout"
+RETRY_POLICY = "retry_policy"
+TRANSPORT = "transport"
+METRICS = "metrics"
+REQUEST_LOGGER = "request_logger"
+OFFLINE_SCHEMA = "offline_schema"
+META_TABLE_CACHE = "meta_table_cache"
+COMPACT_INSTANCES = "compact_instances"
+LAZY_DESERIALIZATION = "lazy_deserialization"
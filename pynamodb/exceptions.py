@@ -17,7 +17,12 @@ class PynamoDBConnectionError(PynamoDBException):
 
     msg = "Connection Error"
 
-    def __init__(self, msg=None):
+    def __init__(self, msg=None, retryable=False):
+        """
+        :param msg: The error message
+        :param retryable: True if the request failed with a transient error, and may succeed if retried later
+        """
+        self.retryable = retryable
         super(PynamoDBConnectionError, self).__init__(msg)
 
 
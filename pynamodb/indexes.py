@@ -5,7 +5,7 @@ from pynamodb.constants import (
     INCLUDE, ALL, KEYS_ONLY, ATTR_NAME, ATTR_TYPE, KEY_TYPE, ATTR_TYPE_MAP, KEY_SCHEMA,
     ATTR_DEFINITIONS, META_CLASS_NAME
 )
-from pynamodb.attributes import Attribute
+from pynamodb.attributes import Attribute, AttributeRegistry, creation_counter
 from pynamodb.types import HASH, RANGE
 from pynamodb.connection.util import pythonic
 from six import with_metaclass
@@ -16,13 +16,14 @@ class IndexMeta(type):
     Index meta class
 
     This class is here to allow for an index `Meta` class
-    that contains the index settings
+    that contains the index settings, and builds the registry
+    of the index attributes
     """
     def __init__(cls, name, bases, attrs):
         if META_CLASS_NAME in attrs:
             meta_cls = attrs.get(META_CLASS_NAME)
             if meta_cls is not None:
-                meta_cls.attributes = None
+                meta_cls.attributes = AttributeRegistry.from_class(cls, Attribute)
 
 
 class Index(with_metaclass(IndexMeta)):
@@ -36,6 +37,7 @@ class Index(with_metaclass(IndexMeta)):
             raise ValueError("Indexes require a Meta class for settings")
         if not hasattr(self.Meta, "projection"):
             raise ValueError("No projection defined, define a projection for this class")
+        self.creation_order = next(creation_counter)
 
     @classmethod
     def query(cls, *args, **kwargs):
@@ -83,14 +85,8 @@ class Index(with_metaclass(IndexMeta)):
     @classmethod
     def get_attributes(cls):
         """
-        Returns the list of attributes for this class
+        Returns the attributes of this index, keyed by name
         """
-        if cls.Meta.attributes is None:
-            cls.Meta.attributes = {}
-            for item in dir(cls):
-                item_cls = getattr(getattr(cls, item), "__class__", None)
-                if item_cls and issubclass(item_cls, (Attribute, )):
-                    cls.Meta.attributes[item] = getattr(cls, item)
         return cls.Meta.attributes
 
 
@@ -103,9 +99,13 @@ class GlobalSecondaryIndex(Index):
               scan_index_forward=None,
               consistent_read=False,
               limit=None,
+              attributes_to_get=None,
               **filters):
         """
         Queries an index
+
+        :param attributes_to_get: If set, only these attributes and the keys of the table are read,
+            and partial instances are returned
         """
         return self.Meta.model.query(
             hash_key,
@@ -113,6 +113,7 @@ class GlobalSecondaryIndex(Index):
             scan_index_forward=scan_index_forward,
             consistent_read=consistent_read,
             limit=limit,
+            attributes_to_get=attributes_to_get,
             **filters
         )
 
@@ -127,9 +128,13 @@ class LocalSecondaryIndex(Index):
               scan_index_forward=None,
               consistent_read=False,
               limit=None,
+              attributes_to_get=None,
               **filters):
         """
         Queries an index
+
+        :param attributes_to_get: If set, only these attributes and the keys of the table are read,
+            and partial instances are returned
         """
         return cls.Meta.model.query(
             hash_key,
@@ -137,6 +142,7 @@ class LocalSecondaryIndex(Index):
             scan_index_forward=scan_index_forward,
             consistent_read=consistent_read,
             limit=limit,
+            attributes_to_get=attributes_to_get,
             **filters
         )
 
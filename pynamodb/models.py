@@ -2,14 +2,17 @@
 DynamoDB Models for PynamoDB
 """
 
+import sys
 import time
+import importlib
+import itertools
 import six
-import copy
 import logging
 from six import with_metaclass
 from .exceptions import DoesNotExist
 from .throttle import NoThrottle
-from .attributes import Attribute
+from .concurrency import map_concurrently, chain_concurrently, prefetch_pages
+from .attributes import Attribute, AttributeRegistry
 from .connection.base import MetaTable
 from .connection.table import TableConnection
 from .connection.util import pythonic
@@ -25,13 +28,42 @@ from pynamodb.constants import (
     TABLE_STATUS, ACTIVE, RETURN_VALUES, BATCH_GET_PAGE_LIMIT, UNPROCESSED_KEYS,
     PUT_REQUEST, DELETE_REQUEST, LAST_EVALUATED_KEY, QUERY_OPERATOR_MAP,
     SCAN_OPERATOR_MAP, CONSUMED_CAPACITY, BATCH_WRITE_PAGE_LIMIT, TABLE_NAME,
-    CAPACITY_UNITS, DEFAULT_REGION, META_CLASS_NAME, REGION, HOST)
+    CAPACITY_UNITS, DEFAULT_REGION, META_CLASS_NAME, REGION, HOST,
+    MAX_POOL_CONNECTIONS, POOL_IDLE_TIMEOUT, DEFAULT_MAX_POOL_CONNECTIONS, RETRY_POLICY,
+    TRANSPORT, METRICS, REQUEST_LOGGER, OFFLINE_SCHEMA,
+    META_TABLE_CACHE, COMPACT_INSTANCES, LAZY_DESERIALIZATION, EXPECTED, COUNT, CAMEL_COUNT,
+    SCANNED_COUNT)
 
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+def _import_async_module(name):
+    """
+    Imports the asyncio module `name`, which uses Python 3.5+ syntax and is not installed on older versions
+    """
+    if sys.version_info < (3, 5):
+        raise ImportError("The asyncio API requires Python 3.5+")
+    return importlib.import_module(name)
+
+
+def _serialize_field(field, values, null_check):
+    """
+    Serializes the value of a key field of a serialization plan, or returns None
+    """
+    if field is None:
+        return None
+    name, _, serialize, null = field
+    value = values.get(name)
+    if value is None:
+        if null:
+            return None
+        elif null_check:
+            raise ValueError("Attribute '{0}' cannot be None".format(name))
+    return serialize(value)
+
+
 class ModelContextManager(object):
     """
     A class for managing batch operations
@@ -64,6 +96,7 @@ class BatchWrite(ModelContextManager):
 
         :param put_item: Should be an instance of a `Model` to be written
         """
+        put_item._check_full_item()
         if len(self.pending_operations) == self.max_operations:
             if not self.auto_commit:
                 raise ValueError("DynamoDB allows a maximum of 25 batch operations")
@@ -96,13 +129,15 @@ class BatchWrite(ModelContextManager):
         """
         Writes all of the changes that are pending
         """
-        log.debug("{0} committing batch operation".format(self.model))
+        log.debug("%s committing batch operation", self.model)
         put_items = []
         delete_items = []
+        saved = []
         attrs_name = pythonic(ATTRIBUTES)
         for item in self.pending_operations:
             if item['action'] == PUT:
                 put_items.append(item['item'].serialize(attr_map=True)[attrs_name])
+                saved.append(item['item'])
             elif item['action'] == DELETE:
                 delete_items.append(item['item'].get_keys())
         self.pending_operations = []
@@ -126,27 +161,158 @@ class BatchWrite(ModelContextManager):
                 elif DELETE_REQUEST in key:
                     delete_items.append(key.get(DELETE_REQUEST))
             self.model.throttle.throttle()
-            log.debug("Resending {0} unprocessed keys for batch operation".format(len(unprocessed_keys)))
+            log.debug("Resending %s unprocessed keys for batch operation", len(unprocessed_keys))
             data = self.model.get_connection().batch_write_item(
                 put_items=put_items,
                 delete_items=delete_items
             )
             self.model.add_throttle_record(data.get(CONSUMED_CAPACITY))
             unprocessed_keys = data.get(UNPROCESSED_KEYS, {}).get(self.model.Meta.table_name)
+        for item in saved:
+            item._clear_changes()
+
+
+class ItemCount(int):
+    """
+    The number of items counted by `Model.count`
+
+    The number of items evaluated before the filters were applied is `scanned_count`, and
+    the read capacity units consumed by the count are `consumed_capacity`.
+    """
+
+    def __new__(cls, count, scanned_count=0, consumed_capacity=0):
+        item_count = super(ItemCount, cls).__new__(cls, count)
+        item_count.scanned_count = scanned_count
+        item_count.consumed_capacity = consumed_capacity
+        return item_count
 
 
 class DefaultMeta(object):
     table_name = None
     region = DEFAULT_REGION
     host = None
+    max_pool_connections = DEFAULT_MAX_POOL_CONNECTIONS
+    pool_idle_timeout = None
+    retry_policy = None
+    transport = None
+    metrics = None
+    request_logger = None
+    offline_schema = False
+    meta_table_cache = None
+    compact_instances = False
+    lazy_deserialization = False
+
+
+def _get_items(data):
+    """
+    Returns the serialized items of a query or scan response
+    """
+    return data.get(ITEMS)
+
+
+def _rebuild_model(model_class, attribute_values):
+    """
+    Returns an instance of `model_class` with `attribute_values`, when unpickling
+    """
+    item = model_class.__new__(model_class)
+    item.attribute_values = attribute_values
+    return item
+
+
+def _deserialize_raw_value(instance, name, attribute):
+    """
+    Returns the value of `attribute` deserialized from the raw item of a lazy instance, or None
+    """
+    raw_item = instance._raw_item
+    if raw_item is not None:
+        raw_value = raw_item.get(name)
+        if raw_value is not None:
+            return attribute.deserialize(raw_value.get(ATTR_TYPE_MAP[attribute.attr_type]))
+    return None
+
+
+class SlotAttribute(object):
+    """
+    Stores the values of an attribute in a slot of compact model instances
+
+    Reading the attribute from the class returns the attribute itself. If `lazy` is set,
+    a value missing from its slot is deserialized from the raw item on first access.
+    """
+    __slots__ = ('attribute', 'name', 'slot', 'lazy')
+
+    def __init__(self, attribute, name, slot, lazy=False):
+        self.attribute = attribute
+        self.name = name
+        self.slot = slot
+        self.lazy = lazy
+
+    def __set__(self, instance, value):
+        if isinstance(value, Attribute):
+            return
+        self.slot.__set__(instance, value)
+        changed = instance._changed_attributes
+        if changed is None:
+            instance._changed_attributes = set([self.name])
+        else:
+            changed.add(self.name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.attribute
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            if not self.lazy:
+                return None
+        value = _deserialize_raw_value(instance, self.name, self.attribute)
+        if value is not None:
+            self.slot.__set__(instance, value)
+        return value
+
+
+class LazyAttribute(object):
+    """
+    Deserializes the value of an attribute of lazy model instances on first access
+
+    Reading the attribute from the class returns the attribute itself.
+    """
+    __slots__ = ('attribute', 'name')
+
+    def __init__(self, attribute, name):
+        self.attribute = attribute
+        self.name = name
+
+    def __set__(self, instance, value):
+        if isinstance(value, Attribute):
+            return
+        instance._attribute_values[self.name] = value
+        changed = instance._changed_attributes
+        if changed is None:
+            instance._changed_attributes = set([self.name])
+        else:
+            changed.add(self.name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.attribute
+        values = instance._attribute_values
+        try:
+            return values[self.name]
+        except KeyError:
+            pass
+        value = _deserialize_raw_value(instance, self.name, self.attribute)
+        if value is not None:
+            values[self.name] = value
+        return value
 
 
 class MetaModel(type):
     """
     Model meta class
 
-    This class is just here so that index queries have nice syntax.
-    Model.index.query()
+    This class is here so that index queries have nice syntax,
+    Model.index.query(), and builds the registries of the model
+    attributes and indexes, and its serialization plans, once the class is created.
     """
     def __init__(cls, name, bases, attrs):
         if isinstance(attrs, dict):
@@ -156,6 +322,26 @@ class MetaModel(type):
                         setattr(attr_obj, REGION, DEFAULT_REGION)
                     if not hasattr(attr_obj, HOST):
                         setattr(attr_obj, HOST, None)
+                    if not hasattr(attr_obj, MAX_POOL_CONNECTIONS):
+                        setattr(attr_obj, MAX_POOL_CONNECTIONS, DEFAULT_MAX_POOL_CONNECTIONS)
+                    if not hasattr(attr_obj, POOL_IDLE_TIMEOUT):
+                        setattr(attr_obj, POOL_IDLE_TIMEOUT, None)
+                    if not hasattr(attr_obj, RETRY_POLICY):
+                        setattr(attr_obj, RETRY_POLICY, None)
+                    if not hasattr(attr_obj, TRANSPORT):
+                        setattr(attr_obj, TRANSPORT, None)
+                    if not hasattr(attr_obj, METRICS):
+                        setattr(attr_obj, METRICS, None)
+                    if not hasattr(attr_obj, REQUEST_LOGGER):
+                        setattr(attr_obj, REQUEST_LOGGER, None)
+                    if not hasattr(attr_obj, OFFLINE_SCHEMA):
+                        setattr(attr_obj, OFFLINE_SCHEMA, False)
+                    if not hasattr(attr_obj, META_TABLE_CACHE):
+                        setattr(attr_obj, META_TABLE_CACHE, None)
+                    if not hasattr(attr_obj, COMPACT_INSTANCES):
+                        setattr(attr_obj, COMPACT_INSTANCES, False)
+                    if not hasattr(attr_obj, LAZY_DESERIALIZATION):
+                        setattr(attr_obj, LAZY_DESERIALIZATION, False)
                 elif issubclass(attr_obj.__class__, (Index, )):
                     attr_obj.Meta.model = cls
                     attr_obj.Meta.index_name = attr_name
@@ -164,6 +350,16 @@ class MetaModel(type):
 
             if META_CLASS_NAME not in attrs:
                 setattr(cls, META_CLASS_NAME, DefaultMeta)
+        cls.attributes = AttributeRegistry.from_class(cls, Attribute, 'attributes')
+        cls.index_classes = AttributeRegistry.from_class(cls, Index, 'index_classes')
+        cls.indexes = cls._build_indexes()
+        cls._serializer = cls._build_serializer()
+        cls._deserializer = cls._build_deserializer()
+        cls._dict_deserializer = cls._build_deserializer(as_dict=True)
+        compact = getattr(cls.Meta, COMPACT_INSTANCES, False)
+        lazy = getattr(cls.Meta, LAZY_DESERIALIZATION, False)
+        if (compact or lazy) and '_model_class' not in cls.__dict__:
+            cls._deserializer = cls._build_instance_class(compact, lazy)._deserializer
 
 
 class Model(with_metaclass(MetaModel)):
@@ -180,7 +376,13 @@ class Model(with_metaclass(MetaModel)):
     attributes = None
     indexes = None
     connection = None
+    async_connection = None
     index_classes = None
+    _compact_class = False
+    _lazy_class = False
+    _changed_attributes = None
+    _projection = None
+    _model_class = None
     throttle = NoThrottle()
     DoesNotExist = DoesNotExist
 
@@ -192,13 +394,14 @@ class Model(with_metaclass(MetaModel)):
         """
         self.attribute_values = {}
         self.set_defaults()
+        # The key names come from the model, so that no table meta data is loaded here
+        hash_field, range_field, _ = self._get_serializer()
         if hash_key:
-            setattr(self, self.get_meta_data().hash_keyname, hash_key)
+            setattr(self, hash_field[0], hash_key)
         if range_key:
-            range_keyname = self.get_meta_data().range_keyname
-            if range_keyname is None:
+            if range_field is None:
                 raise ValueError("This table has no range key, but a range key value was provided: {0}".format(range_key))
-            setattr(self, range_keyname, range_key)
+            setattr(self, range_field[0], range_key)
         self.set_attributes(**attrs)
 
     @classmethod
@@ -217,27 +420,48 @@ class Model(with_metaclass(MetaModel)):
                     break
 
     @classmethod
-    def batch_get(cls, items):
+    def batch_get(cls, items, workers=1, ordered=True, raw=False, as_dict=False, attributes_to_get=None):
         """
         BatchGetItem for this model
 
-        :param items: Should be a list of hash keys to retrieve, or a list of
+        Keys are read lazily from `items` and fetched in pages of 100 keys. Unprocessed
+        keys are fetched again, with exponential backoff, before the items of a page are yielded.
+
+        :param items: Should be an iterable of hash keys to retrieve, or of
             tuples if range keys are used.
+        :param workers: The number of pages fetched concurrently
+        :param ordered: If True, the items of a page are yielded before those of the following
+            pages, otherwise pages are yielded as soon as they are fetched
+        :param raw: If True, the serialized DynamoDB objects are yielded without deserializing them
+        :param as_dict: If True, dictionaries of deserialized attribute values are yielded instead of instances
+        :param attributes_to_get: If set, only these attributes and the keys of the table are read,
+            and partial instances are returned
+        """
+        projection = cls._get_projection(attributes_to_get)
+        attributes_to_get = sorted(projection) if projection else None
+
+        def get_keys(keys_to_get):
+            return cls._batch_get_keys(keys_to_get, attributes_to_get=attributes_to_get)
+
+        pages = cls._get_batch_get_pages(items)
+        if workers == 1:
+            fetched = six.moves.map(get_keys, pages)
+        else:
+            fetched = map_concurrently(get_keys, pages, workers, ordered=ordered)
+        for item in cls._iter_items(fetched, raw=raw, as_dict=as_dict, projection=projection):
+            yield item
+
+    @classmethod
+    def _get_batch_get_pages(cls, items):
+        """
+        Yields lists of at most BATCH_GET_PAGE_LIMIT serialized keys
+
+        :param items: An iterable of hash keys, or of (hash key, range key) tuples
         """
         hash_keyname = cls.get_meta_data().hash_keyname
         range_keyname = cls.get_meta_data().range_keyname
         keys_to_get = []
-        while items:
-            if len(keys_to_get) == BATCH_GET_PAGE_LIMIT:
-                while keys_to_get:
-                    page, unprocessed_keys = cls._batch_get_page(keys_to_get)
-                    for batch_item in page:
-                        yield cls.from_raw_data(batch_item)
-                    if unprocessed_keys:
-                        keys_to_get = unprocessed_keys
-                    else:
-                        keys_to_get = []
-            item = items.pop()
+        for item in items:
             if range_keyname:
                 hash_key, range_key = cls.serialize_keys(item[0], item[1])
                 keys_to_get.append({
@@ -249,27 +473,51 @@ class Model(with_metaclass(MetaModel)):
                 keys_to_get.append({
                     hash_keyname: hash_key
                 })
+            if len(keys_to_get) == BATCH_GET_PAGE_LIMIT:
+                yield keys_to_get
+                keys_to_get = []
+        if keys_to_get:
+            yield keys_to_get
+
+    @classmethod
+    def _batch_get_keys(cls, keys_to_get, attributes_to_get=None):
+        """
+        Returns the raw items of `keys_to_get`, fetching unprocessed keys again until there are none
+
+        Retries are delayed by the retry policy of the connection. The delay grows while
+        retries return no items.
 
+        :param keys_to_get: A list of at most BATCH_GET_PAGE_LIMIT keys
+        :param attributes_to_get: If set, only these attributes are read
+        """
+        retry_policy = cls.get_connection().connection.retry_policy
+        items = []
+        attempt = 0
         while keys_to_get:
-            page, unprocessed_keys = cls._batch_get_page(keys_to_get)
-            for batch_item in page:
-                yield cls.from_raw_data(batch_item)
-            if unprocessed_keys:
-                keys_to_get = unprocessed_keys
-            else:
-                keys_to_get = []
+            page, keys_to_get = cls._batch_get_page(keys_to_get, attributes_to_get=attributes_to_get)
+            if page:
+                items.extend(page)
+                attempt = 0
+            if keys_to_get:
+                attempt += 1
+                delay = retry_policy.get_delay(attempt)
+                log.debug("Fetching %s unprocessed keys in %.3fs", len(keys_to_get), delay)
+                time.sleep(delay)
+        return items
 
     @classmethod
-    def _batch_get_page(cls, keys_to_get):
+    def _batch_get_page(cls, keys_to_get, attributes_to_get=None):
         """
         Returns a single page from BatchGetItem
         Also returns any unprocessed items
 
         :param keys_to_get: A list of keys
+        :param attributes_to_get: If set, only these attributes are read
         """
         log.debug("Fetching a BatchGetItem page")
         data = cls.get_connection().batch_get_item(
-            keys_to_get
+            keys_to_get,
+            attributes_to_get=attributes_to_get
         )
         cls.throttle.add_record(data.get(CONSUMED_CAPACITY))
         item_data = data.get(RESPONSES).get(cls.Meta.table_name)
@@ -307,24 +555,77 @@ class Model(with_metaclass(MetaModel)):
             setattr(self, key, value)
 
     def __repr__(self):
-        hash_key = getattr(self, self.get_meta_data().hash_keyname, None)
+        hash_field, range_field, _ = self._get_serializer()
+        hash_key = getattr(self, hash_field[0], None)
         if hash_key and self.Meta.table_name:
-            if self.get_meta_data().range_keyname:
-                range_key = getattr(self, self.get_meta_data().range_keyname, None)
+            if range_field is not None:
+                range_key = getattr(self, range_field[0], None)
                 msg = "{0}<{1}, {2}>".format(self.Meta.table_name, hash_key, range_key)
             else:
                 msg = "{0}<{1}>".format(self.Meta.table_name, hash_key)
             return six.u(msg)
 
+    def __reduce__(self):
+        """
+        Pickles this object as an instance of its model class, with its attribute values
+
+        Items read from DynamoDB may be instances of a compact or lazy subclass built by the
+        model, which can't be found by name when unpickling.
+        """
+        state = {}
+        if self._changed_attributes is not None:
+            state['_changed_attributes'] = self._changed_attributes
+        if self._projection is not None:
+            state['_projection'] = self._projection
+        model_class = self._model_class or type(self)
+        return _rebuild_model, (model_class, self.attribute_values), state or None
+
     @classmethod
     def get_meta_data(cls):
         """
         A helper object that contains meta data about this table
         """
         if cls.meta_table is None:
-            cls.meta_table = MetaTable(cls.get_connection().describe_table())
+            if cls.Meta.offline_schema:
+                cls.meta_table = MetaTable(cls._get_table_data())
+            else:
+                cls.meta_table = cls.get_connection().get_meta_table() or MetaTable(None)
         return cls.meta_table
 
+    @classmethod
+    def _get_table_data(cls):
+        """
+        Returns the table meta data declared by this model, in the format of a DescribeTable response
+        """
+        schema = cls.get_schema()
+        index_data = cls.get_indexes()
+        attr_definitions = {}
+        for attr in schema.get(pythonic(ATTR_DEFINITIONS)) + index_data.get(pythonic(ATTR_DEFINITIONS)):
+            attr_definitions[attr.get(pythonic(ATTR_NAME))] = attr.get(pythonic(ATTR_TYPE))
+        data = {
+            TABLE_NAME: cls.Meta.table_name,
+            ATTR_DEFINITIONS: [
+                {ATTR_NAME: attr_name, ATTR_TYPE: attr_type}
+                for attr_name, attr_type in attr_definitions.items()
+            ],
+            KEY_SCHEMA: [
+                {ATTR_NAME: key.get(pythonic(ATTR_NAME)), KEY_TYPE: key.get(pythonic(KEY_TYPE))}
+                for key in schema.get(pythonic(KEY_SCHEMA))
+            ]
+        }
+        for index_type in [GLOBAL_SECONDARY_INDEXES, LOCAL_SECONDARY_INDEXES]:
+            indexes = index_data.get(pythonic(index_type))
+            if indexes:
+                data[index_type] = [
+                    {
+                        INDEX_NAME: index.get(pythonic(INDEX_NAME)),
+                        KEY_SCHEMA: index.get(pythonic(KEY_SCHEMA)),
+                        PROJECTION: index.get(pythonic(PROJECTION))
+                    }
+                    for index in indexes
+                ]
+        return data
+
     @classmethod
     def get_connection(cls):
         """
@@ -337,9 +638,47 @@ class Model(with_metaclass(MetaModel)):
             )
 
         if cls.connection is None:
-            cls.connection = TableConnection(cls.Meta.table_name, region=cls.Meta.region, host=cls.Meta.host)
+            cls.connection = TableConnection(
+                cls.Meta.table_name,
+                region=cls.Meta.region,
+                host=cls.Meta.host,
+                max_pool_connections=cls.Meta.max_pool_connections,
+                pool_idle_timeout=cls.Meta.pool_idle_timeout,
+                retry_policy=cls.Meta.retry_policy,
+                transport=cls.Meta.transport,
+                metrics=cls.Meta.metrics,
+                request_logger=cls.Meta.request_logger,
+                meta_table_cache=cls.Meta.meta_table_cache)
+            if cls.Meta.offline_schema:
+                cls.connection.add_meta_table(cls.get_meta_data())
         return cls.connection
 
+    @classmethod
+    def get_async_connection(cls):
+        """
+        Returns a (cached) asyncio connection (Python 3.5+)
+        """
+        if not hasattr(cls, "Meta") or cls.Meta.table_name is None:
+            raise AttributeError(
+                """As of v1.0 PynamoDB Models require a `Meta` class.
+                See http://pynamodb.readthedocs.org/en/latest/release_notes.html"""
+            )
+
+        if cls.async_connection is None:
+            aio = _import_async_module('pynamodb.connection.aio')
+            cls.async_connection = aio.AsyncTableConnection(
+                cls.Meta.table_name,
+                region=cls.Meta.region,
+                host=cls.Meta.host,
+                max_pool_connections=cls.Meta.max_pool_connections,
+                retry_policy=cls.Meta.retry_policy,
+                metrics=cls.Meta.metrics,
+                request_logger=cls.Meta.request_logger,
+                meta_table_cache=cls.Meta.meta_table_cache)
+            if cls.Meta.offline_schema:
+                cls.async_connection.add_meta_table(cls.get_meta_data())
+        return cls.async_connection
+
     def delete(self):
         """
         Deletes this object from dynamodb
@@ -347,33 +686,35 @@ class Model(with_metaclass(MetaModel)):
         args, kwargs = self._get_save_args(attributes=False, null_check=False)
         return self.get_connection().delete_item(*args, **kwargs)
 
-    def update_item(self, attribute, value, action=None):
+    def adelete(self):
+        """
+        Deletes this object from dynamodb, as a coroutine (Python 3.5+)
+        """
+        aio = _import_async_module('pynamodb.aio')
+        return aio.delete(self)
+
+    def update_item(self, attribute=None, value=None, action=None, actions=None, expected=None):
         """
         Updates an item using the UpdateItem operation.
 
-        This should be used for updating a single attribute of an item.
+        This should be used for updating attributes of an item in place. Several attributes
+        can be updated with a single request by passing `actions`.
 
         :param attribute: The name of the attribute to be updated
         :param value: The new value for the attribute.
         :param action: The action to take if this item already exists.
             See: http://docs.aws.amazon.com/amazondynamodb/latest/APIReference/API_UpdateItem.html#DDB-UpdateItem-request-AttributeUpdate
-        """
-        args, kwargs = self._get_save_args()
-        attribute_cls = None
-        for attr_name, attr_cls in self.get_attributes().items():
-            if attr_name == attribute:
-                value = attr_cls.serialize(value)
-                attribute_cls = attr_cls
-                break
-        del(kwargs[pythonic(ATTRIBUTES)])
-        kwargs[pythonic(ATTR_UPDATES)] = {
-            attribute: {
-                ACTION: action.upper(),
-                VALUE: {
-                    ATTR_TYPE_MAP[attribute_cls.attr_type]: value
-                }
-            }
-        }
+        :param actions: A dictionary of attribute names to `(action, value)` tuples. A `delete`
+            action with a value of None removes the attribute.
+        :param expected: A dictionary of attribute names to conditions, such as `{'Exists': False}`
+            or `{'Value': value}`, where values are serialized by the attribute classes
+        """
+        actions = dict(actions or {})
+        if attribute is not None:
+            actions[attribute] = (action, value)
+        if not actions:
+            raise ValueError("No attribute to update")
+        args, kwargs = self._get_update_args(actions, expected)
         kwargs[pythonic(RETURN_VALUES)] = ALL_NEW
         data = self.get_connection().update_item(
             *args,
@@ -384,30 +725,182 @@ class Model(with_metaclass(MetaModel)):
             attr = self.get_attributes().get(name, None)
             if attr:
                 setattr(self, name, attr.deserialize(value.get(ATTR_TYPE_MAP[attr.attr_type])))
+        self._discard_changes(data.get(ATTRIBUTES))
+        if self._projection is not None:
+            self._projection = None
         return data
 
-    def save(self):
+    def save(self, changed_only=False):
         """
         Save this object to dynamodb
+
+        :param changed_only: If True, only the attributes changed since this object
+            was loaded or saved are sent, see `update`
         """
+        if changed_only:
+            return self.update()
         args, kwargs = self._get_save_args()
         data = self.get_connection().put_item(*args, **kwargs)
         if isinstance(data, dict):
             self.throttle.add_record(data.get(CONSUMED_CAPACITY))
+        self._clear_changes()
+        return data
+
+    def asave(self, changed_only=False):
+        """
+        Save this object to dynamodb, as a coroutine (Python 3.5+)
+        """
+        aio = _import_async_module('pynamodb.aio')
+        if changed_only:
+            return aio.update(self)
+        return aio.save(self)
+
+    def update(self):
+        """
+        Saves the attributes changed since this object was loaded or saved, with a single UpdateItem
+
+        Changed attributes are PUT, or DELETEd if they are now empty. Nothing is sent if no attribute
+        changed, and the whole object is saved if one of its keys changed, as it is then a new item.
+        """
+        if not self._changed_attributes:
+            return None
+        if self._has_changed_keys():
+            return self.save()
+        args, kwargs = self._get_update_args()
+        data = self.get_connection().update_item(*args, **kwargs)
+        self.throttle.add_record(data.get(CONSUMED_CAPACITY))
+        self._clear_changes()
         return data
 
+    def aupdate(self):
+        """
+        Saves the attributes changed since this object was loaded or saved, as a coroutine (Python 3.5+)
+        """
+        aio = _import_async_module('pynamodb.aio')
+        return aio.update(self)
+
+    def is_partial(self):
+        """
+        Returns True if this object was read with `attributes_to_get`, and lacks other attributes
+
+        Partial objects can be updated, refreshed or deleted, but not saved as a whole.
+        """
+        return self._projection is not None
+
+    def _check_full_item(self):
+        """
+        Raises ValueError if this object is partial, as saving it would drop its other attributes
+        """
+        if self._projection is not None:
+            raise ValueError(
+                "This item was read with attributes_to_get and only has the attributes {0}. "
+                "Use update or update_item, or refresh it before saving it.".format(sorted(self._projection)))
+
+    def get_changed_attributes(self):
+        """
+        Returns the names of the attributes assigned since this object was loaded or saved
+
+        Values changed in place, such as an element added to a set, are only tracked once
+        the attribute is assigned again.
+        """
+        return set(self._changed_attributes or ())
+
+    def _has_changed_keys(self):
+        """
+        Returns True if the hash or range key of this object changed since it was loaded or saved
+        """
+        hash_field, range_field, _ = self._get_serializer()
+        changed = self._changed_attributes or ()
+        return hash_field[0] in changed or (range_field is not None and range_field[0] in changed)
+
+    def _get_update_args(self, actions=None, expected=None):
+        """
+        Gets the proper *args, **kwargs for an UpdateItem
+
+        :param actions: A dictionary of attribute names to `(action, value)` tuples,
+            defaults to putting the changed attributes of this object
+        :param expected: A dictionary of attribute names to conditions
+        """
+        args, kwargs = self._get_save_args(attributes=False)
+        if actions is None:
+            actions = self._get_changed_actions()
+        attributes = self.get_attributes()
+        attribute_updates = {}
+        for name, (action, value) in actions.items():
+            attr = attributes.get(name)
+            if attr is None:
+                raise ValueError("Unknown attribute '{0}'".format(name))
+            action = (action or PUT).upper()
+            serialized = None if value is None else attr.serialize(value)
+            if serialized is None and action in (PUT, DELETE):
+                attribute_updates[name] = {ACTION: DELETE}
+            elif serialized is None:
+                raise ValueError("Attribute '{0}' needs a value for {1}".format(name, action))
+            else:
+                attribute_updates[name] = {
+                    ACTION: action,
+                    VALUE: {
+                        ATTR_TYPE_MAP[attr.attr_type]: serialized
+                    }
+                }
+        kwargs[pythonic(ATTR_UPDATES)] = attribute_updates
+        if expected:
+            kwargs[pythonic(EXPECTED)] = self._get_expected(expected)
+        return args, kwargs
+
+    def _get_changed_actions(self):
+        """
+        Returns the actions that put the changed attributes of this object
+        """
+        attributes = self.get_attributes()
+        actions = {}
+        for name in self._changed_attributes:
+            value = getattr(self, name)
+            if value is None and not attributes[name].null:
+                raise ValueError("Attribute '{0}' cannot be None".format(name))
+            actions[name] = (PUT, value)
+        return actions
+
+    @classmethod
+    def _get_expected(cls, expected):
+        """
+        Serializes the values of the `expected` conditions, as `{type: value}`
+        """
+        attributes = cls.get_attributes()
+        conditions = {}
+        for name, condition in expected.items():
+            attr = attributes.get(name)
+            if attr is None:
+                raise ValueError("Unknown attribute '{0}'".format(name))
+            condition = dict(condition)
+            if VALUE in condition:
+                condition[VALUE] = {ATTR_TYPE_MAP[attr.attr_type]: attr.serialize(condition[VALUE])}
+            conditions[name] = condition
+        return conditions
+
+    def _clear_changes(self):
+        """
+        Stops tracking changes, once this object was saved
+        """
+        if self._changed_attributes is not None:
+            self._changed_attributes = None
+
+    def _discard_changes(self, names):
+        """
+        Stops tracking the changes of `names`, whose values were read from dynamodb
+        """
+        if self._changed_attributes:
+            self._changed_attributes.difference_update(names)
+
     def get_keys(self):
         """
         Returns the proper arguments for deleting
         """
-        serialized = self.serialize()
-        hash_key = serialized.get(HASH)
-        range_key = serialized.get(RANGE, None)
-        hash_keyname = self.get_meta_data().hash_keyname
-        range_keyname = self.get_meta_data().range_keyname
+        hash_key, range_key, _ = self._serialize(attributes=False)
+        hash_field, range_field, _ = self._get_serializer()
         attrs = {
-            hash_keyname: hash_key,
-            range_keyname: range_key
+            hash_field[0]: hash_key,
+            range_field[0] if range_field else None: range_key
         }
         return attrs
 
@@ -420,15 +913,15 @@ class Model(with_metaclass(MetaModel)):
         :param attributes: If True, then attributes are included.
         :param null_check: If True, then attributes are checked for null.
         """
+        if attributes:
+            self._check_full_item()
         kwargs = {}
-        serialized = self.serialize(null_check=null_check)
-        hash_key = serialized.get(HASH)
-        range_key = serialized.get(RANGE, None)
+        hash_key, range_key, attribute_map = self._serialize(attributes=attributes, null_check=null_check)
         args = (hash_key, )
         if range_key:
             kwargs[pythonic(RANGE_KEY)] = range_key
         if attributes:
-            kwargs[pythonic(ATTRIBUTES)] = serialized[pythonic(ATTRIBUTES)]
+            kwargs[pythonic(ATTRIBUTES)] = attribute_map
         return args, kwargs
 
     def refresh(self, consistent_read=False):
@@ -445,6 +938,17 @@ class Model(with_metaclass(MetaModel)):
         if item_data is None:
             raise self.DoesNotExist("This item does not exist in the table.")
         self.deserialize(item_data)
+        if self._projection is not None:
+            self._projection = None
+
+    def arefresh(self, consistent_read=False):
+        """
+        Retrieves this object's data from dynamodb, as a coroutine (Python 3.5+)
+
+        :param consistent_read: If True, then a consistent read is performed.
+        """
+        aio = _import_async_module('pynamodb.aio')
+        return aio.refresh(self, consistent_read=consistent_read)
 
     def deserialize(self, attrs):
         """
@@ -459,6 +963,7 @@ class Model(with_metaclass(MetaModel)):
                 value = attr.get(attr_type, None)
                 if value:
                     setattr(self, name, attr_instance.deserialize(value))
+        self._discard_changes(attrs)
 
     def serialize(self, attr_map=False, null_check=True):
         """
@@ -468,31 +973,72 @@ class Model(with_metaclass(MetaModel)):
         :param null_check: If True, then attributes are checked for null
         """
         attributes = pythonic(ATTRIBUTES)
-        attrs = {attributes: {}}
-        for name, attr in self.get_attributes().items():
-            value = getattr(self, name)
+        hash_key, range_key, attribute_map = self._serialize(null_check=null_check)
+        attrs = {attributes: attribute_map}
+        if attr_map:
+            hash_field, range_field, _ = self._get_serializer()
+            for field, serialized in [(hash_field, hash_key), (range_field, range_key)]:
+                if serialized is not None:
+                    attribute_map[field[0]] = {field[1]: serialized}
+        else:
+            if hash_key is not None:
+                attrs[HASH] = hash_key
+            if range_key is not None:
+                attrs[RANGE] = range_key
+        return attrs
+
+    def _serialize(self, attributes=True, null_check=True):
+        """
+        Returns the serialized hash key, range key and attribute map of this object
+
+        :param attributes: If False, only the keys are serialized, and the attribute map is None
+        :param null_check: If True, then attributes are checked for null
+        """
+        hash_field, range_field, fields = self._get_serializer()
+        values = self.attribute_values
+        hash_key = _serialize_field(hash_field, values, null_check)
+        range_key = _serialize_field(range_field, values, null_check)
+        if not attributes:
+            return hash_key, range_key, None
+        attribute_map = {}
+        for name, attr_type, serialize, null in fields:
+            value = values.get(name)
             if value is None:
-                if attr.null:
+                if null:
                     continue
                 elif null_check:
                     raise ValueError("Attribute '{0}' cannot be None".format(name))
-            serialized = attr.serialize(value)
-            if serialized is None:
-                continue
-            if attr_map:
-                attrs[attributes][name] = {
-                    ATTR_TYPE_MAP[attr.attr_type]: serialized
-                }
+            serialized = serialize(value)
+            if serialized is not None:
+                attribute_map[name] = {attr_type: serialized}
+        return hash_key, range_key, attribute_map
+
+    @classmethod
+    def _get_serializer(cls):
+        """
+        Returns the serialization plan of this class
+
+        The plan is a `(hash_field, range_field, fields)` tuple, where each field is a
+        `(name, attr_type, serialize, null)` tuple, and `range_field` is None without a range key.
+        """
+        return cls._serializer
+
+    @classmethod
+    def _build_serializer(cls):
+        """
+        Returns the serialization plan of this class
+        """
+        hash_field = range_field = None
+        fields = []
+        for name, attr in cls.get_attributes().items():
+            field = (name, ATTR_TYPE_MAP[attr.attr_type], attr.serialize, attr.null)
+            if attr.is_hash_key:
+                hash_field = field
+            elif attr.is_range_key:
+                range_field = field
             else:
-                if attr.is_hash_key:
-                    attrs[HASH] = serialized
-                elif attr.is_range_key:
-                    attrs[RANGE] = serialized
-                else:
-                    attrs[attributes][name] = {
-                        ATTR_TYPE_MAP[attr.attr_type]: serialized
-                    }
-        return attrs
+                fields.append(field)
+        return hash_field, range_field, tuple(fields)
 
     @classmethod
     def serialize_keys(cls, hash_key, range_key=None):
@@ -502,20 +1048,20 @@ class Model(with_metaclass(MetaModel)):
         :param hash_key: The hash key value
         :param range_key: The range key value
         """
-        hash_key = cls.hash_key_attribute().serialize(hash_key)
+        hash_field, range_field, _ = cls._get_serializer()
+        hash_key = hash_field[2](hash_key)
         if range_key:
-            range_key = cls.range_key_attribute().serialize(range_key)
+            range_key = range_field[2](range_key)
         return hash_key, range_key
 
     @classmethod
     def range_key_attribute(cls):
         """
-        Returns the attribute class for the hash key
+        Returns the attribute class for the range key
         """
-        attributes = cls.get_attributes()
-        range_keyname = cls.get_meta_data().range_keyname
-        if range_keyname:
-            attr = attributes[range_keyname]
+        range_field = cls._get_serializer()[1]
+        if range_field:
+            attr = cls.get_attributes()[range_field[0]]
         else:
             attr = None
         return attr
@@ -525,34 +1071,53 @@ class Model(with_metaclass(MetaModel)):
         """
         Returns the attribute class for the hash key
         """
-        attributes = cls.get_attributes()
-        hash_keyname = cls.get_meta_data().hash_keyname
-        return attributes[hash_keyname]
+        return cls.get_attributes()[cls._get_serializer()[0][0]]
 
     @classmethod
     def get(cls,
             hash_key,
             range_key=None,
-            consistent_read=False):
+            consistent_read=False,
+            attributes_to_get=None):
         """
         Returns a single object using the provided keys
 
         :param hash_key: The hash key of the desired item
         :param range_key: The range key of the desired item, only used when appropriate.
+        :param attributes_to_get: If set, only these attributes and the keys of the table are read,
+            and a partial instance is returned
         """
+        projection = cls._get_projection(attributes_to_get)
         hash_key, range_key = cls.serialize_keys(hash_key, range_key)
         data = cls.get_connection().get_item(
             hash_key,
             range_key=range_key,
-            consistent_read=consistent_read
+            consistent_read=consistent_read,
+            attributes_to_get=sorted(projection) if projection else None
         )
         cls.throttle.add_record(data.get(CONSUMED_CAPACITY))
         item_data = data.get(ITEM)
         if item_data:
-            return cls.from_raw_data(item_data)
+            if projection is None:
+                return cls.from_raw_data(item_data)
+            return cls._get_item_loader(projection=projection)(item_data)
         else:
             raise cls.DoesNotExist()
 
+    @classmethod
+    def aget(cls,
+             hash_key,
+             range_key=None,
+             consistent_read=False):
+        """
+        Returns a single object using the provided keys, as a coroutine (Python 3.5+)
+
+        :param hash_key: The hash key of the desired item
+        :param range_key: The range key of the desired item, only used when appropriate.
+        """
+        aio = _import_async_module('pynamodb.aio')
+        return aio.get(cls, hash_key, range_key=range_key, consistent_read=consistent_read)
+
     @classmethod
     def from_raw_data(cls, data):
         """
@@ -561,83 +1126,255 @@ class Model(with_metaclass(MetaModel)):
 
         :param data: A serialized DynamoDB object
         """
-        mutable_data = copy.copy(data)
-        if mutable_data is None:
+        if data is None:
             raise ValueError("Received no mutable_data to construct object")
-        hash_keyname = cls.get_meta_data().hash_keyname
-        range_keyname = cls.get_meta_data().range_keyname
-        hash_key_type = cls.get_meta_data().get_attribute_type(hash_keyname)
-        hash_key = mutable_data.pop(hash_keyname).get(hash_key_type)
-        hash_key_attr = cls.get_attributes().get(hash_keyname)
-        hash_key = hash_key_attr.deserialize(hash_key)
-        args = (hash_key,)
-        kwargs = {}
-        if range_keyname:
-            range_key_attr = cls.get_attributes().get(range_keyname)
-            range_key_type = cls.get_meta_data().get_attribute_type(range_keyname)
-            range_key = mutable_data.pop(range_keyname).get(range_key_type)
-            kwargs['range_key'] = range_key_attr.deserialize(range_key)
-        for name, value in mutable_data.items():
-            attr = cls.get_attributes().get(name, None)
-            if attr:
-                kwargs[name] = attr.deserialize(value.get(ATTR_TYPE_MAP[attr.attr_type]))
-        return cls(*args, **kwargs)
+        return cls._get_deserializer()(data)
 
     @classmethod
-    def get_indexes(cls):
+    def _get_deserializer(cls):
         """
-        Returns a list of the secondary indexes
+        Returns the deserializer of this class
         """
-        if cls.indexes is None:
-            cls.indexes = {
-                pythonic(GLOBAL_SECONDARY_INDEXES): [],
-                pythonic(LOCAL_SECONDARY_INDEXES): [],
-                pythonic(ATTR_DEFINITIONS): []
-            }
-            cls.index_classes = {}
-            for item in dir(cls):
-                item_cls = getattr(getattr(cls, item), "__class__", None)
-                if item_cls is None:
-                    continue
-                if issubclass(item_cls, (Index, )):
-                    item_cls = getattr(cls, item)
-                    cls.index_classes[item] = item_cls
-                    schema = item_cls.get_schema()
-                    idx = {
-                        pythonic(INDEX_NAME): item,
-                        pythonic(KEY_SCHEMA): schema.get(pythonic(KEY_SCHEMA)),
-                        pythonic(PROJECTION): {
-                            PROJECTION_TYPE: item_cls.Meta.projection.projection_type,
-                        },
+        return cls._deserializer
 
-                    }
-                    if issubclass(item_cls.__class__, GlobalSecondaryIndex):
-                        idx[pythonic(PROVISIONED_THROUGHPUT)] = {
-                            READ_CAPACITY_UNITS: item_cls.Meta.read_capacity_units,
-                            WRITE_CAPACITY_UNITS: item_cls.Meta.write_capacity_units
-                        }
-                    cls.indexes[pythonic(ATTR_DEFINITIONS)].extend(schema.get(pythonic(ATTR_DEFINITIONS)))
-                    if item_cls.Meta.projection.non_key_attributes:
-                        idx[pythonic(PROJECTION)][NON_KEY_ATTRIBUTES] = item_cls.Meta.projection.non_key_attributes
-                    if issubclass(item_cls.__class__, GlobalSecondaryIndex):
-                        cls.indexes[pythonic(GLOBAL_SECONDARY_INDEXES)].append(idx)
+    @classmethod
+    def _build_deserializer(cls, as_dict=False):
+        """
+        Returns a function that builds an instance of this class from a serialized DynamoDB object
+
+        The attribute types and deserializers are resolved once, so the function only has to
+        deserialize each value into the instance's attribute values. Attributes that don't
+        need deserializing are stored as they are, and defaults only apply to missing attributes.
+        Lazy instances keep the raw item instead, and only get the defaults. The function takes
+        an optional `defaults` argument, which is False for partial items.
+
+        :param as_dict: If True, the function returns the dictionary of attribute values instead
+        """
+        identity = six.get_unbound_function(Attribute.deserialize)
+        fields = {}
+        defaults = []
+        for name, attr in cls.get_attributes().items():
+            deserialize = attr.deserialize
+            if six.get_unbound_function(type(attr).deserialize) is identity:
+                deserialize = None
+            fields[name] = (ATTR_TYPE_MAP[attr.attr_type], deserialize)
+            if attr.default is not None:
+                defaults.append((name, attr.default))
+
+        def set_defaults(attribute_values, data):
+            for name, default in defaults:
+                if name not in data:
+                    value = default() if callable(default) else default
+                    if value is not None:
+                        attribute_values[name] = value
+
+        def dict_deserializer(data, defaults=True):
+            attribute_values = {}
+            for name, value in six.iteritems(data):
+                field = fields.get(name)
+                if field is not None:
+                    attr_type, deserialize = field
+                    if deserialize is None:
+                        attribute_values[name] = value.get(attr_type)
                     else:
-                        cls.indexes[pythonic(LOCAL_SECONDARY_INDEXES)].append(idx)
+                        attribute_values[name] = deserialize(value.get(attr_type))
+            if defaults:
+                set_defaults(attribute_values, attribute_values)
+            return attribute_values
+
+        def deserializer(data, defaults=True):
+            item = cls.__new__(cls)
+            item.attribute_values = dict_deserializer(data, defaults)
+            return item
+
+        def lazy_deserializer(data, defaults=True):
+            attribute_values = {}
+            if defaults:
+                set_defaults(attribute_values, data)
+            item = cls.__new__(cls)
+            item.attribute_values = attribute_values
+            item._raw_item = data
+            return item
+        if as_dict:
+            return dict_deserializer
+        return lazy_deserializer if cls._lazy_class else deserializer
+
+    @classmethod
+    def _iter_items(cls, pages, raw=False, as_dict=False, projection=None):
+        """
+        Returns an iterator over the items of `pages`, which are lists of serialized DynamoDB objects
+
+        :param raw: If True, the serialized DynamoDB objects are returned as they are
+        :param as_dict: If True, dictionaries of attribute values are returned instead of instances
+        :param projection: The names of the attributes that were requested, if not all of them
+        """
+        items = itertools.chain.from_iterable(pages)
+        if raw:
+            if as_dict:
+                raise ValueError("raw and as_dict cannot both be set")
+            return items
+        return six.moves.map(cls._get_item_loader(as_dict=as_dict, projection=projection), items)
+
+    @classmethod
+    def _get_item_loader(cls, as_dict=False, projection=None):
+        """
+        Returns a function that builds an instance, or a dictionary of attribute values,
+        from a serialized DynamoDB object
+
+        Items read with a `projection` don't get default values, and instances are marked as partial.
+
+        :param as_dict: If True, dictionaries of attribute values are returned instead of instances
+        :param projection: The names of the attributes that were requested, if not all of them
+        """
+        deserialize = cls._dict_deserializer if as_dict else cls._get_deserializer()
+        if projection is None:
+            return deserialize
+        if as_dict:
+            return lambda data: deserialize(data, False)
+
+        def load_partial(data):
+            item = deserialize(data, False)
+            item._projection = projection
+            return item
+        return load_partial
+
+    @classmethod
+    def _get_projection(cls, attributes_to_get):
+        """
+        Returns the names of the attributes to get, with the keys of the table, or None to get all of them
+
+        :param attributes_to_get: The names of the attributes to get, or None
+        """
+        if attributes_to_get is None:
+            return None
+        attributes = cls.get_attributes()
+        for name in attributes_to_get:
+            if name not in attributes:
+                raise ValueError("Unknown attribute '{0}'".format(name))
+        hash_field, range_field, _ = cls._get_serializer()
+        projection = set(attributes_to_get)
+        projection.add(hash_field[0])
+        if range_field is not None:
+            projection.add(range_field[0])
+        if len(projection) == len(attributes):
+            return None
+        return frozenset(projection)
+
+    @classmethod
+    def _build_instance_class(cls, compact, lazy):
+        """
+        Returns a subclass of this class for the instances read from DynamoDB
+
+        If `compact` is set, instances store their attribute values in slots instead of a dictionary,
+        and `attribute_values` returns a copy of their values. If `lazy` is set, instances keep the
+        raw item they are read from, and deserialize each attribute when it is first accessed, or when
+        `attribute_values` is read. Assigning `attribute_values` replaces all the values.
+        """
+        attributes = cls.get_attributes()
+        if compact:
+            slots = [(name, '_{0}_value'.format(name)) for name in attributes]
+
+            def get_attribute_values(self):
+                if lazy and self._raw_item is not None:
+                    for name in attributes:
+                        getattr(self, name)
+                    self._raw_item = None
+                values = {}
+                for name, slot_name in slots:
+                    try:
+                        values[name] = getattr(self, slot_name)
+                    except AttributeError:
+                        pass
+                return values
+
+            def set_attribute_values(self, values):
+                for name, slot_name in slots:
+                    if name in values:
+                        setattr(self, slot_name, values[name])
+                    elif hasattr(self, slot_name):
+                        delattr(self, slot_name)
+                if lazy:
+                    self._raw_item = None
+            slot_names = [slot_name for _, slot_name in slots]
+        else:
+            def get_attribute_values(self):
+                if self._raw_item is not None:
+                    for name in attributes:
+                        getattr(self, name)
+                    self._raw_item = None
+                return self._attribute_values
+
+            def set_attribute_values(self, values):
+                self._attribute_values = values
+                self._raw_item = None
+            slot_names = ['_attribute_values']
+        if lazy:
+            slot_names.append('_raw_item')
+
+        instance_class = type(cls)(cls.__name__, (cls,), {
+            '__module__': cls.__module__,
+            '__doc__': cls.__doc__,
+            '__slots__': tuple(slot_names),
+            META_CLASS_NAME: cls.Meta,
+            '_compact_class': compact,
+            '_lazy_class': lazy,
+            '_model_class': cls,
+            'attribute_values': property(get_attribute_values, set_attribute_values)
+        })
+        for name, attribute in attributes.items():
+            if compact:
+                descriptor = SlotAttribute(attribute, name, instance_class.__dict__[dict(slots)[name]], lazy)
+            else:
+                descriptor = LazyAttribute(attribute, name)
+            setattr(instance_class, name, descriptor)
+        return instance_class
+
+    @classmethod
+    def get_indexes(cls):
+        """
+        Returns a list of the secondary indexes
+        """
         return cls.indexes
 
+    @classmethod
+    def _build_indexes(cls):
+        """
+        Returns the schema of the secondary indexes, built from the index registry
+        """
+        indexes = {
+            pythonic(GLOBAL_SECONDARY_INDEXES): [],
+            pythonic(LOCAL_SECONDARY_INDEXES): [],
+            pythonic(ATTR_DEFINITIONS): []
+        }
+        for name, index in cls.index_classes.items():
+            schema = index.get_schema()
+            idx = {
+                pythonic(INDEX_NAME): name,
+                pythonic(KEY_SCHEMA): schema.get(pythonic(KEY_SCHEMA)),
+                pythonic(PROJECTION): {
+                    PROJECTION_TYPE: index.Meta.projection.projection_type,
+                },
+
+            }
+            if isinstance(index, GlobalSecondaryIndex):
+                idx[pythonic(PROVISIONED_THROUGHPUT)] = {
+                    READ_CAPACITY_UNITS: index.Meta.read_capacity_units,
+                    WRITE_CAPACITY_UNITS: index.Meta.write_capacity_units
+                }
+            indexes[pythonic(ATTR_DEFINITIONS)].extend(schema.get(pythonic(ATTR_DEFINITIONS)))
+            if index.Meta.projection.non_key_attributes:
+                idx[pythonic(PROJECTION)][NON_KEY_ATTRIBUTES] = index.Meta.projection.non_key_attributes
+            if isinstance(index, GlobalSecondaryIndex):
+                indexes[pythonic(GLOBAL_SECONDARY_INDEXES)].append(idx)
+            else:
+                indexes[pythonic(LOCAL_SECONDARY_INDEXES)].append(idx)
+        return indexes
+
     @classmethod
     def get_attributes(cls):
         """
-        Returns the list of attributes for this class
+        Returns the attributes of this class, keyed by name
         """
-        if cls.attributes is None:
-            cls.attributes = {}
-            for item in dir(cls):
-                item_cls = getattr(getattr(cls, item), "__class__", None)
-                if item_cls is None:
-                    continue
-                if issubclass(item_cls, (Attribute, )):
-                    cls.attributes[item] = getattr(cls, item)
         return cls.attributes
 
     @classmethod
@@ -706,6 +1443,10 @@ class Model(with_metaclass(MetaModel)):
               index_name=None,
               scan_index_forward=None,
               limit=None,
+              prefetch=None,
+              raw=False,
+              as_dict=False,
+              attributes_to_get=None,
               **filters):
         """
         Provides a high level query API
@@ -715,47 +1456,106 @@ class Model(with_metaclass(MetaModel)):
         :param index_name: If set, then this index is used
         :param scan_index_forward: If set, then used to specify the same parameter to the DynamoDB API.
             Controls descending or ascending results
-        """
-        cls.get_indexes()
-        if index_name:
-            hash_key = cls.index_classes[index_name].hash_key_attribute().serialize(hash_key)
-        else:
-            hash_key = cls.serialize_keys(hash_key)[0]
+        :param prefetch: If set, up to this number of pages are fetched ahead by a background thread,
+            while the items of the current page are iterated
+        :param raw: If True, the serialized DynamoDB objects are yielded without deserializing them
+        :param as_dict: If True, dictionaries of deserialized attribute values are yielded instead of instances
+        :param attributes_to_get: If set, only these attributes and the keys of the table are read,
+            and partial instances are returned
+        """
+        projection = cls._get_projection(attributes_to_get)
+        hash_key = cls._serialize_hash_key(hash_key, index_name)
         key_conditions = cls._build_filters(QUERY_OPERATOR_MAP, filters)
-        log.debug("Fetching first query page")
-        data = cls.get_connection().query(
+        pages = cls._query_pages(
             hash_key,
+            key_conditions,
             index_name=index_name,
             consistent_read=consistent_read,
             scan_index_forward=scan_index_forward,
             limit=limit,
-            key_conditions=key_conditions
+            attributes_to_get=sorted(projection) if projection else None
+        )
+        if prefetch:
+            pages = prefetch_pages(pages, prefetch)
+        pages = six.moves.map(_get_items, pages)
+        for item in cls._iter_items(pages, raw=raw, as_dict=as_dict, projection=projection):
+            yield item
+
+    @classmethod
+    def _serialize_hash_key(cls, hash_key, index_name=None):
+        """
+        Serializes the hash key of a query
+
+        :param hash_key: The hash key to query
+        :param index_name: If set, the hash key of this index is serialized
+        """
+        if index_name:
+            return cls.index_classes[index_name].hash_key_attribute().serialize(hash_key)
+        return cls.serialize_keys(hash_key)[0]
+
+    @classmethod
+    def _query_pages(cls, hash_key, key_conditions, **kwargs):
+        """
+        Yields the response of each page of a query
+
+        :param hash_key: The serialized hash key to query
+        :param key_conditions: The key conditions built from the filters of the query
+        :param kwargs: The other arguments of the query
+        """
+        log.debug("Fetching first query page")
+        data = cls.get_connection().query(
+            hash_key,
+            key_conditions=key_conditions,
+            **kwargs
         )
         cls.throttle.add_record(data.get(CONSUMED_CAPACITY))
         last_evaluated_key = data.get(LAST_EVALUATED_KEY, None)
-        for item in data.get(ITEMS):
-            yield cls.from_raw_data(item)
+        yield data
         while last_evaluated_key:
-            log.debug("Fetching query page with exclusive start key: {0}".format(last_evaluated_key))
+            log.debug("Fetching query page with exclusive start key: %s", last_evaluated_key)
             data = cls.get_connection().query(
                 hash_key,
                 exclusive_start_key=last_evaluated_key,
-                index_name=index_name,
-                consistent_read=consistent_read,
-                scan_index_forward=scan_index_forward,
-                limit=limit,
-                key_conditions=key_conditions
+                key_conditions=key_conditions,
+                **kwargs
             )
             cls.throttle.add_record(data.get(CONSUMED_CAPACITY))
-            for item in data.get(ITEMS):
-                yield cls.from_raw_data(item)
+            yield data
             last_evaluated_key = data.get(LAST_EVALUATED_KEY, None)
 
+    @classmethod
+    def aquery(cls,
+               hash_key,
+               consistent_read=False,
+               index_name=None,
+               scan_index_forward=None,
+               limit=None,
+               **filters):
+        """
+        Provides a high level query API for use with `async for` (Python 3.5+)
+
+        Takes the same arguments as `query`, except `prefetch`, `raw`, `as_dict` and `attributes_to_get`
+        """
+        aio = _import_async_module('pynamodb.aio')
+        return aio.QueryIterator(
+            cls,
+            hash_key=hash_key,
+            consistent_read=consistent_read,
+            index_name=index_name,
+            scan_index_forward=scan_index_forward,
+            limit=limit,
+            **filters
+        )
+
     @classmethod
     def scan(cls,
              segment=None,
              total_segments=None,
              limit=None,
+             prefetch=None,
+             raw=False,
+             as_dict=False,
+             attributes_to_get=None,
              **filters):
         """
         Iterates through all items in the table
@@ -763,33 +1563,180 @@ class Model(with_metaclass(MetaModel)):
         :param segment: If set, then scans the segment
         :param total_segments: If set, then specifies total segments
         :param limit: Used to limit the number of results returned
+        :param prefetch: If set, up to this number of pages are fetched ahead by a background thread,
+            while the items of the current page are iterated
+        :param raw: If True, the serialized DynamoDB objects are yielded without deserializing them
+        :param as_dict: If True, dictionaries of deserialized attribute values are yielded instead of instances
+        :param attributes_to_get: If set, only these attributes and the keys of the table are read,
+            and partial instances are returned
         :param filters: A list of item filters
         """
+        projection = cls._get_projection(attributes_to_get)
         scan_filter = cls._build_filters(SCAN_OPERATOR_MAP, filters)
-        data = cls.get_connection().scan(
+        pages = cls._scan_pages(
+            scan_filter,
             segment=segment,
+            total_segments=total_segments,
             limit=limit,
+            attributes_to_get=sorted(projection) if projection else None
+        )
+        if prefetch:
+            pages = prefetch_pages(pages, prefetch)
+        pages = six.moves.map(_get_items, pages)
+        for item in cls._iter_items(pages, raw=raw, as_dict=as_dict, projection=projection):
+            yield item
+
+    @classmethod
+    def parallel_scan(cls,
+                      total_segments,
+                      workers=None,
+                      limit=None,
+                      buffer_size=None,
+                      raw=False,
+                      as_dict=False,
+                      attributes_to_get=None,
+                      **filters):
+        """
+        Iterates through all items in the table, scanning its segments concurrently
+
+        Items are yielded as soon as their page is fetched. Once `buffer_size` pages wait to be
+        iterated, scanning pauses until they are. The first error raised by a segment is raised
+        here, and the other segments stop, as they do when the iterator is closed.
+
+        :param total_segments: The number of segments the table is divided in
+        :param workers: The number of segments scanned at once, defaults to `total_segments`
+        :param limit: Used to limit the number of results returned by each request
+        :param buffer_size: The maximum number of pages waiting to be iterated,
+            defaults to twice the number of workers
+        :param raw: If True, the serialized DynamoDB objects are yielded without deserializing them
+        :param as_dict: If True, dictionaries of deserialized attribute values are yielded instead of instances
+        :param attributes_to_get: If set, only these attributes and the keys of the table are read,
+            and partial instances are returned
+        :param filters: A list of item filters
+        """
+        projection = cls._get_projection(attributes_to_get)
+        scan_filter = cls._build_filters(SCAN_OPERATOR_MAP, filters)
+
+        def scan_segment(segment):
+            return cls._scan_pages(
+                scan_filter,
+                segment=segment,
+                total_segments=total_segments,
+                limit=limit,
+                attributes_to_get=sorted(projection) if projection else None
+            )
+
+        pages = chain_concurrently(
+            scan_segment,
+            range(total_segments),
+            workers or total_segments,
+            buffer_size=buffer_size
+        )
+        pages = six.moves.map(_get_items, pages)
+        for item in cls._iter_items(pages, raw=raw, as_dict=as_dict, projection=projection):
+            yield item
+
+    @classmethod
+    def _scan_pages(cls, scan_filter, **kwargs):
+        """
+        Yields the response of each page of a scan
+
+        :param scan_filter: The scan filter built from the filters of the scan
+        :param kwargs: The other arguments of the scan
+        """
+        data = cls.get_connection().scan(
             scan_filter=scan_filter,
-            total_segments=total_segments
+            **kwargs
         )
         log.debug("Fetching first scan page")
         last_evaluated_key = data.get(LAST_EVALUATED_KEY, None)
         cls.throttle.add_record(data.get(CONSUMED_CAPACITY))
-        for item in data.get(ITEMS):
-            yield cls.from_raw_data(item)
+        yield data
         while last_evaluated_key:
-            log.debug("Fetching scan page with exclusive start key: {0}".format(last_evaluated_key))
+            log.debug("Fetching scan page with exclusive start key: %s", last_evaluated_key)
             data = cls.get_connection().scan(
                 exclusive_start_key=last_evaluated_key,
-                limit=limit,
                 scan_filter=scan_filter,
-                segment=segment,
-                total_segments=total_segments
+                **kwargs
             )
-            for item in data.get(ITEMS):
-                yield cls.from_raw_data(item)
+            cls.throttle.add_record(data.get(CONSUMED_CAPACITY))
+            yield data
             last_evaluated_key = data.get(LAST_EVALUATED_KEY, None)
 
+    @classmethod
+    def count(cls,
+              hash_key=None,
+              consistent_read=False,
+              index_name=None,
+              total_segments=None,
+              workers=None,
+              **filters):
+        """
+        Returns the number of items that match the filters, without reading them
+
+        The items are queried, or scanned, with the COUNT select, and the counts of every page
+        are summed. The result is an `ItemCount`, an int that also has the number of scanned
+        items and the consumed read capacity units.
+
+        :param hash_key: If set, the items with this hash key are counted with a query,
+            otherwise every item of the table is counted with a scan
+        :param consistent_read: If True, a consistent read is performed by the query
+        :param index_name: If set, then this index is queried
+        :param total_segments: If set, the table is scanned in this number of segments, concurrently
+        :param workers: The number of segments scanned at once, defaults to `total_segments`
+        :param filters: Query filters if `hash_key` is set, otherwise scan filters
+        """
+        if hash_key is None:
+            if index_name:
+                raise ValueError("Counting the items of an index requires a hash key")
+            scan_filter = cls._build_filters(SCAN_OPERATOR_MAP, filters)
+            if total_segments:
+                def scan_segment(segment):
+                    return cls._scan_pages(scan_filter, segment=segment, total_segments=total_segments, select=COUNT)
+                pages = chain_concurrently(scan_segment, range(total_segments), workers or total_segments)
+            else:
+                pages = cls._scan_pages(scan_filter, select=COUNT)
+        else:
+            if total_segments:
+                raise ValueError("Segments can only be used to count every item of the table")
+            hash_key = cls._serialize_hash_key(hash_key, index_name)
+            key_conditions = cls._build_filters(QUERY_OPERATOR_MAP, filters)
+            pages = cls._query_pages(
+                hash_key,
+                key_conditions,
+                index_name=index_name,
+                consistent_read=consistent_read,
+                select=COUNT
+            )
+        count = 0
+        scanned_count = 0
+        consumed_capacity = 0
+        for data in pages:
+            count += data.get(CAMEL_COUNT, 0)
+            scanned_count += data.get(SCANNED_COUNT, 0)
+            consumed_capacity += (data.get(CONSUMED_CAPACITY) or {}).get(CAPACITY_UNITS, 0)
+        return ItemCount(count, scanned_count, consumed_capacity)
+
+    @classmethod
+    def ascan(cls,
+              segment=None,
+              total_segments=None,
+              limit=None,
+              **filters):
+        """
+        Iterates through all items in the table, for use with `async for` (Python 3.5+)
+
+        Takes the same arguments as `scan`, except `prefetch`, `raw`, `as_dict` and `attributes_to_get`
+        """
+        aio = _import_async_module('pynamodb.aio')
+        return aio.ScanIterator(
+            cls,
+            segment=segment,
+            total_segments=total_segments,
+            limit=limit,
+            **filters
+        )
+
     @classmethod
     def exists(cls):
         """
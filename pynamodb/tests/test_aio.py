@@ -0,0 +1,209 @@
+"""
+Tests for the asyncio API
+"""
+import os
+import sys
+import json
+import threading
+from unittest import TestCase, skipIf
+
+import six
+from six.moves import BaseHTTPServer, socketserver
+
+from pynamodb.models import Model
+from pynamodb.connection.cache import MetaTableCache
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute
+from .data import MODEL_TABLE_DATA, GET_MODEL_ITEM_DATA
+
+if six.PY3:
+    from unittest.mock import patch
+else:
+    from mock import patch
+
+
+class FakeDynamoDBHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Answers DynamoDB requests with canned responses, over keep-alive connections
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        operation = self.headers['X-Amz-Target'].split('.')[-1]
+        self.server.requests.append((operation, json.loads(body.decode('utf-8'))))
+        if operation == 'DescribeTable':
+            data = MODEL_TABLE_DATA
+        elif operation == 'GetItem':
+            data = GET_MODEL_ITEM_DATA
+        elif operation in ('Query', 'Scan'):
+            data = {'Items': [GET_MODEL_ITEM_DATA['Item']], 'Count': 1}
+        else:
+            data = {}
+        content = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeDynamoDBServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), FakeDynamoDBHandler)
+        self.requests = []
+
+
+@skipIf(sys.version_info < (3, 5), "The asyncio API requires Python 3.5+")
+class AsyncModelTestCase(TestCase):
+    """
+    Tests for the asyncio model API
+    """
+
+    def setUp(self):
+        import asyncio
+        self.server = FakeDynamoDBServer()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.env = patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'foo', 'AWS_SECRET_ACCESS_KEY': 'bar'})
+        self.env.start()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        class AsyncUserModel(Model):
+            class Meta:
+                table_name = 'Thread'
+                host = 'http://127.0.0.1:{0}'.format(self.server.server_address[1])
+            user_name = UnicodeAttribute(hash_key=True)
+            user_id = UnicodeAttribute(range_key=True)
+            zip_code = NumberAttribute(null=True)
+            email = UnicodeAttribute(default='needs_email')
+
+        self.model = AsyncUserModel
+
+    def tearDown(self):
+        import asyncio
+        self.model.get_async_connection().connection.http_pool.close()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        self.env.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def collect(self, iterator):
+        """
+        Drains an asynchronous iterator
+        """
+        items = []
+        while True:
+            try:
+                items.append(self.loop.run_until_complete(iterator.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+    def test_get(self):
+        """
+        Model.aget
+        """
+        item = self.loop.run_until_complete(self.model.aget('foo', 'bar'))
+        self.assertEqual(item.user_name, 'foo')
+        self.assertEqual(item.user_id, 'bar')
+        self.assertEqual(item.zip_code, 88030)
+        operations = [operation for operation, _ in self.server.requests]
+        self.assertEqual(operations, ['DescribeTable', 'GetItem'])
+        self.assertEqual(self.server.requests[1][1]['Key'], {'user_name': {'S': 'foo'}, 'user_id': {'S': 'bar'}})
+
+    def test_meta_table_cache(self):
+        """
+        Models share the meta data cached by their connections
+        """
+        cache = MetaTableCache()
+        self.model.Meta.meta_table_cache = cache
+        self.loop.run_until_complete(self.model.aget('foo', 'bar'))
+        connection = self.model.get_async_connection().connection.connection
+        self.assertIsNotNone(cache.get_cached(connection._get_meta_table_cache_key('Thread')))
+
+        self.model.meta_table = None
+        connection._tables.clear()
+        self.loop.run_until_complete(self.model.aget('foo', 'bar'))
+        operations = [operation for operation, _ in self.server.requests]
+        self.assertEqual(operations, ['DescribeTable', 'GetItem', 'GetItem'])
+
+    def test_save_delete_refresh(self):
+        """
+        Model.asave, Model.adelete and Model.arefresh
+        """
+        item = self.model('foo', 'bar', zip_code=12345)
+        self.assertEqual(self.server.requests, [])
+        self.loop.run_until_complete(item.asave())
+        self.assertEqual([operation for operation, _ in self.server.requests], ['DescribeTable', 'PutItem'])
+        operation, params = self.server.requests[-1]
+        self.assertEqual(operation, 'PutItem')
+        self.assertEqual(params['Item']['zip_code'], {'N': '12345'})
+
+        self.loop.run_until_complete(item.arefresh(consistent_read=True))
+        operation, params = self.server.requests[-1]
+        self.assertEqual(operation, 'GetItem')
+        self.assertTrue(params['ConsistentRead'])
+        self.assertEqual(item.zip_code, 88030)
+
+        self.loop.run_until_complete(item.adelete())
+        operation, params = self.server.requests[-1]
+        self.assertEqual(operation, 'DeleteItem')
+        self.assertEqual(params['Key'], {'user_name': {'S': 'foo'}, 'user_id': {'S': 'bar'}})
+
+    def test_query_and_scan(self):
+        """
+        Model.aquery and Model.ascan
+        """
+        items = self.collect(self.model.aquery('foo', user_id__begins_with='b'))
+        self.assertEqual([item.user_id for item in items], ['bar'])
+        operation, params = self.server.requests[-1]
+        self.assertEqual(operation, 'Query')
+        self.assertEqual(params['KeyConditions']['user_id']['ComparisonOperator'], 'BEGINS_WITH')
+        self.assertEqual(params['KeyConditions']['user_name']['AttributeValueList'], [{'S': 'foo'}])
+
+        items = self.collect(self.model.ascan(zip_code__le=99999, limit=5))
+        self.assertEqual([item.user_name for item in items], ['foo'])
+        operation, params = self.server.requests[-1]
+        self.assertEqual(operation, 'Scan')
+        self.assertEqual(params['Limit'], 5)
+        self.assertEqual(params['ScanFilter']['zip_code']['ComparisonOperator'], 'LE')
+
+    def test_concurrent_requests_share_pool(self):
+        """
+        Concurrent requests reuse pooled connections
+        """
+        import asyncio
+        self.loop.run_until_complete(self.model.aget('foo', 'bar'))
+        self.loop.run_until_complete(asyncio.gather(*[self.model.aget('foo', 'bar') for _ in range(20)]))
+        stats = self.model.get_async_connection().get_pool_stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 22)
+        self.assertTrue(stats['hits'] >= 1)
+        self.assertTrue(stats['misses'] <= stats['max_pool_connections'])
+        self.assertTrue(stats['open_sockets'] <= stats['max_pool_connections'])
+
+
+class AsyncSupportTestCase(TestCase):
+    """
+    Tests for the asyncio API on older Python versions
+    """
+
+    def test_old_python(self):
+        """
+        The asyncio methods raise an ImportError before Python 3.5
+        """
+        class OldPythonModel(Model):
+            class Meta:
+                table_name = 'Thread'
+            user_name = UnicodeAttribute(hash_key=True)
+
+        with patch('pynamodb.models.sys') as mock_sys:
+            mock_sys.version_info = (2, 7, 6)
+            self.assertRaises(ImportError, OldPythonModel.get_async_connection)
+            self.assertRaises(ImportError, OldPythonModel.aget, 'foo')
@@ -321,3 +321,32 @@ class JSONAttributeTestCase(TestCase):
         item = {'foo': 'bar', 'bool': True, 'number': 3.141}
         encoded = six.u(json.dumps(item))
         self.assertEqual(attr.deserialize(encoded), item)
+
+
+class AttributeDescriptorTestCase(TestCase):
+    """
+    Tests the attribute descriptors
+    """
+    def test_descriptors_are_stateless(self):
+        """
+        Attribute.__set__ only stores values in the instance
+        """
+        class Item(object):
+            attr = UnicodeAttribute()
+            _changed_attributes = None
+
+            def __init__(self):
+                self.attribute_values = {}
+
+        Item.attr.attr_name = 'attr'
+        first, second = Item(), Item()
+        first.attr = 'first'
+        second.attr = 'second'
+        self.assertEqual(first.attr, 'first')
+        self.assertEqual(second.attr, 'second')
+        self.assertEqual(first.attribute_values, {'attr': 'first'})
+        self.assertIsInstance(Item.attr, UnicodeAttribute)
+        for attr_class in [BinarySetAttribute, BinaryAttribute, NumberSetAttribute, NumberAttribute,
+                           UnicodeAttribute, UnicodeSetAttribute, UTCDateTimeAttribute, BooleanAttribute,
+                           JSONAttribute]:
+            self.assertFalse(hasattr(attr_class(), '__dict__'))
@@ -1,14 +1,30 @@
 """
 Tests for the base connection class
 """
+import os
+import time
+import shutil
+import logging
+import tempfile
+import threading
 from unittest import TestCase
 
 import six
+from six.moves import BaseHTTPServer, socketserver
+from botocore.vendored.requests.sessions import Session
+from botocore.vendored.requests.exceptions import ConnectionError
 
 from pynamodb.connection import Connection
+from pynamodb.connection.base import MetaTable
+from pynamodb.connection.pool import PooledHTTPAdapter
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.connection.metrics import Histogram, InMemoryMetrics
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.connection.logger import RequestLogger, TruncatedPayload
+from pynamodb.connection.cache import MetaTableCache
 from pynamodb.exceptions import (
-    TableError, DeleteError, UpdateError, PutError, GetError, ScanError, QueryError)
-from pynamodb.constants import DEFAULT_REGION
+    PynamoDBConnectionError, TableError, DeleteError, UpdateError, PutError, GetError, ScanError, QueryError)
+from pynamodb.constants import DEFAULT_REGION, DEFAULT_MAX_RETRY_ATTEMPTS
 from .data import DESCRIBE_TABLE_DATA, GET_ITEM_DATA, LIST_TABLE_DATA
 
 
@@ -22,6 +38,88 @@ from .response import HttpBadRequest, HttpOK, HttpUnavailable
 PATCH_METHOD = 'botocore.operation.Operation.call'
 
 
+class KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    A local HTTP/1.1 handler that keeps connections alive
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadedHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    A local HTTP server that serves each connection in its own thread
+    """
+    daemon_threads = True
+
+
+class MetaTableTestCase(TestCase):
+    """
+    Tests for the meta table class
+    """
+
+    def setUp(self):
+        self.meta_table = MetaTable(DESCRIBE_TABLE_DATA.get('Table'))
+
+    def test_key_names(self):
+        """
+        MetaTable.hash_keyname, MetaTable.range_keyname
+        """
+        self.assertEqual(self.meta_table.hash_keyname, 'ForumName')
+        self.assertEqual(self.meta_table.range_keyname, 'Subject')
+        self.assertEqual(self.meta_table.get_index_hash_keyname('LastPostIndex'), 'ForumName')
+        self.assertIsNone(self.meta_table.get_index_hash_keyname('NoSuchIndex'))
+
+    def test_get_attribute_type(self):
+        """
+        MetaTable.get_attribute_type
+        """
+        self.assertEqual(self.meta_table.get_attribute_type('LastPostDateTime'), 'S')
+        self.assertRaises(ValueError, self.meta_table.get_attribute_type, 'missing')
+        self.assertEqual(
+            self.meta_table.get_identifier_map('foo', 'bar'),
+            {'key': {'ForumName': {'S': 'foo'}, 'Subject': {'S': 'bar'}}}
+        )
+
+    def test_request_template(self):
+        """
+        MetaTable.get_request_template
+        """
+        template = self.meta_table.get_request_template('ci-table', 'Query')
+        self.assertIs(template, self.meta_table.get_request_template('ci-table', 'Query'))
+        self.assertIsNot(template, self.meta_table.get_request_template('ci-table', 'Scan'))
+        self.assertEqual(template.get_kwargs(), {'table_name': 'ci-table', 'return_consumed_capacity': 'TOTAL'})
+        template.get_kwargs()['limit'] = 1
+        self.assertNotIn('limit', template.get_kwargs())
+        self.assertEqual(
+            template.get_key('foo', 'bar'),
+            {'ForumName': {'S': 'foo'}, 'Subject': {'S': 'bar'}}
+        )
+        self.assertEqual(
+            template.get_hash_key_condition('foo', index_name='LastPostIndex'),
+            ('ForumName', {'AttributeValueList': [{'S': 'foo'}], 'ComparisonOperator': 'EQ'})
+        )
+        self.assertRaises(ValueError, template.get_hash_key_condition, 'foo', index_name='NoSuchIndex')
+        batch_template = self.meta_table.get_request_template('ci-table', 'BatchGetItem')
+        self.assertEqual(batch_template.get_kwargs(), {'return_consumed_capacity': 'TOTAL'})
+
+    def test_empty_table(self):
+        """
+        MetaTable(None)
+        """
+        meta_table = MetaTable(None)
+        self.assertIsNone(meta_table.hash_keyname)
+        self.assertIsNone(meta_table.range_keyname)
+
+
 class ConnectionTestCase(TestCase):
     """
     Tests for the base connection class
@@ -42,6 +140,80 @@ class ConnectionTestCase(TestCase):
         self.assertIsNotNone(conn)
         self.assertEqual(repr(conn), "Connection<{0}>".format(conn.endpoint.host))
 
+    def test_cached_session(self):
+        """
+        Connection.session, Connection.service, Connection.endpoint
+        """
+        conn = Connection(host='foo-host')
+        self.assertIs(conn.session, conn.session)
+        self.assertIs(conn.service, conn.service)
+        endpoint = conn.endpoint
+        self.assertIs(endpoint, conn.endpoint)
+        self.assertEqual(endpoint.host, 'foo-host')
+
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpOK(), DESCRIBE_TABLE_DATA
+            conn.describe_table(self.test_table_name)
+            conn.describe_table(self.test_table_name)
+            self.assertIs(req.call_args_list[0][0][0], endpoint)
+            self.assertIs(req.call_args_list[1][0][0], endpoint)
+
+        session = conn.session
+        conn.refresh_session()
+        self.assertIsNot(session, conn.session)
+        self.assertIsNot(endpoint, conn.endpoint)
+
+    def test_connection_pool(self):
+        """
+        PooledHTTPAdapter
+        """
+        conn = Connection(max_pool_connections=3, pool_idle_timeout=60)
+        self.assertIs(conn.endpoint.http_session.get_adapter('https://foo'), conn.http_adapter)
+        self.assertEqual(conn.http_adapter.max_pool_connections, 3)
+        self.assertEqual(conn.http_adapter.idle_timeout, 60)
+        self.assertEqual(conn.get_pool_stats(), {'hits': 0, 'misses': 0, 'open_sockets': 0, 'max_pool_connections': 3})
+
+        server = ThreadedHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = 'http://127.0.0.1:{0}/'.format(server.server_address[1])
+        try:
+            adapter = PooledHTTPAdapter(max_pool_connections=2)
+            session = Session()
+            session.mount('http://', adapter)
+            for _ in range(3):
+                self.assertEqual(session.get(url).status_code, 200)
+            stats = adapter.get_stats()
+            self.assertEqual(stats['hits'], 2)
+            self.assertEqual(stats['misses'], 1)
+            self.assertEqual(stats['open_sockets'], 1)
+            started, finished = adapter.pop_send_times()
+            self.assertTrue(started <= finished)
+            self.assertIsNone(adapter.pop_send_times())
+
+            adapter.close_idle_connections()
+            self.assertEqual(adapter.get_stats()['open_sockets'], 0)
+            session.get(url)
+            self.assertEqual(adapter.get_stats()['misses'], 2)
+
+            adapter = PooledHTTPAdapter(idle_timeout=0)
+            session.mount('http://', adapter)
+            session.get(url)
+            session.get(url)
+            self.assertEqual(adapter.get_stats()['hits'], 0)
+            self.assertEqual(adapter.get_stats()['misses'], 2)
+
+            adapter = PooledHTTPAdapter(idle_timeout=60)
+            session.mount('http://', adapter)
+            session.get(url)
+            session.get(url)
+            self.assertEqual(adapter.get_stats()['hits'], 1)
+            self.assertEqual(adapter.get_stats()['misses'], 1)
+        finally:
+            server.shutdown()
+            server.server_close()
+
     def test_create_table(self):
         """
         Connection.create_table
@@ -290,7 +462,10 @@ class ConnectionTestCase(TestCase):
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpUnavailable(), None
             conn = Connection(self.region)
-            self.assertRaises(TableError, conn.describe_table, self.test_table_name)
+            with patch('time.sleep') as sleep:
+                self.assertRaises(TableError, conn.describe_table, self.test_table_name)
+            self.assertEqual(req.call_count, DEFAULT_MAX_RETRY_ATTEMPTS)
+            self.assertEqual(sleep.call_count, DEFAULT_MAX_RETRY_ATTEMPTS - 1)
 
     def test_list_tables(self):
         """
@@ -1294,6 +1469,20 @@ class ConnectionTestCase(TestCase):
             }
             self.assertEqual(req.call_args[1], params)
 
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpOK(), {}
+            conn.scan(
+                table_name,
+                select='count'
+            )
+            params = {
+                'return_consumed_capacity': 'TOTAL',
+                'table_name': table_name,
+                'select': 'COUNT'
+            }
+            self.assertEqual(req.call_args[1], params)
+        self.assertRaises(ValueError, conn.scan, table_name, select='bad')
+
         kwargs = {
             'scan_filter': {
                 'ForumName': {
@@ -1351,3 +1540,388 @@ class ConnectionTestCase(TestCase):
                 }
             }
             self.assertEqual(req.call_args[1], params)
+
+
+class RetryTestCase(TestCase):
+    """
+    Tests for retrying failed requests
+    """
+
+    def setUp(self):
+        self.attempts = []
+        self.conn = Connection(retry_policy=RetryPolicy(max_attempts=3, on_attempt=self.attempts.append))
+        self.conn._tables['ci-table'] = MetaTable(DESCRIBE_TABLE_DATA.get('Table'))
+        self.throttled = HttpBadRequest(), {
+            'Errors': [{'Code': 'ProvisionedThroughputExceededException', 'Message': 'Slow down'}]
+        }
+
+    def test_get_delay(self):
+        """
+        RetryPolicy.get_delay
+        """
+        policy = RetryPolicy(base_delay=0.1, max_delay=1)
+        for attempt in range(1, 10):
+            delay = policy.get_delay(attempt)
+            self.assertTrue(0 <= delay <= min(1, 0.1 * 2 ** (attempt - 1)))
+
+    def test_retry_throttled_request(self):
+        """
+        Connection.dispatch retries throttled requests
+        """
+        with patch(PATCH_METHOD) as req:
+            req.side_effect = [self.throttled, (HttpOK(), GET_ITEM_DATA)]
+            with patch('time.sleep') as sleep:
+                data = self.conn.get_item('ci-table', 'foo', 'bar')
+        self.assertEqual(data, GET_ITEM_DATA)
+        self.assertEqual(req.call_count, 2)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(
+            [(attempt['attempt'], attempt['error_code']) for attempt in self.attempts],
+            [(1, 'ProvisionedThroughputExceededException'), (2, None)]
+        )
+        stats = self.conn.get_retry_stats()
+        self.assertEqual(stats['attempts'], 2)
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['throttled'], 1)
+
+    def test_retries_exhausted(self):
+        """
+        Errors are raised with a retryable flag once all attempts failed
+        """
+        with patch(PATCH_METHOD) as req:
+            req.return_value = self.throttled
+            with patch('time.sleep'):
+                with self.assertRaises(GetError) as context:
+                    self.conn.get_item('ci-table', 'foo', 'bar')
+        self.assertTrue(context.exception.retryable)
+        self.assertEqual(req.call_count, 3)
+        self.assertEqual(self.conn.get_retry_stats()['exhausted'], 1)
+
+        with patch(PATCH_METHOD) as req:
+            req.side_effect = ConnectionError('Connection reset by peer')
+            with patch('time.sleep'):
+                with self.assertRaises(PynamoDBConnectionError) as context:
+                    self.conn.get_item('ci-table', 'foo', 'bar')
+        self.assertTrue(context.exception.retryable)
+        self.assertEqual(req.call_count, 3)
+        self.assertEqual(self.conn.get_retry_stats()['socket_errors'], 3)
+
+    def test_errors_not_retried(self):
+        """
+        Client errors are not retried
+        """
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpBadRequest(), {'Errors': [{'Code': 'ValidationException'}]}
+            with patch('time.sleep') as sleep:
+                with self.assertRaises(PutError) as context:
+                    self.conn.put_item('ci-table', 'foo', 'bar')
+        self.assertFalse(context.exception.retryable)
+        self.assertEqual(req.call_count, 1)
+        self.assertFalse(sleep.called)
+
+
+class RecordingMetrics(InMemoryMetrics):
+    """
+    Aggregates metrics, and keeps every record
+    """
+
+    def __init__(self):
+        super(RecordingMetrics, self).__init__()
+        self.records = []
+
+    def record(self, metrics):
+        self.records.append(metrics)
+        super(RecordingMetrics, self).record(metrics)
+
+
+class MetricsTestCase(TestCase):
+    """
+    Tests for per-operation metrics
+    """
+
+    def setUp(self):
+        self.metrics = RecordingMetrics()
+        self.records = self.metrics.records
+
+    def test_histogram(self):
+        """
+        Histogram percentiles
+        """
+        histogram = Histogram()
+        self.assertIsNone(histogram.percentile(50))
+        for value in range(1, 1001):
+            histogram.add(value / 1000.0)
+        stats = histogram.get_stats()
+        self.assertEqual(stats['count'], 1000)
+        self.assertAlmostEqual(stats['mean'], 0.5005)
+        self.assertTrue(0.5 <= stats['p50'] <= 0.5 * 1.05)
+        self.assertTrue(0.99 <= stats['p99'] <= 0.99 * 1.05)
+        self.assertEqual(stats['max'], 1)
+
+    def test_dispatch_metrics(self):
+        """
+        Connection.dispatch reports metrics, including retries
+        """
+        conn = Connection(retry_policy=RetryPolicy(max_attempts=2), metrics=self.metrics)
+        conn._tables['ci-table'] = MetaTable(DESCRIBE_TABLE_DATA.get('Table'))
+        throttled = HttpBadRequest(), {'Errors': [{'Code': 'ProvisionedThroughputExceededException'}]}
+        data = dict(GET_ITEM_DATA, ConsumedCapacity={'TableName': 'ci-table', 'CapacityUnits': 0.5})
+        with patch(PATCH_METHOD) as req:
+            req.side_effect = [throttled, (HttpOK(), data)]
+            with patch('time.sleep'):
+                conn.get_item('ci-table', 'foo', 'bar')
+        record = self.records[-1]
+        self.assertEqual(record['operation'], 'GetItem')
+        self.assertEqual(record['table_name'], 'ci-table')
+        self.assertIsNone(record['index_name'])
+        self.assertEqual(record['status_code'], 200)
+        self.assertIsNone(record['error_code'])
+        self.assertEqual(record['retries'], 1)
+        self.assertEqual(record['capacity_units'], 0.5)
+        self.assertEqual(record['item_count'], 1)
+        self.assertTrue(record['total_time'] >= record['network_time'] >= 0)
+
+        with patch(PATCH_METHOD) as req:
+            req.return_value = throttled
+            with patch('time.sleep'):
+                self.assertRaises(GetError, conn.get_item, 'ci-table', 'foo', 'bar')
+        self.assertEqual(self.records[-1]['error_code'], 'ProvisionedThroughputExceededException')
+        self.assertEqual(self.records[-1]['item_count'], 0)
+
+        stats = self.metrics.get_stats()[('ci-table', None, 'GetItem')]
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['latency']['count'], 2)
+        self.assertEqual(self.metrics.get_capacity_units(), {('ci-table', 'GetItem'): 0.5})
+
+    def test_index_and_item_count(self):
+        """
+        Metrics are aggregated per table, index and operation
+        """
+        conn = Connection(transport=InMemoryTransport(), metrics=self.metrics)
+        conn.create_table(
+            'users',
+            attribute_definitions=[
+                {'attribute_name': 'name', 'attribute_type': 'S'},
+                {'attribute_name': 'email', 'attribute_type': 'S'}
+            ],
+            key_schema=[{'attribute_name': 'name', 'key_type': 'HASH'}],
+            global_secondary_indexes=[{
+                'index_name': 'email_index',
+                'key_schema': [{'AttributeName': 'email', 'KeyType': 'HASH'}],
+                'projection': {'ProjectionType': 'ALL'},
+                'provisioned_throughput': {'ReadCapacityUnits': 1, 'WriteCapacityUnits': 1}
+            }],
+            read_capacity_units=1,
+            write_capacity_units=1)
+        for name in ['alice', 'bob']:
+            conn.put_item('users', name, attributes={'email': 'shared@example.com'})
+        conn.query('users', 'shared@example.com', index_name='email_index')
+        record = self.records[-1]
+        self.assertEqual(record['index_name'], 'email_index')
+        self.assertEqual(record['item_count'], 2)
+        self.assertEqual(record['capacity_units'], 0.5)
+
+        stats = self.metrics.get_stats()
+        self.assertEqual(stats[('users', None, 'PutItem')]['item_count'], 2)
+        self.assertEqual(stats[('users', None, 'PutItem')]['capacity_units'], 2)
+        self.assertEqual(stats[('users', 'email_index', 'Query')]['count'], 1)
+        self.assertEqual(self.metrics.get_capacity_units()[('users', 'PutItem')], 2)
+        self.metrics.reset()
+        self.assertEqual(self.metrics.get_stats(), {})
+
+
+class RecordingHandler(logging.Handler):
+    """
+    Keeps the messages of log records
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class RequestLoggerTestCase(TestCase):
+    """
+    Tests for debug logging of requests
+    """
+
+    def setUp(self):
+        self.log = logging.getLogger('pynamodb.connection.base')
+        self.level = self.log.level
+        self.handler = RecordingHandler()
+        self.log.addHandler(self.handler)
+
+    def tearDown(self):
+        self.log.removeHandler(self.handler)
+        self.log.setLevel(self.level)
+
+    def test_disabled(self):
+        """
+        Nothing is formatted when DEBUG logging is disabled
+        """
+        self.log.setLevel(logging.INFO)
+        conn = Connection()
+        conn._tables['ci-table'] = MetaTable(DESCRIBE_TABLE_DATA.get('Table'))
+        with patch.object(TruncatedPayload, '__str__') as to_string:
+            with patch(PATCH_METHOD) as req:
+                req.return_value = HttpOK(), GET_ITEM_DATA
+                conn.get_item('ci-table', 'foo', 'bar')
+        self.assertFalse(to_string.called)
+        self.assertEqual(self.handler.messages, [])
+
+    def test_sampling_and_truncation(self):
+        """
+        One request in `sample_rate` is logged, with truncated payloads
+        """
+        self.log.setLevel(logging.DEBUG)
+        conn = Connection(request_logger=RequestLogger(sample_rate=3, max_payload_length=40))
+        conn._tables['ci-table'] = MetaTable(DESCRIBE_TABLE_DATA.get('Table'))
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpOK(), GET_ITEM_DATA
+            for _ in range(5):
+                conn.get_item('ci-table', 'foo', 'bar')
+        requests = [message for message in self.handler.messages if message.startswith('Calling GetItem')]
+        responses = [message for message in self.handler.messages if message.startswith('GetItem response')]
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(len(responses), 2)
+        for message in requests:
+            self.assertTrue(len(message) <= len('Calling GetItem with arguments ') + 43)
+
+    def test_truncated_payload(self):
+        """
+        TruncatedPayload
+        """
+        payload = {'Items': [{'name': {'S': 'x' * 1000}}] * 1000}
+        self.assertEqual(len(str(TruncatedPayload(payload, 100))), 103)
+        self.assertEqual(str(TruncatedPayload({'a': 1}, 100)), "{'a': 1}")
+        self.assertEqual(str(TruncatedPayload(payload, None)), str(payload))
+
+
+class MetaTableCacheTestCase(TestCase):
+    """
+    Tests for the shared table meta data cache
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.key = ('us-east-1', None, 'ci-table')
+        self.table_data = DESCRIBE_TABLE_DATA['Table']
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_shared_by_connections(self):
+        """
+        Connections sharing a cache describe each table once
+        """
+        cache = MetaTableCache()
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpOK(), DESCRIBE_TABLE_DATA
+            for _ in range(3):
+                conn = Connection(meta_table_cache=cache)
+                self.assertEqual(conn.get_meta_table('ci-table').hash_keyname, 'ForumName')
+            self.assertEqual(req.call_count, 1)
+            conn.describe_table('ci-table')
+            self.assertEqual(req.call_count, 2)
+
+            req.return_value = HttpBadRequest(), {'Errors': [{'Code': 'ResourceNotFoundException'}]}
+            self.assertIsNone(conn.get_meta_table('missing'))
+            self.assertIsNone(conn.get_meta_table('missing'))
+            self.assertEqual(req.call_count, 4)
+
+    def test_ttl(self):
+        """
+        Stale entries are refreshed
+        """
+        cache = MetaTableCache(ttl=0, background_refresh=False)
+        conn = Connection(meta_table_cache=cache)
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpOK(), DESCRIBE_TABLE_DATA
+            conn.get_meta_table('ci-table')
+            time.sleep(0.01)
+            conn.get_meta_table('ci-table')
+            self.assertEqual(req.call_count, 2)
+
+        loads = []
+        refreshed = threading.Event()
+
+        def load():
+            loads.append(1)
+            if len(loads) > 1:
+                refreshed.set()
+            return {'TableName': str(len(loads))}
+
+        cache = MetaTableCache(ttl=0.01)
+        self.assertEqual(cache.get(self.key, load), {'TableName': '1'})
+        time.sleep(0.02)
+        self.assertEqual(cache.get(self.key, load), {'TableName': '1'})
+        self.assertTrue(refreshed.wait(5))
+        for _ in range(100):
+            if cache.get_cached(self.key) == {'TableName': '2'}:
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.get_cached(self.key), {'TableName': '2'})
+
+    def test_file_store(self):
+        """
+        Entries are shared through files
+        """
+        MetaTableCache(path=self.path).set(self.key, self.table_data)
+        cache = MetaTableCache(path=self.path)
+        self.assertEqual(cache.get(self.key, lambda: self.fail('The table was described')), self.table_data)
+        self.assertIsNone(cache.get_cached(('us-east-1', None, 'other-table')))
+        self.assertEqual(len([name for name in os.listdir(self.path) if name.endswith('.json')]), 1)
+
+    def test_file_lock(self):
+        """
+        Processes wait for the one describing a table
+        """
+        writer = MetaTableCache(path=self.path)
+        self.assertTrue(writer._acquire_file_lock(self.key))
+
+        def describe():
+            time.sleep(0.1)
+            writer.set(self.key, self.table_data)
+            writer._release_file_lock(self.key)
+        thread = threading.Thread(target=describe)
+        thread.start()
+        cache = MetaTableCache(path=self.path, lock_timeout=5)
+        self.assertEqual(cache.get(self.key, lambda: self.fail('The table was described')), self.table_data)
+        thread.join()
+
+        self.assertTrue(writer._acquire_file_lock(('us-east-1', None, 'other-table')))
+        cache = MetaTableCache(path=self.path, lock_timeout=0.1)
+        self.assertEqual(cache.get(('us-east-1', None, 'other-table'), lambda: self.table_data), self.table_data)
+
+    def test_file_errors(self):
+        """
+        Unusable cache directories neither break reads nor leave files behind
+        """
+        cache = MetaTableCache(path=os.path.join(self.path, 'missing'), lock_timeout=5)
+        self.assertIsNone(cache._acquire_file_lock(self.key))
+        start = time.time()
+        self.assertEqual(cache.get(self.key, lambda: self.table_data), self.table_data)
+        self.assertTrue(time.time() - start < 1)
+
+        cache = MetaTableCache(path=self.path)
+        cache.set(self.key, {'TableName': object()})
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_stale_file_lock(self):
+        """
+        Stale lock files are removed once, and fresh ones are kept
+        """
+        cache = MetaTableCache(path=self.path, lock_timeout=60)
+        lock_name = '{0}.lock'.format(cache._get_file_name(self.key))
+        self.assertTrue(cache._acquire_file_lock(self.key))
+        self.assertFalse(cache._acquire_file_lock(self.key))
+        self.assertTrue(os.path.exists(lock_name))
+        os.utime(lock_name, (time.time() - 120, time.time() - 120))
+        self.assertFalse(cache._acquire_file_lock(self.key))
+        self.assertEqual(os.listdir(self.path), [])
+        self.assertTrue(cache._acquire_file_lock(self.key))
@@ -0,0 +1,172 @@
+"""
+Tests for the concurrency helpers
+"""
+import time
+import threading
+from unittest import TestCase
+
+from pynamodb.concurrency import map_concurrently, chain_concurrently, prefetch_pages
+
+
+class MapConcurrentlyTestCase(TestCase):
+    """
+    Tests for map_concurrently
+    """
+
+    def test_ordered(self):
+        """
+        Results are yielded in the order of the elements
+        """
+        def square(value):
+            time.sleep(0.001 * (value % 3))
+            return value * value
+        self.assertEqual(list(map_concurrently(square, range(20), 4)), [value * value for value in range(20)])
+
+    def test_unordered(self):
+        """
+        Results are yielded as they are available
+        """
+        results = map_concurrently(lambda value: value, range(20), 4, ordered=False)
+        self.assertEqual(sorted(results), list(range(20)))
+
+    def test_lazy(self):
+        """
+        At most `buffer_size` elements are consumed ahead of the results
+        """
+        consumed = []
+
+        def elements():
+            for value in range(100):
+                consumed.append(value)
+                yield value
+
+        results = map_concurrently(lambda value: value, elements(), 2, buffer_size=4)
+        self.assertEqual(next(results), 0)
+        self.assertTrue(len(consumed) <= 5)
+        results.close()
+
+    def test_error(self):
+        """
+        Errors are raised by the generator, and pending elements are cancelled
+        """
+        called = []
+        lock = threading.Lock()
+
+        def fail(value):
+            with lock:
+                called.append(value)
+            if value == 2:
+                raise ValueError(value)
+            return value
+
+        results = map_concurrently(fail, range(100), 2, buffer_size=4)
+        self.assertRaises(ValueError, list, results)
+        time.sleep(0.01)
+        self.assertTrue(len(called) < 10)
+        self.assertRaises(ValueError, list, map_concurrently(fail, [], 0))
+
+
+class ChainConcurrentlyTestCase(TestCase):
+    """
+    Tests for chain_concurrently
+    """
+
+    def test_chain(self):
+        """
+        The values of every iterator are yielded
+        """
+        values = chain_concurrently(lambda value: range(value), range(10), 3)
+        self.assertEqual(sorted(values), sorted(x for value in range(10) for x in range(value)))
+
+    def test_buffer(self):
+        """
+        Threads wait for buffered values to be consumed
+        """
+        produced = []
+
+        def produce(element):
+            for value in range(100):
+                produced.append(value)
+                yield value
+
+        values = chain_concurrently(produce, [0], 1, buffer_size=5)
+        self.assertEqual(next(values), 0)
+        time.sleep(0.05)
+        self.assertTrue(len(produced) <= 7)
+        values.close()
+
+    def test_error(self):
+        """
+        Errors are raised by the generator, and the other threads stop
+        """
+        produced = []
+
+        def produce(element):
+            if element == 1:
+                raise ValueError(element)
+            for value in range(100000):
+                produced.append(value)
+                yield value
+
+        values = chain_concurrently(produce, range(2), 2, buffer_size=2)
+        self.assertRaises(ValueError, list, values)
+        time.sleep(0.1)
+        count = len(produced)
+        time.sleep(0.1)
+        self.assertEqual(len(produced), count)
+        self.assertTrue(count < 100000)
+
+
+class PrefetchPagesTestCase(TestCase):
+    """
+    Tests for prefetch_pages
+    """
+
+    def assert_prefetched(self, size):
+        """
+        Checks that up to `size` pages are fetched ahead of the page being consumed
+        """
+        fetched = []
+
+        def pages():
+            for page in range(10):
+                fetched.append(page)
+                yield [page]
+
+        def wait_for(count):
+            deadline = time.time() + 5
+            while len(fetched) < count and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.05)
+
+        pages = prefetch_pages(pages(), size)
+        self.assertEqual(next(pages), [0])
+        wait_for(size + 1)
+        # The page being consumed, plus `size` pages ahead
+        self.assertEqual(len(fetched), size + 1)
+        self.assertEqual(list(pages), [[page] for page in range(1, 10)])
+
+    def test_prefetch(self):
+        """
+        Pages are fetched ahead, in order
+        """
+        self.assert_prefetched(2)
+
+    def test_prefetch_one(self):
+        """
+        A single page is fetched ahead
+        """
+        self.assert_prefetched(1)
+
+    def test_errors(self):
+        """
+        Errors raised while fetching pages are raised to the consumer
+        """
+        def pages():
+            yield [0]
+            raise ValueError("fetch failed")
+
+        pages = prefetch_pages(pages(), 1)
+        self.assertEqual(next(pages), [0])
+        self.assertRaises(ValueError, next, pages)
+        self.assertRaises(ValueError, list, prefetch_pages([], 0))
@@ -0,0 +1,335 @@
+"""
+Tests for the in-memory DynamoDB backend
+"""
+from unittest import TestCase
+
+import six
+
+from pynamodb.connection import Connection
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.exceptions import PutError, TableError
+from pynamodb.models import Model
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute, NumberSetAttribute
+
+if six.PY3:
+    from unittest.mock import patch
+else:
+    from mock import patch
+
+
+class EmailIndex(GlobalSecondaryIndex):
+    """
+    An index of users by email address
+    """
+    class Meta:
+        read_capacity_units = 1
+        write_capacity_units = 1
+        projection = AllProjection()
+    email = UnicodeAttribute(hash_key=True)
+
+
+def make_model(transport):
+    """
+    Returns a model class that uses `transport`
+    """
+    class MemoryUserModel(Model):
+        class Meta:
+            table_name = 'MemoryUsers'
+        user_name = UnicodeAttribute(hash_key=True)
+        user_id = UnicodeAttribute(range_key=True)
+        email = UnicodeAttribute(null=True)
+        zip_code = NumberAttribute(null=True)
+        scores = NumberSetAttribute(null=True)
+        email_index = EmailIndex()
+
+    MemoryUserModel.Meta.transport = transport
+    return MemoryUserModel
+
+
+class InMemoryTransportTestCase(TestCase):
+    """
+    Tests for InMemoryTransport
+    """
+
+    def setUp(self):
+        self.transport = InMemoryTransport()
+        self.model = make_model(self.transport)
+        self.model.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+
+    def test_create_describe_delete_table(self):
+        """
+        CreateTable, DescribeTable, ListTables and DeleteTable
+        """
+        conn = Connection(transport=self.transport)
+        self.assertEqual(conn.list_tables()['TableNames'], ['MemoryUsers'])
+        description = conn.describe_table('MemoryUsers')
+        self.assertEqual(description['TableStatus'], 'ACTIVE')
+        self.assertEqual(description['ItemCount'], 0)
+        self.assertEqual(description['GlobalSecondaryIndexes'][0]['IndexName'], 'email_index')
+        self.assertRaises(TableError, conn.create_table, 'MemoryUsers', attribute_definitions=[
+            {'attribute_name': 'user_name', 'attribute_type': 'S'}
+        ], key_schema=[{'attribute_name': 'user_name', 'key_type': 'HASH'}],
+            read_capacity_units=1, write_capacity_units=1)
+        conn.delete_table('MemoryUsers')
+        self.assertIsNone(conn.describe_table('MemoryUsers'))
+
+    def test_put_get_update_delete(self):
+        """
+        Item operations
+        """
+        self.model('alice', '1', email='alice@example.com', zip_code=10001).save()
+        item = self.model.get('alice', '1')
+        self.assertEqual(item.email, 'alice@example.com')
+        self.assertEqual(item.zip_code, 10001)
+
+        item.update_item('zip_code', 5, action='add')
+        self.assertEqual(item.zip_code, 10006)
+        item.update_item('scores', set([1, 2]), action='add')
+        item.update_item('scores', set([1]), action='delete')
+        self.assertEqual(self.model.get('alice', '1').scores, set([2]))
+
+        item.delete()
+        self.assertRaises(self.model.DoesNotExist, self.model.get, 'alice', '1')
+
+    def test_update_changed_attributes(self):
+        """
+        Model.update only sends the changed attributes
+        """
+        self.model('alice', '1', email='alice@example.com', zip_code=10001, scores=set([1])).save()
+        item = self.model.get('alice', '1')
+        self.assertEqual(item.get_changed_attributes(), set())
+        with patch.object(self.transport, 'send', wraps=self.transport.send) as send:
+            self.assertIsNone(item.update())
+            self.assertFalse(send.called)
+
+            item.zip_code = 10002
+            item.email = None
+            self.assertEqual(item.get_changed_attributes(), set(['zip_code', 'email']))
+            item.save(changed_only=True)
+            self.assertEqual(send.call_args[0][1], 'UpdateItem')
+            self.assertEqual(send.call_args[0][2]['attribute_updates'], {
+                'zip_code': {'Action': 'PUT', 'Value': {'N': '10002'}},
+                'email': {'Action': 'DELETE'}
+            })
+            self.assertEqual(item.get_changed_attributes(), set())
+            self.assertIsNone(item.update())
+            self.assertEqual(send.call_count, 1)
+
+        item = self.model.get('alice', '1')
+        self.assertEqual(item.zip_code, 10002)
+        self.assertIsNone(item.email)
+        self.assertEqual(item.scores, set([1]))
+
+        item.user_id = '2'
+        item.update()
+        self.assertEqual(self.model.get('alice', '2').scores, set([1]))
+
+    def test_conditional_put(self):
+        """
+        Failed expectations are returned as errors
+        """
+        conn = Connection(transport=self.transport)
+        conn.put_item('MemoryUsers', 'bob', '1', expected={'user_name': {'Exists': False}})
+        with self.assertRaises(PutError):
+            conn.put_item('MemoryUsers', 'bob', '1', expected={'user_name': {'Exists': False}})
+        with self.assertRaises(PutError):
+            conn.put_item('MemoryUsers', 'bob', '1', expected={'user_id': {'Value': '2'}})
+        conn.put_item('MemoryUsers', 'bob', '1', expected={'user_id': {'Value': '1'}})
+
+    def test_query(self):
+        """
+        Queries on the table and on a global secondary index
+        """
+        for user_id in ['a1', 'a2', 'b1', 'b2']:
+            self.model('carol', user_id, email='{0}@example.com'.format(user_id[0])).save()
+        self.model('dave', 'a1', email='a@example.com').save()
+
+        self.assertEqual([item.user_id for item in self.model.query('carol')], ['a1', 'a2', 'b1', 'b2'])
+        self.assertEqual([item.user_id for item in self.model.query('carol', user_id__begins_with='b')],
+                         ['b1', 'b2'])
+        self.assertEqual([item.user_id for item in self.model.query('carol', scan_index_forward=False)],
+                         ['b2', 'b1', 'a2', 'a1'])
+        self.assertEqual(
+            sorted((item.user_name, item.user_id) for item in self.model.email_index.query('a@example.com')),
+            [('carol', 'a1'), ('carol', 'a2'), ('dave', 'a1')])
+
+    def test_raw_and_dict_items(self):
+        """
+        Queries, scans and batch gets yield raw items or dictionaries when asked to
+        """
+        self.model('ivan', '1', zip_code=12345, scores=set([1, 2])).save()
+        raw_item = {
+            'user_name': {'S': 'ivan'},
+            'user_id': {'S': '1'},
+            'zip_code': {'N': '12345'},
+            'scores': {'NS': ['1', '2']},
+        }
+        values = {'user_name': 'ivan', 'user_id': '1', 'zip_code': 12345, 'scores': set([1, 2])}
+
+        def normalize(item):
+            item = dict(item)
+            item['scores'] = {'NS': sorted(item['scores']['NS'])}
+            return item
+
+        self.assertEqual([normalize(item) for item in self.model.query('ivan', raw=True)], [raw_item])
+        self.assertEqual([normalize(item) for item in self.model.scan(raw=True)], [raw_item])
+        self.assertEqual([normalize(item) for item in self.model.batch_get([('ivan', '1')], raw=True)], [raw_item])
+        self.assertEqual(list(self.model.query('ivan', as_dict=True)), [values])
+        self.assertEqual(list(self.model.scan(as_dict=True, prefetch=1)), [values])
+        self.assertEqual(list(self.model.parallel_scan(2, as_dict=True)), [values])
+        self.assertEqual(list(self.model.batch_get([('ivan', '1')], as_dict=True, workers=2)), [values])
+        self.assertRaises(ValueError, list, self.model.scan(raw=True, as_dict=True))
+
+    def test_attributes_to_get(self):
+        """
+        Items read with attributes_to_get are partial, and can't be saved as a whole
+        """
+        self.model('judy', '1', email='judy@example.com', zip_code=12345).save()
+        items = [
+            self.model.get('judy', '1', attributes_to_get=['email']),
+            list(self.model.query('judy', attributes_to_get=['email']))[0],
+            list(self.model.scan(attributes_to_get=['email']))[0],
+            list(self.model.parallel_scan(2, attributes_to_get=['email']))[0],
+            list(self.model.batch_get([('judy', '1')], attributes_to_get=['email']))[0],
+            list(self.model.email_index.query('judy@example.com', attributes_to_get=['email']))[0],
+        ]
+        for item in items:
+            self.assertTrue(item.is_partial())
+            self.assertEqual(item.attribute_values,
+                             {'user_name': 'judy', 'user_id': '1', 'email': 'judy@example.com'})
+            self.assertRaises(ValueError, item.save)
+        self.assertEqual(list(self.model.scan(as_dict=True, attributes_to_get=['zip_code'])),
+                         [{'user_name': 'judy', 'user_id': '1', 'zip_code': 12345}])
+        self.assertRaises(ValueError, list, self.model.scan(attributes_to_get=['missing']))
+
+        item = items[0]
+        with self.model.batch_write() as batch:
+            self.assertRaises(ValueError, batch.save, item)
+        item.email = 'judy@example.org'
+        item.update()
+        self.assertEqual(self.model.get('judy', '1').zip_code, 12345)
+        item.refresh()
+        self.assertFalse(item.is_partial())
+        self.assertEqual(item.zip_code, 12345)
+        item.save()
+        self.assertFalse(self.model.get('judy', '1').is_partial())
+
+    def test_count(self):
+        """
+        Counts use the COUNT select, and sum the counts of every page
+        """
+        for user_id in range(12):
+            self.model('kim', str(user_id), email='{0}@example.com'.format(user_id % 3)).save()
+        self.model('leo', '1', email='0@example.com').save()
+        with patch.object(self.transport, 'send', wraps=self.transport.send) as send:
+            count = self.model.count('kim')
+            self.assertEqual(send.call_args[0][2]['select'], 'COUNT')
+        self.assertEqual(count, 12)
+        self.assertEqual(count.scanned_count, 12)
+        self.assertTrue(count.consumed_capacity > 0)
+        self.assertEqual(self.model.count('kim', user_id__begins_with='1'), 3)
+        self.assertEqual(self.model.count('0@example.com', index_name='email_index'), 5)
+        self.assertEqual(self.model.count(), 13)
+        count = self.model.count(email__eq='0@example.com', total_segments=3, workers=2)
+        self.assertEqual(count, 5)
+        self.assertEqual(count.scanned_count, 13)
+        self.assertRaises(ValueError, self.model.count, 'kim', total_segments=2)
+        self.assertRaises(ValueError, self.model.count, index_name='email_index')
+
+    def test_query_pages(self):
+        """
+        Queries return LastEvaluatedKey when limited
+        """
+        conn = Connection(transport=self.transport)
+        for user_id in range(5):
+            conn.put_item('MemoryUsers', 'erin', str(user_id))
+        data = conn.query('MemoryUsers', 'erin', limit=2)
+        self.assertEqual(data['Count'], 2)
+        self.assertEqual(data['LastEvaluatedKey'], {'user_name': {'S': 'erin'}, 'user_id': {'S': '1'}})
+        data = conn.query('MemoryUsers', 'erin', exclusive_start_key=data['LastEvaluatedKey'])
+        self.assertEqual([item['user_id']['S'] for item in data['Items']], ['2', '3', '4'])
+        self.assertNotIn('LastEvaluatedKey', data)
+
+        items = self.model.query('erin', limit=2, prefetch=2)
+        self.assertEqual([item.user_id for item in items], ['0', '1', '2', '3', '4'])
+        items = self.model.scan(limit=2, prefetch=1, user_name__eq='erin')
+        self.assertEqual(sorted(item.user_id for item in items), ['0', '1', '2', '3', '4'])
+
+    def test_scan_segments(self):
+        """
+        Parallel scan segments partition the table
+        """
+        conn = Connection(transport=self.transport)
+        for user_name in range(20):
+            self.model(str(user_name), '1', email='{0}@example.com'.format(user_name % 2)).save()
+        keys = []
+        for segment in range(3):
+            data = conn.scan('MemoryUsers', segment=segment, total_segments=3)
+            keys.extend(item['user_name']['S'] for item in data['Items'])
+        self.assertEqual(sorted(keys), sorted(str(user_name) for user_name in range(20)))
+
+        items = list(self.model.scan(email__begins_with='1@'))
+        self.assertEqual(sorted(int(item.user_name) for item in items), list(range(1, 20, 2)))
+
+        data = conn.scan('MemoryUsers', limit=15, return_consumed_capacity='TOTAL')
+        self.assertEqual(data['ScannedCount'], 15)
+        self.assertEqual(data['ConsumedCapacity']['TableName'], 'MemoryUsers')
+        data = conn.scan('MemoryUsers', exclusive_start_key=data['LastEvaluatedKey'])
+        self.assertEqual(data['Count'], 5)
+
+    def test_parallel_scan(self):
+        """
+        Parallel scans merge the items of every segment
+        """
+        for user_name in range(40):
+            self.model(str(user_name), '1', email='{0}@example.com'.format(user_name % 2)).save()
+        items = list(self.model.parallel_scan(total_segments=4, workers=2, limit=3))
+        self.assertEqual(sorted(int(item.user_name) for item in items), list(range(40)))
+        items = list(self.model.parallel_scan(4, email__begins_with='1@'))
+        self.assertEqual(sorted(int(item.user_name) for item in items), list(range(1, 40, 2)))
+
+        with patch.object(self.transport, 'send', side_effect=ValueError('failed')):
+            self.assertRaises(ValueError, list, self.model.parallel_scan(total_segments=4))
+
+    def test_batch_get_unprocessed_keys(self):
+        """
+        Batch gets beyond `batch_get_limit` return unprocessed keys
+        """
+        self.transport.batch_get_limit = 2
+        conn = Connection(transport=self.transport)
+        for user_id in range(3):
+            conn.put_item('MemoryUsers', 'frank', str(user_id))
+        keys = [{'user_name': 'frank', 'user_id': str(user_id)} for user_id in range(3)]
+        data = conn.batch_get_item('MemoryUsers', keys)
+        self.assertEqual(len(data['Responses']['MemoryUsers']), 2)
+        self.assertEqual(data['UnprocessedKeys']['MemoryUsers']['Keys'],
+                         [{'user_name': {'S': 'frank'}, 'user_id': {'S': '2'}}])
+
+    def test_batch_get_workers(self):
+        """
+        Batch gets fetch pages concurrently, from a generator of keys
+        """
+        with self.model.batch_write() as batch:
+            for user_id in range(250):
+                batch.save(self.model('heidi', str(user_id)))
+        self.transport.batch_get_limit = 40
+        keys = [('heidi', str(user_id)) for user_id in range(250)]
+        with patch('time.sleep') as sleep:
+            items = list(self.model.batch_get(iter(keys), workers=3))
+            self.assertEqual([item.user_id for item in items], [key[1] for key in keys])
+            items = self.model.batch_get((key for key in keys), workers=3, ordered=False)
+            self.assertEqual(sorted(item.user_id for item in items), sorted(key[1] for key in keys))
+        self.assertTrue(sleep.called)
+        self.assertEqual(len(keys), 250)
+
+    def test_batch_write(self):
+        """
+        Batch writes
+        """
+        with self.model.batch_write() as batch:
+            for user_id in range(30):
+                batch.save(self.model('grace', str(user_id)))
+        self.assertEqual(len(list(self.model.query('grace'))), 30)
+        items = list(self.model.batch_get([('grace', str(user_id)) for user_id in range(30)]))
+        self.assertEqual(len(items), 30)
@@ -2,6 +2,7 @@
 Test model API
 """
 import copy
+import pickle
 from datetime import datetime
 from unittest import TestCase
 
@@ -124,6 +125,85 @@ class SimpleUserModel(Model):
     views = NumberAttribute(null=True)
 
 
+class OfflineEmailIndex(GlobalSecondaryIndex):
+    """
+    A global secondary index for email addresses
+    """
+    class Meta:
+        read_capacity_units = 2
+        write_capacity_units = 1
+        projection = AllProjection()
+    email = UnicodeAttribute(hash_key=True)
+
+
+class OfflineUserModel(Model):
+    """
+    A model that declares its table schema
+    """
+    class Meta:
+        table_name = 'UserModel'
+        offline_schema = True
+    user_name = UnicodeAttribute(hash_key=True)
+    user_id = UnicodeAttribute(range_key=True)
+    email = UnicodeAttribute(null=True)
+    zip_code = NumberAttribute(null=True)
+    email_index = OfflineEmailIndex()
+
+
+class CompactUserModel(Model):
+    """
+    A model with compact instances
+    """
+    class Meta:
+        table_name = 'UserModel'
+        offline_schema = True
+        compact_instances = True
+    user_name = UnicodeAttribute(hash_key=True)
+    user_id = UnicodeAttribute(range_key=True)
+    zip_code = NumberAttribute(null=True)
+    email = UnicodeAttribute(default='needs_email')
+
+
+class LazyUserModel(Model):
+    """
+    A model with lazy deserialization
+    """
+    class Meta:
+        table_name = 'UserModel'
+        offline_schema = True
+        lazy_deserialization = True
+    user_name = UnicodeAttribute(hash_key=True)
+    user_id = UnicodeAttribute(range_key=True)
+    zip_code = NumberAttribute(null=True)
+    email = UnicodeAttribute(default='needs_email')
+    date_created = UTCDateTimeAttribute(null=True)
+
+
+class LazyCompactUserModel(LazyUserModel):
+    """
+    A model with lazy deserialization and compact instances
+    """
+    class Meta:
+        table_name = 'UserModel'
+        offline_schema = True
+        lazy_deserialization = True
+        compact_instances = True
+
+
+class FlagNamesModel(Model):
+    """
+    A model with compact, lazy instances and attributes named like their flags
+    """
+    class Meta:
+        table_name = 'FlagNamesModel'
+        offline_schema = True
+        lazy_deserialization = True
+        compact_instances = True
+    name = UnicodeAttribute(hash_key=True)
+    compact = UnicodeAttribute(null=True)
+    lazy = NumberAttribute(null=True)
+
+
 class ThrottledUserModel(Model):
     """
     A testing model
@@ -314,6 +394,178 @@ class ModelTestCase(TestCase):
 
         self.assertRaises(ValueError, UserModel.from_raw_data, None)
 
+    def test_from_raw_data(self):
+        """
+        Model.from_raw_data
+        """
+        data = {
+            'user_name': {'S': 'foo'},
+            'user_id': {'S': 'bar'},
+            'zip_code': {'N': '10001'},
+            'email': {'S': 'foo@example.com'},
+            'unknown': {'S': 'ignored'}
+        }
+        with patch(PATCH_METHOD) as req:
+            item = UserModel.from_raw_data(data)
+            self.assertFalse(req.called)
+        self.assertEqual(item.user_name, 'foo')
+        self.assertEqual(item.user_id, 'bar')
+        self.assertEqual(item.zip_code, 10001)
+        self.assertEqual(item.email, 'foo@example.com')
+        self.assertEqual(item.callable_field, 42)
+        self.assertIsNone(item.picture)
+        self.assertNotIn('unknown', item.attribute_values)
+        self.assertEqual(data['user_name'], {'S': 'foo'})
+        self.assertIs(UserModel._get_deserializer(), UserModel._get_deserializer())
+        self.assertIsNot(UserModel._get_deserializer(), SimpleUserModel._get_deserializer())
+
+    def test_serialize(self):
+        """
+        Model.serialize, Model.get_keys and Model.serialize_keys
+        """
+        item = UserModel.from_raw_data({'user_name': {'S': 'foo'}, 'user_id': {'S': 'bar'}})
+        item.zip_code = 10001
+        item.email = None
+        with patch(PATCH_METHOD) as req:
+            self.assertEqual(item.get_keys(), {'user_name': 'foo', 'user_id': 'bar'})
+            self.assertEqual(UserModel.serialize_keys('foo', 'bar'), ('foo', 'bar'))
+            self.assertRaises(ValueError, item.serialize)
+            self.assertEqual(item.serialize(null_check=False), {
+                'HASH': 'foo',
+                'RANGE': 'bar',
+                'attributes': {
+                    'zip_code': {'N': '10001'},
+                    'callable_field': {'N': '42'}
+                }
+            })
+            item.email = 'foo@example.com'
+            self.assertEqual(item.serialize(attr_map=True), {
+                'attributes': {
+                    'user_name': {'S': 'foo'},
+                    'user_id': {'S': 'bar'},
+                    'zip_code': {'N': '10001'},
+                    'email': {'S': 'foo@example.com'},
+                    'callable_field': {'N': '42'}
+                }
+            })
+            self.assertFalse(req.called)
+        self.assertIs(UserModel._get_serializer(), UserModel._get_serializer())
+
+    def test_compact_instances(self):
+        """
+        Model.Meta.compact_instances
+        """
+        item = CompactUserModel.from_raw_data({
+            'user_name': {'S': 'foo'},
+            'user_id': {'S': 'bar'},
+            'zip_code': {'N': '10001'}
+        })
+        self.assertIsInstance(item, CompactUserModel)
+        self.assertTrue(item._compact_class)
+        self.assertEqual(item.attribute_values, {'user_name': 'foo', 'user_id': 'bar', 'zip_code': 10001,
+                                                 'email': 'needs_email'})
+        self.assertEqual(item.zip_code, 10001)
+        item.zip_code = None
+        item.email = 'foo@example.com'
+        self.assertIsNone(item.zip_code)
+        self.assertEqual(item.get_keys(), {'user_name': 'foo', 'user_id': 'bar'})
+        self.assertEqual(item.serialize(), {
+            'HASH': 'foo',
+            'RANGE': 'bar',
+            'attributes': {'email': {'S': 'foo@example.com'}}
+        })
+        self.assertIs(type(item).email, CompactUserModel.email)
+        self.assertEqual(list(type(item).get_attributes()), list(CompactUserModel.get_attributes()))
+        self.assertFalse(CompactUserModel('foo', 'bar')._compact_class)
+
+        item = FlagNamesModel.from_raw_data({'name': {'S': 'foo'}, 'compact': {'S': 'yes'}, 'lazy': {'N': '1'}})
+        self.assertIsNot(type(item), FlagNamesModel)
+        self.assertTrue(item._compact_class)
+        self.assertTrue(item._lazy_class)
+        self.assertEqual(item.compact, 'yes')
+        self.assertEqual(item.lazy, 1)
+        self.assertEqual(item.attribute_values, {'name': 'foo', 'compact': 'yes', 'lazy': 1})
+        self.assertEqual(FlagNamesModel.from_raw_data({'name': {'S': 'foo'}}).attribute_values, {'name': 'foo'})
+        self.assertIsInstance(FlagNamesModel.compact, UnicodeAttribute)
+
+    def test_pickle(self):
+        """
+        Model.__reduce__
+        """
+        data = {
+            'user_name': {'S': 'foo'},
+            'user_id': {'S': 'bar'},
+            'zip_code': {'N': '10001'}
+        }
+        for model in [CompactUserModel, LazyUserModel, LazyCompactUserModel]:
+            item = model.from_raw_data(data)
+            item.email = 'foo@example.com'
+            loaded = pickle.loads(pickle.dumps(item))
+            self.assertIs(type(loaded), model)
+            self.assertEqual(loaded.attribute_values, item.attribute_values)
+            self.assertEqual(loaded.zip_code, 10001)
+            self.assertEqual(loaded.get_changed_attributes(), set(['email']))
+            item = pickle.loads(pickle.dumps(model('foo', 'bar', zip_code=1)))
+            self.assertEqual(item.attribute_values, {'user_name': 'foo', 'user_id': 'bar', 'zip_code': 1,
+                                                     'email': 'needs_email'})
+
+    def test_lazy_deserialization(self):
+        """
+        Model.Meta.lazy_deserialization
+        """
+        for model in [LazyUserModel, LazyCompactUserModel]:
+            data = {
+                'user_name': {'S': 'foo'},
+                'user_id': {'S': 'bar'},
+                'zip_code': {'N': '10001'},
+                'date_created': {'S': '2014-01-01T00:00:00.000000+0000'}
+            }
+            item = model.from_raw_data(data)
+            self.assertTrue(item._lazy_class)
+            self.assertEqual(item._compact_class, model is LazyCompactUserModel)
+            with patch.object(NumberAttribute, 'deserialize', return_value=1) as deserialize:
+                self.assertEqual(item.zip_code, 1)
+                self.assertEqual(item.zip_code, 1)
+                self.assertEqual(deserialize.call_count, 1)
+            item.date_created = None
+            self.assertEqual(item.email, 'needs_email')
+            self.assertEqual(item.attribute_values, {
+                'user_name': 'foo',
+                'user_id': 'bar',
+                'zip_code': 1,
+                'email': 'needs_email',
+                'date_created': None
+            })
+            self.assertIsNone(item._raw_item)
+
+            item = model.from_raw_data(data)
+            self.assertEqual(item.serialize(attr_map=True)['attributes'], {
+                'user_name': {'S': 'foo'},
+                'user_id': {'S': 'bar'},
+                'zip_code': {'N': '10001'},
+                'email': {'S': 'needs_email'},
+                'date_created': {'S': '2014-01-01T00:00:00.000000+0000'}
+            })
+
+    def test_attribute_registry(self):
+        """
+        Model.get_attributes and Model.index_classes
+        """
+        self.assertEqual(list(IndexedModel.get_attributes()),
+                         ['user_name', 'email', 'numbers', 'aliases', 'icons'])
+        self.assertEqual(list(IndexedModel.index_classes), ['email_index', 'include_index'])
+        self.assertIs(IndexedModel.get_attributes()['email'], IndexedModel.email)
+        self.assertFalse(hasattr(IndexedModel.get_attributes(), '__setitem__'))
+        self.assertEqual(list(EmailIndex.get_attributes()), ['email', 'numbers'])
+
+        class ChildModel(IndexedModel):
+            email = None
+            nickname = UnicodeAttribute(null=True)
+
+        self.assertEqual(list(ChildModel.get_attributes()), ['user_name', 'numbers', 'aliases', 'icons', 'nickname'])
+        self.assertEqual(list(ChildModel.index_classes), ['email_index', 'include_index'])
+        self.assertNotIn('nickname', IndexedModel.get_attributes())
+
     def test_refresh(self):
         """
         Model.refresh
@@ -339,6 +591,7 @@ class ModelTestCase(TestCase):
         """
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpOK(), COMPLEX_TABLE_DATA
+            ComplexKeyModel.get_meta_data()
             item = ComplexKeyModel('test')
 
         with patch(PATCH_METHOD) as req:
@@ -377,6 +630,7 @@ class ModelTestCase(TestCase):
         """
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpOK(), SIMPLE_MODEL_TABLE_DATA
+            SimpleUserModel.get_meta_data()
             item = SimpleUserModel('foo', email='bar')
 
         with patch(PATCH_METHOD) as req:
@@ -413,6 +667,76 @@ class ModelTestCase(TestCase):
             }
             self.assertEqual(args, params)
 
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpOK({}), {
+                ATTRIBUTES: {
+                    "user_name": {
+                        "S": "foo"
+                    },
+                    "email": {
+                        "S": "baz"
+                    },
+                    "views": {
+                        "N": "20"
+                    }
+                }
+            }
+            item.update_item(
+                actions={
+                    'views': ('add', 10),
+                    'email': ('put', 'baz'),
+                    'aliases': ('delete', None),
+                },
+                expected={
+                    'views': {'Value': 10},
+                    'email': {'Exists': True, 'Value': 'bar'},
+                }
+            )
+            args = req.call_args[1]
+            params = {
+                'table_name': 'SimpleModel',
+                'return_values': 'ALL_NEW',
+                'key': {
+                    'user_name': {
+                        'S': 'foo'
+                    }
+                },
+                'attribute_updates': {
+                    'views': {
+                        'Action': 'ADD',
+                        'Value': {
+                            'N': '10'
+                        }
+                    },
+                    'email': {
+                        'Action': 'PUT',
+                        'Value': {
+                            'S': 'baz'
+                        }
+                    },
+                    'aliases': {
+                        'Action': 'DELETE'
+                    }
+                },
+                'expected': {
+                    'views': {
+                        'Value': {'N': '10'}
+                    },
+                    'email': {
+                        'Exists': True,
+                        'Value': {'S': 'bar'}
+                    }
+                },
+                'return_consumed_capacity': 'TOTAL'
+            }
+            self.assertEqual(args, params)
+            self.assertEqual(req.call_count, 1)
+            self.assertEqual(item.views, 20)
+            self.assertEqual(item.email, 'baz')
+
+        self.assertRaises(ValueError, item.update_item, actions={'missing': ('put', 1)})
+        self.assertRaises(ValueError, item.update_item, actions={'views': ('add', None)})
+
     def test_save(self):
         """
         Model.save
@@ -675,28 +999,29 @@ class ModelTestCase(TestCase):
         """
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpOK(), SIMPLE_MODEL_TABLE_DATA
-            SimpleUserModel('foo')
+            SimpleUserModel.get_meta_data()
 
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpOK(), SIMPLE_BATCH_GET_ITEMS
             item_keys = ['hash-{0}'.format(x) for x in range(10)]
             for item in SimpleUserModel.batch_get(item_keys):
                 self.assertIsNotNone(item)
+            self.assertEqual(len(item_keys), 10)
             params = {
                 'return_consumed_capacity': 'TOTAL',
                 'request_items': {
                     'SimpleModel': {
                         'Keys': [
-                            {'user_name': {'S': 'hash-9'}},
-                            {'user_name': {'S': 'hash-8'}},
-                            {'user_name': {'S': 'hash-7'}},
-                            {'user_name': {'S': 'hash-6'}},
-                            {'user_name': {'S': 'hash-5'}},
-                            {'user_name': {'S': 'hash-4'}},
-                            {'user_name': {'S': 'hash-3'}},
-                            {'user_name': {'S': 'hash-2'}},
+                            {'user_name': {'S': 'hash-0'}},
                             {'user_name': {'S': 'hash-1'}},
-                            {'user_name': {'S': 'hash-0'}}
+                            {'user_name': {'S': 'hash-2'}},
+                            {'user_name': {'S': 'hash-3'}},
+                            {'user_name': {'S': 'hash-4'}},
+                            {'user_name': {'S': 'hash-5'}},
+                            {'user_name': {'S': 'hash-6'}},
+                            {'user_name': {'S': 'hash-7'}},
+                            {'user_name': {'S': 'hash-8'}},
+                            {'user_name': {'S': 'hash-9'}}
                         ]
                     }
                 }
@@ -705,7 +1030,7 @@ class ModelTestCase(TestCase):
 
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpOK(), MODEL_TABLE_DATA
-            UserModel('foo', 'bar')
+            UserModel.get_meta_data()
 
         with patch(PATCH_METHOD) as req:
             item_keys = [('hash-{0}'.format(x), '{0}'.format(x)) for x in range(10)]
@@ -760,9 +1085,12 @@ class ModelTestCase(TestCase):
         batch_get_mock.side_effect = fake_batch_get
 
         with patch(PATCH_METHOD, new=batch_get_mock) as req:
-            item_keys = [('hash-{0}'.format(x), '{0}'.format(x)) for x in range(200)]
-            for item in UserModel.batch_get(item_keys):
-                self.assertIsNotNone(item)
+            with patch('time.sleep') as sleep:
+                item_keys = [('hash-{0}'.format(x), '{0}'.format(x)) for x in range(200)]
+                for item in UserModel.batch_get(item_keys):
+                    self.assertIsNotNone(item)
+                self.assertEqual(req.call_count, 200)
+                self.assertEqual(sleep.call_count, 198)
 
     def test_batch_write(self):
         """
@@ -770,7 +1098,7 @@ class ModelTestCase(TestCase):
         """
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpOK(), MODEL_TABLE_DATA
-            UserModel('foo', 'bar')
+            UserModel.get_meta_data()
 
         with patch(PATCH_METHOD) as req:
             req.return_value = HttpOK({}), {}
@@ -1007,6 +1335,8 @@ class ModelTestCase(TestCase):
         scope_args = {'count': 0}
 
         schema = IndexedModel.get_indexes()
+        self.assertIs(schema, IndexedModel.indexes)
+        self.assertIs(schema, IndexedModel.get_indexes())
 
         expected = {
             'local_secondary_indexes': [
@@ -1135,6 +1465,33 @@ class ModelTestCase(TestCase):
             throt.add_record(50)
             throt.throttle()
 
+    def test_offline_schema(self):
+        """
+        Models with an offline schema are never described
+        """
+        with patch(PATCH_METHOD) as req:
+            req.return_value = HttpOK(), GET_MODEL_ITEM_DATA
+            item = OfflineUserModel('foo', 'bar')
+            self.assertEqual(req.call_count, 0)
+            meta_data = OfflineUserModel.get_meta_data()
+            self.assertEqual(meta_data.hash_keyname, 'user_name')
+            self.assertEqual(meta_data.range_keyname, 'user_id')
+            self.assertEqual(meta_data.get_attribute_type('email'), 'S')
+            self.assertEqual(meta_data.get_index_hash_keyname('email_index'), 'email')
+
+            item = OfflineUserModel.get('foo', 'bar')
+            self.assertEqual(item.zip_code, 88030)
+            self.assertEqual(req.call_count, 1)
+            self.assertEqual(req.call_args[1]['key'], {'user_name': {'S': 'foo'}, 'user_id': {'S': 'bar'}})
+
+            req.return_value = HttpOK(), {'Items': []}
+            list(OfflineUserModel.email_index.query('foo@example.com'))
+            self.assertEqual(req.call_count, 2)
+            self.assertEqual(req.call_args[1]['index_name'], 'email_index')
+            self.assertEqual(
+                req.call_args[1]['key_conditions']['email'],
+                {'AttributeValueList': [{'S': 'foo@example.com'}], 'ComparisonOperator': 'EQ'})
+
     def test_old_style_model_exception(self):
         """
         Display warning for pre v1.0 Models
@@ -2,6 +2,20 @@ import os
 import sys
 
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPy(build_py):
+    """
+    Leaves out the asyncio modules on Python < 3.5, as they cannot be byte-compiled there
+    """
+
+    def find_package_modules(self, package, package_dir):
+        modules = build_py.find_package_modules(self, package, package_dir)
+        if sys.version_info < (3, 5):
+            modules = [module for module in modules if module[1] != 'aio']
+        return modules
+
 
 if sys.argv[-1] == 'publish':
     os.system('python setup.py sdist upload')
@@ -15,6 +29,7 @@ setup(
     name='pynamodb',
     version=__import__('pynamodb').__version__,
     packages=find_packages(),
+    cmdclass={'build_py': BuildPy},
     url='http://jlafon.io/pynamodb.html',
     author='Jharrod LaFon',
     author_email='jlafon@eyesopen.com',